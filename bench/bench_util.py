@@ -0,0 +1,95 @@
+# ========================================
+# 🧪 벤치마크 공용 도우미
+# 📦 파일명: bench_util.py
+#   - server/ 코드를 임시 폴더에 복사해서 별도 프로세스로 실행
+#   - board/ 코드도 같은 임시 폴더에 복사하면 복사본 server/ 의 DB 를 조회
+#   - 운영 DB(server/client_status.db)는 절대 건드리지 않음
+# ========================================
+
+import os, sys, json, time, socket, shutil, subprocess, tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_SRC = os.path.join(ROOT_DIR, "server")
+BOARD_SRC = os.path.join(ROOT_DIR, "board")
+
+# board/app.py 를 디버그/리로더 없이 지정 포트로 실행
+BOARD_LAUNCHER = (
+    "import sys, app\n"
+    "from werkzeug.serving import run_simple\n"
+    "app.init_ini_commands_db()\n"
+    "run_simple('127.0.0.1', int(sys.argv[1]), app.app, threaded=True)\n"
+)
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_port(port, timeout=15.0):
+    """포트가 열릴 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.5)
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return True
+        time.sleep(0.1)
+    return False
+
+
+def make_workdir(prefix="dia_bench_"):
+    return tempfile.mkdtemp(prefix=prefix)
+
+
+def start_server_copy(workdir, settings):
+    """server/*.py 를 workdir/server 에 복사 후 실행 → (Popen, server_dir)"""
+    server_dir = os.path.join(workdir, "server")
+    os.makedirs(server_dir, exist_ok=True)
+    for fname in os.listdir(SERVER_SRC):
+        if fname.endswith(".py"):
+            shutil.copy(os.path.join(SERVER_SRC, fname), server_dir)
+
+    with open(os.path.join(server_dir, "settings.json"), "w", encoding="utf-8") as f:
+        json.dump(settings, f, ensure_ascii=False, indent=2)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-X", "utf8", "server.py"],
+        cwd=server_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    if not wait_port(settings["server_port"]):
+        proc.kill()
+        raise RuntimeError("server.py 기동 실패 (포트 대기 시간 초과)")
+    return proc, server_dir
+
+
+def start_board_copy(workdir, port):
+    """board/*.py 를 workdir/board 에 복사 후 실행 → (Popen, board_dir)
+    start_server_copy 와 같은 workdir 이면 복사본 server/client_status.db 를 사용"""
+    board_dir = os.path.join(workdir, "board")
+    os.makedirs(board_dir, exist_ok=True)
+    for fname in os.listdir(BOARD_SRC):
+        if fname.endswith(".py"):
+            shutil.copy(os.path.join(BOARD_SRC, fname), board_dir)
+
+    proc = subprocess.Popen(
+        [sys.executable, "-X", "utf8", "-c", BOARD_LAUNCHER, str(port)],
+        cwd=board_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    if not wait_port(port):
+        proc.kill()
+        raise RuntimeError("board/app.py 기동 실패 (포트 대기 시간 초과)")
+    return proc, board_dir
+
+
+def stop_process(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
@@ -0,0 +1,140 @@
+# ========================================
+# 🧪 웹 서버 조회 API 초당 요청 수 비교
+# 📦 파일명: board_requests.py
+#   - 임시 DB 에 clients N개 + daily_dia 1년치 생성
+#   - board/app.py 를 로컬 포트로 띄우고 동시 요청으로 초당 처리량 측정
+#   - fresh : 요청마다 sqlite3.connect (이전 방식, READ_POOL_SIZE=0)
+#   - pool  : 읽기 전용 연결 풀 (mode=ro, cache_size, mmap_size, query_only)
+#   - --writer 이면 측정 중 server.py 배치 writer 가 계속 기록 (잠금 경쟁 재현)
+#   - /api/clients 는 스냅샷 파일 없이 DB 조회 경로로 측정
+#
+# 사용 예)
+#   python bench/board_requests.py --clients 1000 --seconds 5 --concurrency 8 --writer
+# ========================================
+
+import argparse, datetime, http.client, json, os, random, sqlite3, sys, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "server"))
+sys.path.insert(0, os.path.join(ROOT, "board"))
+
+import server  # noqa: E402
+import daily_rollup  # noqa: E402
+from bench_util import free_port, make_workdir  # noqa: E402
+
+
+def build_db(path, clients, days_of_data):
+    server.DB_PATH = path
+    server.init_db()
+    rng = random.Random(3)
+    today = datetime.date.today()
+    names = [f"S{i % 20:02d}-BENCH-{i:05d}" for i in range(clients)]
+    with sqlite3.connect(path) as conn:
+        for d in range(days_of_data, -1, -1):
+            day = (today - datetime.timedelta(days=d)).isoformat()
+            conn.executemany(
+                "INSERT INTO daily_dia (date, name, ip, game, server, dia, status, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(day, n, "10.0.0.1", "NC", n[:3], rng.randint(1000, 500000), "alive", "...") for n in names]
+            )
+        conn.commit()
+        daily_rollup.rebuild(conn)
+    server.batch_insert_to_db([{"name": n, "dia": 1000, "game_server": n[:3], "msg": "..."} for n in names])
+    return names
+
+
+def writer_loop(names, stop):
+    """58초 주기 보고를 압축해서 재현: 1초마다 전체 클라이언트의 1/10 기록"""
+    rng = random.Random(9)
+    while not stop.is_set():
+        batch = [{"name": n, "dia": rng.randint(1000, 500000), "game_server": n[:3], "msg": "..."}
+                 for n in rng.sample(names, max(1, len(names) // 10))]
+        server.batch_insert_to_db(batch)
+        stop.wait(1.0)
+
+
+def hammer(port, path, seconds, concurrency):
+    """concurrency 개 스레드가 seconds 동안 요청 반복 → (요청 수, 실패 수, 지연 목록)"""
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    stats = {"ok": 0, "fail": 0, "latency": []}
+
+    def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                conn.close()
+                ok = resp.status == 200
+            except Exception:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                stats["ok" if ok else "fail"] += 1
+                stats["latency"].append(elapsed)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="board/app.py 조회 API 처리량 측정")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--days-of-data", type=int, default=365)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--writer", action="store_true", help="측정 중 배치 writer 동시 실행")
+    parser.add_argument("--paths", default="/api/clients,/api/dia-history?days=7,/api/dia-agg/total?days=30,/api/dia-agg/movers?days=7&limit=10")
+    args = parser.parse_args()
+
+    db_path = os.path.join(make_workdir(), "client_status.db")
+    names = build_db(db_path, args.clients, args.days_of_data)
+
+    import app as board_app
+    from werkzeug.serving import make_server
+    board_app.DB_PATH = db_path
+    board_app.client_snapshot.path = db_path + ".no-snapshot"  # DB 조회 경로 측정
+
+    port = free_port()
+    httpd = make_server("127.0.0.1", port, board_app.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    if args.writer:
+        threading.Thread(target=writer_loop, args=(names, stop), daemon=True).start()
+
+    results = []
+    for mode, pool_size in (("fresh", 0), ("pool", board_app.READ_POOL_SIZE)):
+        board_app.read_pool.size = pool_size
+        for path in args.paths.split(","):
+            hammer(port, path, 1.0, args.concurrency)  # 워밍업
+            stats = hammer(port, path, args.seconds, args.concurrency)
+            lat = sorted(stats["latency"]) or [0]
+            results.append({
+                "mode": mode,
+                "path": path,
+                "requests_per_sec": round(stats["ok"] / args.seconds, 1),
+                "failures": stats["fail"],
+                "p50_ms": round(lat[len(lat) // 2], 2),
+                "p95_ms": round(lat[int(len(lat) * 0.95) - 1], 2)
+            })
+
+    stop.set()
+    httpd.shutdown()
+    print(json.dumps({
+        "clients": args.clients,
+        "days_of_data": args.days_of_data,
+        "concurrency": args.concurrency,
+        "writer": args.writer,
+        "results": results
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
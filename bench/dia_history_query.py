@@ -0,0 +1,114 @@
+# ========================================
+# 🧪 /api/dia-history 조회 성능 비교
+# 📦 파일명: dia_history_query.py
+#   - 임시 DB 에 1년치 x 1,000 클라이언트 daily_dia 생성
+#   - 이전 방식(substr IN + 파이썬 diff) vs 현재 app.py 엔드포인트
+#
+# 사용 예)
+#   python bench/dia_history_query.py --clients 1000 --days-of-data 365
+# ========================================
+
+import argparse, datetime, json, os, random, sqlite3, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "server"))
+sys.path.insert(0, os.path.join(ROOT, "board"))
+
+import server  # noqa: E402
+import daily_rollup  # noqa: E402
+from bench_util import make_workdir  # noqa: E402
+
+
+def build_db(path, clients, days_of_data):
+    server.DB_PATH = path
+    server.init_db()
+    rng = random.Random(7)
+    today = datetime.date.today()
+    with sqlite3.connect(path) as conn:
+        for d in range(days_of_data, -1, -1):
+            day = (today - datetime.timedelta(days=d)).isoformat()
+            conn.executemany(
+                "INSERT INTO daily_dia (date, name, ip, game, server, dia, status, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(day, f"S{i % 20:02d}-BENCH-{i:05d}", "10.0.0.1", "NC", f"S{i % 20:02d}",
+                  rng.randint(1000, 500000), "alive", "...") for i in range(clients)]
+            )
+        conn.commit()
+        daily_rollup.rebuild(conn)  # 직접 넣은 행 → 일별 집계 백필 (server.py --rebuild-rollups 와 동일)
+
+
+def legacy_dia_history(db_path, days):
+    """이전 app.py 구현 (substr IN 조건 + 파이썬 dict 로 diff 계산)"""
+    today = datetime.date.today()
+    wanted = [(today - datetime.timedelta(days=i)).isoformat() for i in range(days)]
+    placeholders = ','.join('?' * len(wanted))
+    sql = f"""
+    SELECT substr(date,1,10) AS day, name, game, server, dia
+    FROM daily_dia
+    WHERE substr(date,1,10) IN ({placeholders})
+    ORDER BY day ASC, name ASC
+    """
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(sql, wanted).fetchall()
+
+    stats = {d: {'TOTAL': 0} for d in wanted}
+    for r in rows:
+        stats[r['day']][r['name']] = {'today': r['dia'], 'diff': 0, 'game': r['game'], 'server': r['server']}
+        stats[r['day']]['TOTAL'] += r['dia']
+    for d in wanted:
+        prev = (datetime.date.fromisoformat(d) - datetime.timedelta(days=1)).isoformat()
+        for name, info in stats[d].items():
+            if name == 'TOTAL':
+                continue
+            prev_info = stats.get(prev, {}).get(name)
+            info['diff'] = info['today'] - (prev_info['today'] if prev_info else 0)
+    return stats
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return round(samples[len(samples) // 2], 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/dia-history 조회 성능 비교")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--days-of-data", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ranges", default="7,30,999")
+    args = parser.parse_args()
+
+    db_path = os.path.join(make_workdir(), "client_status.db")
+    build_db(db_path, args.clients, args.days_of_data)
+
+    import app as board_app
+    board_app.DB_PATH = db_path
+    # 이전 구현도 같은 조건(jsonify 포함)으로 비교하도록 임시 라우트 등록
+    board_app.app.add_url_rule(
+        "/bench/legacy-dia-history", "bench_legacy_dia_history",
+        lambda: board_app.jsonify(legacy_dia_history(db_path, int(board_app.request.args["days"])))
+    )
+    client = board_app.app.test_client()
+
+    results = []
+    for days in [int(d) for d in args.ranges.split(",")]:
+        results.append({
+            "days": days,
+            "legacy_ms_median": timed(lambda: client.get(f"/bench/legacy-dia-history?days={days}").get_data(), args.repeat),
+            "current_ms_median": timed(lambda: client.get(f"/api/dia-history?days={days}").get_data(), args.repeat),
+        })
+
+    print(json.dumps({
+        "clients": args.clients,
+        "days_of_data": args.days_of_data,
+        "results": results
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
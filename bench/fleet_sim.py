@@ -0,0 +1,655 @@
+# ========================================
+# 🧪 전체 파이프라인 부하 시뮬레이터 (server.py + SQLite + board/app.py)
+# 📦 파일명: fleet_sim.py
+#   - server/ 와 board/ 를 임시 폴더에 복사해서 127.0.0.1 에서만 실행 (운영 DB 안 건드림)
+#   - 가상 클라이언트 N대: send_to_server 와 같은 JSON, 58초 주기 ± jitter
+#     첫 보고는 주기 안에 고르게 분산, --burst-every 마다 일부가 한꺼번에 보고 (재접속 몰림 재현)
+#     --transport ndjson : client.py ServerLink 처럼 연결 유지 + 건마다 ACK / legacy : 1회성 연결
+#   - 대시보드 D개: /api/clients?since=<버전> (새로고침 주기) + /api/dia-history?days=7 폴링
+#   - 반영 지연: 보고 전송 → /api/clients 에 그 다이아 값이 보일 때까지 (--probe-ms 간격 확인)
+#   - CPU / 메모리: server.py, board/app.py 프로세스별 (psutil 없으면 null)
+#   - DB 크기: 체크포인트 후 client_status.db 증가량, 보고 1건당 / 하루 환산
+#   - 서버 내부 지표: server.py /metrics (배치 크기, 커밋 시간, 실패 수)
+#   - 결과 JSON 은 실행마다 같은 키 구조 → --out 으로 저장해서 비교
+#
+# 사용 예)
+#   python bench/fleet_sim.py --clients 1000 --duration 300
+#   python bench/fleet_sim.py --clients 3000 --interval 10 --ingest-mode asyncio --out fleet_3000.json
+# ========================================
+
+import argparse, asyncio, datetime, http.client, json, os, platform, random, sqlite3, subprocess, sys, threading, time
+
+from bench_util import (ROOT_DIR, free_port, make_workdir, start_board_copy, start_server_copy,
+                        stop_process)
+
+RESULT_SCHEMA = 1
+
+FRAMED_HELLO = b"DIA/1 NDJSON\n"   # client.py 와 동일
+FRAMED_OK    = b"OK NDJSON"
+
+
+def percentiles(values):
+    """지연 목록(ms) → {count, p50, p90, p95, p99, max}"""
+    if not values:
+        return {"count": 0, "p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    v = sorted(values)
+
+    def pick(q):
+        return round(v[min(len(v) - 1, int(len(v) * q))], 2)
+
+    return {"count": len(v), "p50": pick(0.50), "p90": pick(0.90), "p95": pick(0.95),
+            "p99": pick(0.99), "max": round(v[-1], 2)}
+
+
+class Tracker:
+    """
+    보낸 보고와 대시보드에 보인 값을 맞춰보는 공유 상태
+    - pending: {name: [(dia, 보낸 시각)]} - 클라이언트별 다이아는 계속 증가
+    - /api/clients 에 dia=d 가 보이면 d 이하로 보낸 보고는 모두 반영된 것으로 처리
+      (같은 확인 간격 안에 2건이면 앞의 값은 덮여서 안 보이므로)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.e2e_ms = []
+        self.send_ms = []
+        self.sent = 0
+        self.ok = 0
+        self.fail = 0
+        self.errors = {}
+        self.bursts = 0
+        self.legacy_fallbacks = 0
+
+    def expect(self, name, dia, started):
+        with self.lock:
+            self.pending.setdefault(name, []).append((dia, started))
+            self.sent += 1
+
+    def sent_result(self, name, dia, started, error=None):
+        elapsed = (time.perf_counter() - started) * 1000
+        with self.lock:
+            if error is None:
+                self.ok += 1
+                self.send_ms.append(elapsed)
+                return
+            self.fail += 1
+            key = type(error).__name__
+            self.errors[key] = self.errors.get(key, 0) + 1
+            waiting = self.pending.get(name)
+            if waiting:
+                waiting[:] = [w for w in waiting if w[0] != dia]
+
+    def seen(self, rows):
+        now = time.perf_counter()
+        with self.lock:
+            for row in rows:
+                waiting = self.pending.get(row.get("name"))
+                if not waiting:
+                    continue
+                try:
+                    dia = int(row.get("dia"))
+                except (TypeError, ValueError):
+                    continue
+                keep = []
+                for sent_dia, started in waiting:
+                    if sent_dia <= dia:
+                        self.e2e_ms.append((now - started) * 1000)
+                    else:
+                        keep.append((sent_dia, started))
+                waiting[:] = keep
+
+    def pending_count(self):
+        with self.lock:
+            return sum(len(w) for w in self.pending.values())
+
+    def counts(self):
+        with self.lock:
+            return {"sent": self.sent, "ok": self.ok, "fail": self.fail, "seen": len(self.e2e_ms)}
+
+
+# ────────── 가상 클라이언트 (asyncio) ──────────
+
+class VirtualClient:
+    def __init__(self, idx, rng):
+        self.name = f"SIM-S{idx % 20:02d}-{idx:05d}"
+        self.ip = f"10.1.{(idx // 250) % 250}.{idx % 250}"
+        self.game_server = f"S{idx % 20:02d}"
+        self.dia = rng.randint(10000, 500000)
+        self.last_ts = 0.0
+        self.legacy = False   # 서버가 NDJSON 을 거절(BUSY 등)하면 1회성 전송으로 전환 (client.py 와 동일)
+        self.reader = None
+        self.writer = None
+        self.wake = asyncio.Event()
+
+    def next_payload(self, rng):
+        """send_to_server() 와 같은 필드 (dia 는 매번 증가 → 대시보드 반영 확인용)"""
+        self.dia += rng.randint(1, 500)
+        self.last_ts = max(round(time.time(), 3), round(self.last_ts + 0.001, 3))
+        return {
+            "name": self.name,
+            "ip": self.ip,
+            "dia": self.dia,
+            "mode": "send",
+            "game": "NC",
+            "msg": "fleet-sim",
+            "game_server": self.game_server,
+            "ts": self.last_ts
+        }
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Fleet:
+    def __init__(self, port, tracker, args):
+        self.port = port
+        self.tracker = tracker
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.clients = [VirtualClient(i, self.rng) for i in range(args.clients)]
+
+    async def send_legacy(self, client, data):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            writer.write(data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def send_framed(self, client, data):
+        """연결 유지 + ACK 대기, 연결 오류 시 1회 재연결 (ServerLink.send_many 와 동일)"""
+        for attempt in range(2):
+            if client.legacy:
+                return await self.send_legacy(client, data)
+            try:
+                if client.writer is None:
+                    client.reader, client.writer = await asyncio.open_connection("127.0.0.1", self.port)
+                    client.writer.write(FRAMED_HELLO)
+                    await client.writer.drain()
+                    if (await client.reader.readline()).strip() != FRAMED_OK:
+                        client.close()
+                        client.legacy = True
+                        self.tracker.legacy_fallbacks += 1
+                        continue
+                client.writer.write(data + b"\n")
+                await client.writer.drain()
+                ack = await client.reader.readline()
+                if not ack:
+                    raise ConnectionError("서버가 연결을 종료함")
+                if not ack.startswith(b"ACK"):
+                    raise ValueError("서버 ERR 응답")
+                return
+            except OSError:
+                client.close()
+                if attempt == 1:
+                    raise
+
+    async def report(self, client):
+        payload = client.next_payload(self.rng)
+        data = json.dumps(payload).encode("utf-8")
+        started = time.perf_counter()
+        self.tracker.expect(client.name, payload["dia"], started)
+        send = self.send_framed if self.args.transport == "ndjson" else self.send_legacy
+        try:
+            await asyncio.wait_for(send(client, data), self.args.timeout)
+        except Exception as e:
+            client.close()
+            self.tracker.sent_result(client.name, payload["dia"], started, e)
+            return
+        self.tracker.sent_result(client.name, payload["dia"], started)
+
+    async def run_client(self, client, deadline):
+        loop = asyncio.get_running_loop()
+        delay = self.rng.uniform(0, self.args.interval)  # 첫 보고는 주기 안에 고르게 분산
+        while True:
+            try:
+                await asyncio.wait_for(client.wake.wait(), max(0.0, min(delay, deadline - loop.time())))
+            except asyncio.TimeoutError:
+                pass
+            client.wake.clear()
+            if loop.time() >= deadline:
+                break
+            await self.report(client)
+            delay = self.args.interval + self.rng.uniform(-self.args.jitter, self.args.jitter)
+        client.close()
+
+    async def run_bursts(self, deadline):
+        """burst_every 초마다 burst_fraction 비율의 클라이언트를 즉시 보고시킴"""
+        loop = asyncio.get_running_loop()
+        count = max(1, int(len(self.clients) * self.args.burst_fraction))
+        while loop.time() + self.args.burst_every < deadline:
+            await asyncio.sleep(self.args.burst_every)
+            for client in self.rng.sample(self.clients, count):
+                client.wake.set()
+            self.tracker.bursts += 1
+
+    async def run(self, seconds):
+        deadline = asyncio.get_running_loop().time() + seconds
+        tasks = [self.run_client(c, deadline) for c in self.clients]
+        if self.args.burst_every > 0 and self.args.burst_fraction > 0:
+            tasks.append(self.run_bursts(deadline))
+        await asyncio.gather(*tasks)
+
+
+# ────────── 대시보드 / 반영 확인 (스레드) ──────────
+
+def http_get(port, path, etag=None, timeout=30):
+    """→ (status, body bytes, etag, 지연 ms) / 연결 실패 시 status 0"""
+    started = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        conn.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+        resp = conn.getresponse()
+        body = resp.read()
+        status, new_etag = resp.status, resp.getheader("ETag")
+    except Exception:
+        status, body, new_etag = 0, b"", None
+    finally:
+        conn.close()
+    return status, body, new_etag, (time.perf_counter() - started) * 1000
+
+
+class ClientsView:
+    """js/core/api.js loadClientsData 와 같은 증분 조회 (?since=<버전>, 304 면 그대로)"""
+
+    def __init__(self, port):
+        self.port = port
+        self.rev = 0
+
+    def poll(self):
+        status, body, _, elapsed = http_get(self.port, f"/api/clients?since={self.rev}")
+        rows = []
+        if status == 200:
+            try:
+                data = json.loads(body)
+                if isinstance(data, dict):
+                    if data.get("full"):
+                        self.rev = 0
+                    self.rev = max(self.rev, data.get("rev") or 0)
+                    rows = data.get("clients") or []
+                else:
+                    rows = data
+            except ValueError:
+                status = -1
+        return status, rows, elapsed
+
+
+class DashboardStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_path = {}
+
+    def add(self, path, status, elapsed):
+        with self.lock:
+            s = self.by_path.setdefault(path, {"requests": 0, "not_modified": 0, "failures": 0, "latency": []})
+            s["requests"] += 1
+            if status == 304:
+                s["not_modified"] += 1
+            elif status != 200:
+                s["failures"] += 1
+            s["latency"].append(elapsed)
+
+    def summary(self, seconds):
+        with self.lock:
+            return {path: {
+                "requests": s["requests"],
+                "requests_per_sec": round(s["requests"] / seconds, 2) if seconds else 0,
+                "not_modified": s["not_modified"],
+                "failures": s["failures"],
+                "latency_ms": percentiles(s["latency"])
+            } for path, s in sorted(self.by_path.items())}
+
+
+def dashboard_loop(port, args, stats, stop, seed):
+    """브라우저 1개: 새로고침 주기마다 /api/clients, history 주기마다 /api/dia-history"""
+    rng = random.Random(seed)
+    view = ClientsView(port)
+    next_clients = time.perf_counter() + rng.uniform(0, args.poll_sec)
+    next_history = time.perf_counter() + rng.uniform(0, args.history_sec)
+    while not stop.is_set():
+        now = time.perf_counter()
+        if now >= next_clients:
+            status, _, elapsed = view.poll()
+            stats.add("/api/clients", status, elapsed)
+            next_clients = now + args.poll_sec
+        if now >= next_history:
+            status, _, _, elapsed = http_get(port, "/api/dia-history?days=7")
+            stats.add("/api/dia-history?days=7", status, elapsed)
+            next_history = now + args.history_sec
+        stop.wait(max(0.0, min(next_clients, next_history) - time.perf_counter()))
+
+
+def probe_loop(port, tracker, interval, stop):
+    """반영 지연 측정 전용 - 변경분만 짧은 간격으로 조회"""
+    view = ClientsView(port)
+    while not stop.is_set():
+        status, rows, _ = view.poll()
+        if rows:
+            tracker.seen(rows)
+        stop.wait(interval)
+
+
+# ────────── 자원 사용량 ──────────
+
+def db_bytes(db_path):
+    total = 0
+    for suffix in ("", "-wal"):
+        try:
+            total += os.path.getsize(db_path + suffix)
+        except OSError:
+            pass
+    return total
+
+
+class ResourceSampler(threading.Thread):
+    """sample_sec 마다 프로세스별 CPU% / RSS, DB 크기, 보고 진행 상황 기록"""
+
+    def __init__(self, procs, db_path, tracker, sample_sec):
+        super().__init__(daemon=True, name="resource-sampler")
+        self.db_path = db_path
+        self.tracker = tracker
+        self.sample_sec = sample_sec
+        self.stop_event = threading.Event()
+        self.timeline = []
+        self.cpu = {name: {"cpu_sec": 0.0, "samples": []} for name in procs}
+        self.rss_max = {name: 0 for name in procs}
+        try:
+            import psutil  # 선택 의존성 (없으면 CPU/메모리 측정 생략)
+            self.procs = {name: psutil.Process(p.pid) for name, p in procs.items()}
+            self.base = {name: self.cpu_time(p) for name, p in self.procs.items()}
+        except Exception:
+            self.procs = None
+
+    @staticmethod
+    def cpu_time(proc):
+        t = proc.cpu_times()
+        return t.user + t.system
+
+    def sample(self, started, last):
+        now = time.perf_counter()
+        entry = {"t": round(now - started, 1), "db_bytes": db_bytes(self.db_path)}
+        entry.update(self.tracker.counts())
+        if self.procs is not None:
+            for name, proc in self.procs.items():
+                try:
+                    cpu = self.cpu_time(proc)
+                    rss = proc.memory_info().rss
+                except Exception:
+                    continue
+                pct = (cpu - last[name]) / (now - last["_t"]) * 100 if now > last["_t"] else 0.0
+                last[name] = cpu
+                self.cpu[name]["cpu_sec"] = cpu - self.base[name]
+                self.cpu[name]["samples"].append(pct)
+                self.rss_max[name] = max(self.rss_max[name], rss)
+                entry[f"{name}_cpu_pct"] = round(pct, 1)
+        last["_t"] = now
+        self.timeline.append(entry)
+
+    def run(self):
+        started = time.perf_counter()
+        last = dict(self.base) if self.procs is not None else {}
+        last["_t"] = started
+        while not self.stop_event.wait(self.sample_sec):
+            self.sample(started, last)
+        self.sample(started, last)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+    def summary(self, seconds):
+        if self.procs is None:
+            return {name: None for name in self.cpu}
+        return {name: {
+            "cpu_sec": round(c["cpu_sec"], 2),
+            "avg_pct": round(c["cpu_sec"] / seconds * 100, 1) if seconds else 0,
+            "max_pct": round(max(c["samples"]), 1) if c["samples"] else 0,
+            "rss_max_mb": round(self.rss_max[name] / 1048576, 1)
+        } for name, c in self.cpu.items()}
+
+
+# ────────── 서버 내부 지표 (/metrics) ──────────
+
+def scrape_metrics(port):
+    """Prometheus 텍스트 → {"이름{라벨}": 값}"""
+    status, body, _, _ = http_get(port, "/metrics", timeout=5)
+    values = {}
+    if status != 200:
+        return values
+    for line in body.decode("utf-8", "replace").splitlines():
+        if not line or line.startswith("#"):
+            continue
+        key, _, value = line.rpartition(" ")
+        try:
+            values[key] = float(value)
+        except ValueError:
+            pass
+    return values
+
+
+def bucket_quantile(values, name, q):
+    """히스토그램 구간 중 q 비율을 처음 넘는 구간 상한 (le)"""
+    buckets = []
+    for key, count in values.items():
+        if key.startswith(name + "_bucket{le=\""):
+            le = key[len(name) + 12:-2]
+            buckets.append((float("inf") if le == "+Inf" else float(le), count))
+    buckets.sort()
+    if not buckets or not buckets[-1][1]:
+        return None
+    target = buckets[-1][1] * q
+    for le, count in buckets:
+        if count >= target:
+            return le
+    return None
+
+
+def server_metrics_summary(values):
+    batches = values.get("dia_batch_rows_count", 0)
+    commits = values.get("dia_db_commit_seconds_count", 0)
+    p95 = bucket_quantile(values, "dia_db_commit_seconds", 0.95)
+    if p95 is not None:
+        p95 = "+Inf" if p95 == float("inf") else round(p95 * 1000, 1)
+    return {
+        "reports_live": int(values.get('dia_reports_received_total{kind="live"}', 0)),
+        "reports_history": int(values.get('dia_reports_received_total{kind="history"}', 0)),
+        "reports_dup": int(values.get('dia_reports_received_total{kind="dup"}', 0)),
+        "report_failures": int(sum(v for k, v in values.items() if k.startswith("dia_report_failures_total"))),
+        "batches": int(batches),
+        "avg_batch_rows": round(values.get("dia_batch_rows_sum", 0) / batches, 1) if batches else 0,
+        "avg_commit_ms": round(values.get("dia_db_commit_seconds_sum", 0) / commits * 1000, 2) if commits else 0,
+        "commit_p95_le_ms": p95,
+        "batch_failures": int(values.get("dia_batch_failures_total", 0)),
+        "connections_accepted": int(values.get("dia_connections_accepted_total", 0)),
+        "connections_active_end": int(values.get("dia_connections_active", 0))
+    }
+
+
+def settle_db(db_path):
+    """서버 종료 후 WAL 을 본 파일에 반영 → 실제 누적 크기 (WAL 미리 커지는 몫 제외)"""
+    try:
+        with sqlite3.connect(db_path, timeout=5) as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.Error:
+        pass
+    return db_bytes(db_path)
+
+
+def table_counts(db_path):
+    try:
+        with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5) as conn:
+            names = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")]
+            return {n: conn.execute(f'SELECT COUNT(*) FROM "{n}"').fetchone()[0] for n in names}
+    except sqlite3.Error:
+        return {}
+
+
+def git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ────────── 실행 ──────────
+
+def run(args):
+    workdir = make_workdir("dia_fleet_")
+    port, web_port, metrics_port = free_port(), free_port(), free_port()
+    settings = {
+        "server_ip": "127.0.0.1",
+        "server_port": port,
+        "log_path": os.path.join(workdir, "server_log.txt"),
+        "report_interval_sec": args.interval,
+        "ingest_mode": args.ingest_mode,
+        "max_framed_links": max(2048, args.clients + 64),  # 기본은 클라이언트 전원이 지속 연결 유지
+        "health_probe_hosts": ["127.0.0.1"],
+        "metrics_host": "127.0.0.1",
+        "metrics_port": metrics_port,
+        "log_level": args.log_level,
+        "log_console": False
+    }
+    server_proc, server_dir = start_server_copy(workdir, settings)
+    db_path = os.path.join(server_dir, "client_status.db")
+    board_proc = None
+    try:
+        board_proc, _ = start_board_copy(workdir, web_port)
+
+        tracker = Tracker()
+        dash_stats = DashboardStats()
+        stop = threading.Event()
+        sampler = ResourceSampler({"server": server_proc, "board": board_proc}, db_path, tracker, args.sample_sec)
+        db_start = db_bytes(db_path)
+        threads = [threading.Thread(target=probe_loop, args=(web_port, tracker, args.probe_ms / 1000, stop), daemon=True)]
+        threads += [threading.Thread(target=dashboard_loop, args=(web_port, args, dash_stats, stop, args.seed + i), daemon=True)
+                    for i in range(args.dashboards)]
+        for t in threads:
+            t.start()
+        sampler.start()
+
+        sim_cpu = time.process_time()
+        started = time.perf_counter()
+        asyncio.run(Fleet(port, tracker, args).run(args.duration))
+        send_elapsed = time.perf_counter() - started
+        sim_cpu = time.process_time() - sim_cpu
+
+        # 마지막 보고가 대시보드에 보일 때까지 대기
+        drain_start = time.perf_counter()
+        while tracker.pending_count() and time.perf_counter() - drain_start < args.drain_timeout:
+            time.sleep(0.2)
+        drained = time.perf_counter() - drain_start
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        for t in threads:
+            t.join(timeout=35)
+        sampler.stop()
+        server_values = scrape_metrics(metrics_port)
+    finally:
+        if board_proc is not None:
+            stop_process(board_proc)
+        stop_process(server_proc)
+
+    db_end = db_bytes(db_path)
+    db_settled = settle_db(db_path)
+    counts = tracker.counts()
+    growth = db_settled - db_start
+    return {
+        "schema": RESULT_SCHEMA,
+        "label": args.label,
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "params": {
+            "clients": args.clients,
+            "duration_sec": args.duration,
+            "interval_sec": args.interval,
+            "jitter_sec": args.jitter,
+            "burst_every_sec": args.burst_every,
+            "burst_fraction": args.burst_fraction,
+            "transport": args.transport,
+            "ingest_mode": args.ingest_mode,
+            "log_level": args.log_level,
+            "dashboards": args.dashboards,
+            "poll_sec": args.poll_sec,
+            "history_sec": args.history_sec,
+            "probe_ms": args.probe_ms,
+            "seed": args.seed
+        },
+        "ingest": {
+            "sent": counts["sent"],
+            "ok": counts["ok"],
+            "failed": counts["fail"],
+            "errors": tracker.errors,
+            "bursts": tracker.bursts,
+            "legacy_fallbacks": tracker.legacy_fallbacks,
+            "expected_reports_per_sec": round(args.clients / args.interval, 2),
+            "reports_per_sec": round(counts["ok"] / send_elapsed, 2) if send_elapsed else 0,
+            "send_ms": percentiles(tracker.send_ms),
+            "server": server_metrics_summary(server_values)
+        },
+        # 보고 전송 → /api/clients 반영 (probe_ms 간격만큼의 확인 지연 포함)
+        "e2e_ms": dict(percentiles(tracker.e2e_ms), unseen=tracker.pending_count(),
+                       drain_sec=round(drained, 2)),
+        "dashboard": dash_stats.summary(elapsed),
+        "db": {
+            "start_bytes": db_start,
+            "end_bytes": db_end,              # 실행 직후 (WAL 포함)
+            "settled_bytes": db_settled,      # 체크포인트 후
+            "growth_bytes": growth,
+            "bytes_per_report": round(growth / counts["ok"], 1) if counts["ok"] else None,
+            "projected_mb_per_day": round(growth / elapsed * 86400 / 1048576, 1) if elapsed else None,
+            "tables": table_counts(db_path)
+        },
+        "cpu": dict(sampler.summary(elapsed),
+                    simulator={"cpu_sec": round(sim_cpu, 2),
+                               "avg_pct": round(sim_cpu / send_elapsed * 100, 1) if send_elapsed else 0}),
+        "timeline": sampler.timeline,
+        "workdir": workdir
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 클라이언트 N대 + 대시보드로 전체 파이프라인 부하 측정")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=180.0, help="보고 발생 시간 (초)")
+    parser.add_argument("--interval", type=float, default=58.0, help="클라이언트 보고 주기 (client.py 와 동일 58초)")
+    parser.add_argument("--jitter", type=float, default=3.0, help="주기 흔들림 ± 초")
+    parser.add_argument("--burst-every", type=float, default=60.0, help="몰림 간격 (0 = 없음)")
+    parser.add_argument("--burst-fraction", type=float, default=0.2, help="몰릴 때 동시에 보고하는 클라이언트 비율")
+    parser.add_argument("--transport", choices=["ndjson", "legacy"], default="ndjson")
+    parser.add_argument("--ingest-mode", choices=["thread", "asyncio"], default="thread")
+    parser.add_argument("--log-level", default="INFO", help="server.py log_level (운영 기본 DEBUG 는 초당 상한 적용)")
+    parser.add_argument("--timeout", type=float, default=3.0, help="보고 1건 전송 timeout (client.py 와 동일 3초)")
+    parser.add_argument("--dashboards", type=int, default=3, help="동시에 열린 대시보드 수")
+    parser.add_argument("--poll-sec", type=float, default=60.0, help="대시보드 새로고침 주기 (js 기본 60초)")
+    parser.add_argument("--history-sec", type=float, default=300.0, help="/api/dia-history 조회 주기")
+    parser.add_argument("--probe-ms", type=float, default=250.0, help="반영 지연 확인 간격")
+    parser.add_argument("--sample-sec", type=float, default=1.0, help="CPU / DB 크기 기록 간격")
+    parser.add_argument("--drain-timeout", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--label", default="", help="결과 구분용 이름")
+    parser.add_argument("--out", help="결과 JSON 저장 경로 (없으면 출력만)")
+    parser.add_argument("--no-timeline", action="store_true", help="결과에서 초당 기록 생략")
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.no_timeline:
+        result.pop("timeline")
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
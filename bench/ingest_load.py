@@ -0,0 +1,153 @@
+# ========================================
+# 🧪 수신 서버 부하 발생기
+# 📦 파일명: ingest_load.py
+#   - client.py send_to_server 와 같은 1회성 JSON 보고를 대량 발사
+#   - thread / asyncio 수신 모드별 초당 처리량 비교
+#   - --logging on/off/both : 보고마다 남기는 수신 로그(DEBUG) 유무에 따른 비교
+#
+# 사용 예)
+#   python bench/ingest_load.py --mode both --reports 5000 --concurrency 200
+#   python bench/ingest_load.py --mode thread --logging both
+# ========================================
+
+import argparse, json, os, socket, sqlite3, sys, threading, time
+
+from bench_util import free_port, make_workdir, start_server_copy, stop_process
+
+
+def make_payload(i, run_id):
+    return {
+        "name": f"BENCH-{run_id}-{i:06d}",
+        "ip": f"10.0.{(i // 250) % 250}.{i % 250}",
+        "dia": 10000 + i,
+        "mode": "send",
+        "game": "NC",
+        "msg": "bench",
+        "game_server": f"S{i % 20:02d}"
+    }
+
+
+def send_one(port, payload, timeout):
+    """send_to_server() 와 동일: 연결 → sendall → close"""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    try:
+        s.connect(("127.0.0.1", port))
+        s.sendall(json.dumps(payload).encode("utf-8"))
+    finally:
+        s.close()
+
+
+def fire(port, total, concurrency, timeout, run_id):
+    """concurrency 개의 송신 스레드가 total 건을 나눠서 발사"""
+    counter = iter(range(total))
+    lock = threading.Lock()
+    stats = {"ok": 0, "fail": 0, "errors": {}}
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            try:
+                send_one(port, make_payload(i, run_id), timeout)
+                with lock:
+                    stats["ok"] += 1
+            except Exception as e:
+                with lock:
+                    stats["fail"] += 1
+                    key = type(e).__name__
+                    stats["errors"][key] = stats["errors"].get(key, 0) + 1
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def count_stored(db_path, run_id):
+    try:
+        with sqlite3.connect(db_path, timeout=5) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM clients WHERE name LIKE ?", (f"BENCH-{run_id}-%",)
+            ).fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+def run_mode(mode, logging, args):
+    workdir = make_workdir()
+    port = free_port()
+    settings = {
+        "server_ip": "127.0.0.1",
+        "server_port": port,
+        "log_path": os.path.join(workdir, "server_log.txt"),
+        "ingest_mode": mode,
+        "listen_backlog": args.backlog,
+        "max_connections": args.max_connections,
+        # on: 보고마다 수신 로그 (초당 상한 없음 - 로깅 비용 그대로 측정) / off: 로그 끔
+        "log_level": "DEBUG" if logging == "on" else "OFF",
+        "log_rate_limits": {}
+    }
+    proc, server_dir = start_server_copy(workdir, settings)
+    db_path = os.path.join(server_dir, "client_status.db")
+    run_id = f"{mode}{int(time.time())}"
+    try:
+        stats = fire(port, args.reports, args.concurrency, args.timeout, run_id)
+
+        # 배치 저장이 끝날 때까지 대기 (저장 건수 = 실제 수신 처리 건수)
+        drain_start = time.perf_counter()
+        stored = 0
+        while time.perf_counter() - drain_start < args.drain_timeout:
+            stored = count_stored(db_path, run_id)
+            if stored >= stats["ok"]:
+                break
+            time.sleep(0.5)
+        drained = time.perf_counter() - drain_start
+    finally:
+        stop_process(proc)
+
+    log_path = settings["log_path"]
+    return {
+        "mode": mode,
+        "logging": logging,
+        "reports": args.reports,
+        "concurrency": args.concurrency,
+        "sent_ok": stats["ok"],
+        "sent_fail": stats["fail"],
+        "errors": stats["errors"],
+        "send_elapsed_sec": round(stats["elapsed"], 3),
+        "send_reports_per_sec": round(stats["ok"] / stats["elapsed"], 1) if stats["elapsed"] else 0,
+        "stored": stored,
+        "drain_sec": round(drained, 3),
+        "log_bytes": os.path.getsize(log_path) if os.path.exists(log_path) else 0,
+        "workdir": workdir
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="server.py 수신 처리량 측정")
+    parser.add_argument("--mode", choices=["thread", "asyncio", "both"], default="both")
+    parser.add_argument("--reports", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--backlog", type=int, default=128)
+    parser.add_argument("--max-connections", type=int, default=512)
+    parser.add_argument("--timeout", type=float, default=3.0, help="송신 소켓 timeout (client.py 와 동일 3초)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--logging", choices=["on", "off", "both"], default="on",
+                        help="보고마다 수신 로그 기록 여부 (both = 둘 다 측정)")
+    args = parser.parse_args()
+
+    modes = ["thread", "asyncio"] if args.mode == "both" else [args.mode]
+    loggings = ["on", "off"] if args.logging == "both" else [args.logging]
+    results = [run_mode(m, lg, args) for m in modes for lg in loggings]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
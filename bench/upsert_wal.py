@@ -0,0 +1,92 @@
+# ========================================
+# 🧪 INSERT OR REPLACE vs UPSERT 비교
+# 📦 파일명: upsert_wal.py
+#   - 임시 DB 에 clients / daily_dia 를 배치로 반복 기록
+#   - 대부분의 보고는 다이아 값이 그대로 (현실적인 58초 주기 보고)
+#   - WAL 증가량과 커밋 시간을 비교
+#
+# 사용 예)
+#   python bench/upsert_wal.py --clients 1000 --rounds 60 --change-ratio 0.1
+# ========================================
+
+import argparse, json, os, random, sqlite3, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"))
+import server  # noqa: E402  (import 시 DB 를 건드리지 않음)
+
+from bench_util import make_workdir
+
+LEGACY_CLIENTS_SQL = """
+INSERT OR REPLACE INTO clients
+(name, ip, game, server, dia, last_report, status, message)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+LEGACY_DAILY_SQL = """
+INSERT OR REPLACE INTO daily_dia
+(date, name, ip, game, server, dia, status, message)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def run(label, clients_sql, daily_sql, args):
+    workdir = make_workdir()
+    server.DB_PATH = os.path.join(workdir, "client_status.db")
+    server.init_db()
+
+    conn = sqlite3.connect(server.DB_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA wal_autocheckpoint=0")  # WAL 증가량을 그대로 보기 위해 체크포인트 끔
+    wal_path = server.DB_PATH + "-wal"
+
+    rng = random.Random(42)
+    dia = {f"NC-BENCH-{i:05d}": 10000 + i for i in range(args.clients)}
+    today = "2026-01-01"
+    commit_ms = []
+
+    for r in range(args.rounds):
+        stamp = f"2026-01-01 00:{r // 60:02d}:{r % 60:02d}"
+        clients_rows, daily_rows = [], []
+        for name in dia:
+            if rng.random() < args.change_ratio:
+                dia[name] += rng.randint(1, 500)
+            clients_rows.append((name, "10.0.0.1", "NC", "S01", dia[name], stamp, "alive", "..."))
+            daily_rows.append((today, name, "10.0.0.1", "NC", "S01", dia[name], "alive", "..."))
+
+        started = time.perf_counter()
+        conn.executemany(clients_sql, clients_rows)
+        conn.executemany(daily_sql, daily_rows)
+        conn.commit()
+        commit_ms.append((time.perf_counter() - started) * 1000)
+
+    wal_bytes = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+    conn.close()
+    commit_ms.sort()
+    return {
+        "mode": label,
+        "clients": args.clients,
+        "rounds": args.rounds,
+        "change_ratio": args.change_ratio,
+        "wal_bytes": wal_bytes,
+        "wal_bytes_per_round": wal_bytes // args.rounds,
+        "avg_commit_ms": round(sum(commit_ms) / len(commit_ms), 2),
+        "p95_commit_ms": round(commit_ms[int(len(commit_ms) * 0.95) - 1], 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 writer UPSERT 효과 측정")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=60)
+    parser.add_argument("--change-ratio", type=float, default=0.1, help="라운드마다 다이아가 바뀌는 클라이언트 비율")
+    args = parser.parse_args()
+
+    results = [
+        run("insert_or_replace", LEGACY_CLIENTS_SQL, LEGACY_DAILY_SQL, args),
+        run("upsert", server.CLIENTS_UPSERT_SQL, server.DAILY_DIA_UPSERT_SQL, args),
+    ]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,23 +15,46 @@
 🗃️ 데이터베이스:
 - SQLite 사용 (../server/client_status.db)
 - clients 테이블: 실시간 클라이언트 상태 정보
-- daily_dia 테이블: 일별 다이아 기록 히스토리
+- daily_dia 테이블: 일별 다이아 기록 히스토리 (diff: 전일 대비 증감)
+- ini_commands 테이블: INI 명령 이력 겸 전송 작업 큐 (PENDING → SENDING → SUCCESS/FAILED)
+- daily_totals / daily_server_totals: 일별 합계 (server.py 가 기록 시 갱신)
 
 🌐 API 엔드포인트:
 - GET /              → 메인 대시보드 페이지
 - GET /api/clients   → 클라이언트 상태 데이터 (JSON)
+                         (ETag/If-None-Match → 304, ?since=<버전> → 바뀐 클라이언트만)
 - GET /dia-history   → 다이아 히스토리 페이지
 - GET /api/dia-history → 다이아 히스토리 데이터 (JSON)
+                         (?resolution=raw|hour|day → 하루 중 변화 시계열)
+- GET /api/dia-agg/total            → 날짜별 전체 합계 (추세 차트)
+- GET /api/dia-agg/<server|game|prefix> → 날짜 x 그룹별 합계
+- GET /api/dia-agg/movers           → 기간 증감 상위/하위 N
+- POST /api/send-ini → INI 명령 전송 작업 등록 (job_id 반환, 백그라운드 전송/재시도)
+- GET /api/send-ini/<job_id> → 전송 진행 상황 / 대상별 결과, 시도 횟수, 소요 시간
+- GET /api/ini-history → INI 명령 이력 (필터 + 페이지 단위, 최신순)
+- GET /metrics       → Prometheus 지표 (라우트별 응답 시간, INI 전송 지연, 스트림 연결 수)
+- GET /api/server-status → 메인/웹 서버 상태 (백그라운드 확인 결과 캐시, server.py 상태 파일 포함)
+- GET /api/stream    → 실시간 상태 푸시 (Server-Sent Events)
+                         clients(바뀐 클라이언트) / stale / alive / ini(INI 결과) / server_status
 
 🎯 용도: 게임 봇/클라이언트 관리 시스템 (다중 서버, 다중 계정 모니터링)
 """
 
-from flask import Flask, render_template, jsonify, request, make_response
+from flask import Flask, render_template, jsonify, request, make_response, Response, g
 import sqlite3
 import os
 import datetime
 import json
-from server_send import send_ini_command
+import queue
+import threading
+import time
+import pathlib
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from server_send import deliver_ini, record_ini_results
+import metrics
 
 # ───────────────────────────────────────────────────────
 # Flask 애플리케이션 설정
@@ -48,6 +71,130 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH  = os.path.join(BASE_DIR, '..', 'server', 'client_status.db')
 print("▶ 실제 사용하는 DB_PATH:", DB_PATH, flush=True)
 
+# 🔥 server.py 가 내보내는 전체 클라이언트 상태 스냅샷 (DB 와 같은 폴더)
+SNAPSHOT_PATH = os.path.join(BASE_DIR, '..', 'server', 'client_snapshot.json')
+
+
+class SnapshotState:
+    """스냅샷 1개 (읽기 전용) - rev / clients / body 가 항상 같은 파일에서 나온 값"""
+    __slots__ = ('key', 'rev', 'clients', 'body')
+
+    def __init__(self, key, rev, clients, body):
+        self.key = key
+        self.rev = rev
+        self.clients = clients
+        self.body = body
+
+
+class ClientSnapshot:
+    """
+    client_snapshot.json 을 파일 변경(mtime/크기) 시에만 다시 읽어 메모리에 보관
+    - 전체 목록은 미리 직렬화해 두고 그대로 응답
+    - 파일이 없거나 MAX_AGE_SEC 동안 갱신이 없으면 (서버 중지/구버전) None → DB 조회
+    - 새로 읽은 값은 SnapshotState 하나로 만들어 한 번에 교체
+      → 동시 요청이 새 목록과 이전 rev(ETag) 를 섞어 받지 않음
+    """
+    MAX_AGE_SEC = 90  # server.py snapshot_refresh_sec(30초) x 3
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = None
+
+    def get(self):
+        """→ SnapshotState (rev, clients, body) 또는 None"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if time.time() - st.st_mtime > self.MAX_AGE_SEC:
+            return None
+
+        key = (st.st_mtime_ns, st.st_size)
+        state = self.state
+        if state is None or state.key != key:
+            with self.lock:
+                state = self.state
+                if state is None or state.key != key:
+                    try:
+                        with open(self.path, 'rb') as f:
+                            data = json.loads(f.read())
+                    except (OSError, ValueError):
+                        return None
+                    clients = data['clients']
+                    state = SnapshotState(key, data['rev'], clients,
+                                          json.dumps(clients, ensure_ascii=False).encode('utf-8'))
+                    self.state = state
+        return state
+
+
+client_snapshot = ClientSnapshot(SNAPSHOT_PATH)
+
+# 🗃️ 조회용 읽기 전용 연결 풀 설정
+READ_POOL_SIZE = 8                   # 보관할 유휴 연결 수 (0 = 풀 없이 요청마다 연결)
+READ_CACHE_KB = 16384                # 연결당 페이지 캐시 (16MB)
+READ_MMAP_BYTES = 256 * 1024 * 1024  # 메모리 맵 읽기 (256MB)
+
+
+class ReadPool:
+    """
+    조회 API 용 SQLite 연결 풀
+    - mode=ro + query_only: 웹 서버는 읽기만 → server.py writer 와 잠금 경쟁 없음 (WAL)
+    - Flask 개발 서버는 요청마다 스레드가 새로 생기므로 스레드 로컬 대신 공용 풀에서 빌려 씀
+    - 연결을 재사용하므로 같은 SQL 문은 연결별 statement 캐시(cached_statements)에서 재사용
+    - 쓰기(ini_commands 등)는 기존처럼 sqlite3.connect(DB_PATH) 사용
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.idle = []
+        self.path = None
+
+    def open(self):
+        """풀과 별개로 읽기 전용 연결 1개 생성 (오래 붙잡는 용도: 이벤트 reader 등)"""
+        uri = pathlib.Path(DB_PATH).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, timeout=5, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA cache_size = -{READ_CACHE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {READ_MMAP_BYTES}")
+        return conn
+
+    def acquire(self):
+        with self.lock:
+            if self.path != DB_PATH:
+                # DB 경로가 바뀜 (테스트/벤치) → 이전 연결 정리
+                for conn in self.idle:
+                    conn.close()
+                self.idle = []
+                self.path = DB_PATH
+            if self.idle:
+                return self.idle.pop()  # 최근에 쓴 연결부터 (캐시가 따뜻함)
+        if self.size <= 0:
+            return sqlite3.connect(DB_PATH)  # 이전 방식 (비교용)
+        return self.open()
+
+    def release(self, conn):
+        conn.row_factory = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self.lock:
+            if self.size > 0 and self.path == DB_PATH and len(self.idle) < self.size:
+                self.idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+
+read_pool = ReadPool(READ_POOL_SIZE)
+
 # 🌐 CORS 설정 (파일 직접 접근 허용)
 @app.after_request
 def after_request(response):
@@ -56,6 +203,42 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+# ───────────────────────────────────────────────────────
+# 📊 Prometheus 지표 (/metrics) - 라우트별 응답 시간, INI 전송 지연 등
+# ───────────────────────────────────────────────────────
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+HTTP_SECONDS = metrics.Histogram(
+    "board_http_request_seconds", "라우트별 응답 시간 (초, 스트림은 첫 응답까지)",
+    LATENCY_BUCKETS, ("route", "method"))
+HTTP_REQUESTS = metrics.Counter(
+    "board_http_requests_total", "라우트별 요청 수", ("route", "method", "status"))
+INI_SEND_SECONDS = metrics.Histogram(
+    "board_ini_send_seconds", "INI 1건 전송~응답 시간 (초, result: success/retry/failed)",
+    LATENCY_BUCKETS, ("result",))
+metrics.Gauge("board_stream_subscribers", "/api/stream 연결 수", lambda: len(event_hub.subscribers))
+metrics.Gauge("board_ini_in_flight", "전송 중인 INI 명령 수", lambda: ini_queue.in_flight)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # 라우트 패턴 기준 (/api/send-ini/<job_id> 등 → 라벨 수가 늘지 않음)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_SECONDS.observe(time.perf_counter() - started, route, request.method)
+        HTTP_REQUESTS.inc(1, route, request.method, str(response.status_code))
+    return response
+
+
+@app.route('/metrics')
+def metrics_page():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 
 def init_ini_commands_db():
     """INI 명령 이력 테이블 초기화"""
@@ -75,6 +258,35 @@ def init_ini_commands_db():
                 error_message TEXT
             )
         ''')
+        # 📣 변경 이벤트 (server.py 와 같은 정의 - INI 결과는 웹 서버가 직접 기록)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL NOT NULL,
+                kind TEXT NOT NULL,
+                data TEXT
+            )
+        ''')
+        columns = [r[1] for r in cursor.execute("PRAGMA table_info(ini_commands)").fetchall()]
+        if 'latency_ms' not in columns:
+            cursor.execute("ALTER TABLE ini_commands ADD COLUMN latency_ms REAL")  # 전송~응답 소요 시간
+        if 'attempts' not in columns:
+            # 📨 전송 작업 큐 (IniDeliveryQueue) 용 컬럼
+            cursor.execute("ALTER TABLE ini_commands ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            cursor.execute("ALTER TABLE ini_commands ADD COLUMN next_retry_at REAL")
+            cursor.execute("ALTER TABLE ini_commands ADD COLUMN job_id TEXT")
+            # 이전 버전에서 끝나지 않은 명령은 뒤늦게 보내지 않도록 실패 처리
+            cursor.execute('''
+                UPDATE ini_commands SET execution_status='FAILED', execution_result='이전 버전에서 미완료'
+                WHERE execution_status IN ('PENDING', 'SENDING')
+            ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ini_commands_pending ON ini_commands (execution_status, next_retry_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ini_commands_client ON ini_commands (client_ip, execution_status, id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ini_commands_job ON ini_commands (job_id)")
+        # 📜 이력 조회용 (인덱스 끝에 rowid 가 붙으므로 필터 + ORDER BY id 를 정렬 없이 처리)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ini_commands_ip ON ini_commands (client_ip)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ini_commands_status ON ini_commands (execution_status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ini_commands_sent ON ini_commands (sent_timestamp)")
         conn.commit()
 
 # ───────────────────────────────────────────────────────
@@ -89,7 +301,7 @@ def dashboard():
     - clients 테이블에서 모든 클라이언트 정보를 가져와서
     - dashboard.html 템플릿에 전달 (초기 로딩용)
     """
-    with sqlite3.connect(DB_PATH) as conn:
+    with read_pool.connection() as conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute(
             "SELECT * FROM clients ORDER BY last_report DESC"
@@ -121,17 +333,202 @@ def api_clients():
         "ip": "IP 주소",
         "game": "게임명",
         "status": "상태값",
-        "last_report": "마지막 접속 시간"
+        "last_report": "마지막 접속 시간",
+        "rev": "마지막으로 바뀐 데이터 버전"
       },
       ...
     ]
+
+    🔢 데이터 버전 (server.py 가 clients 를 바꿀 때마다 증가):
+    - ETag = 데이터 버전 → If-None-Match 가 같으면 304 (DB 조회/직렬화 없음)
+    - ?since=<버전>: 그 이후 바뀐 클라이언트만
+      {"rev": 현재 버전, "full": false, "clients": [...]}
+      (since=0 이거나 DB 가 초기화돼 버전이 되돌아간 경우 full=true 로 전체 반환)
+      since 가 현재 버전과 같으면 304 (since=0 은 캐시가 없는 첫 요청이므로 버전이 0 이어도 항상 전체 응답)
+
+    🔥 server.py 가 실행 중이면 client_snapshot.json (메모리 캐시) 에서 응답, 없으면 DB 조회
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    since = request.args.get('since', type=int)
+
+    # 🔥 server.py 가 내보낸 상태 스냅샷이 있으면 DB 를 건드리지 않고 응답
+    snap = client_snapshot.get()
+    if snap is not None:
+        rev = snap.rev
+    else:
+        with read_pool.connection() as conn:
+            try:
+                rev = conn.execute("SELECT rev FROM data_version WHERE name = 'clients'").fetchone()[0]
+            except (sqlite3.OperationalError, TypeError):
+                rev = None  # 버전 테이블이 없는 DB (서버 업그레이드 전) → 항상 전체 응답
+
+    etag = f'clients-{rev}'
+    if rev is not None and ((since is not None and since > 0 and since == rev)
+                            or (since is None and request.if_none_match.contains(etag))):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    full = since is None or rev is None or since <= 0 or since > rev
+    if snap is not None:
+        if since is None:
+            response = Response(snap.body, mimetype='application/json')  # 미리 직렬화한 전체 목록
+        else:
+            rows = snap.clients if full else [c for c in snap.clients if (c['rev'] or 0) > since]
+            response = jsonify({'rev': rev, 'full': full, 'clients': rows})
+    else:
+        with read_pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+            if full:
+                rows = conn.execute(
+                    "SELECT * FROM clients ORDER BY last_report DESC"
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM clients WHERE rev > ? ORDER BY last_report DESC", (since,)
+                ).fetchall()
+
+        if since is None:
+            response = jsonify([dict(r) for r in rows])
+        else:
+            response = jsonify({'rev': rev, 'full': full, 'clients': [dict(r) for r in rows]})
+
+    if rev is not None:
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # 매번 서버에 재검증 (변화 없으면 304)
+    return response
+
+
+# ───────────────────────────────────────────────────────
+# 📣 실시간 스트림 (/api/stream)
+#    → server.py / server_send.py 가 events 테이블에 남긴 변경을
+#      공유 reader 스레드 1개가 읽어 모든 브라우저에 fan-out
+# ───────────────────────────────────────────────────────
+
+class EventHub:
+    """
+    /api/stream 구독자 관리
+    - 구독자가 있을 때만 reader 스레드 동작 (events 를 id 순으로 0.5초마다 조회)
+    - clients 이벤트는 바뀐 행을 한 번만 조회해 모든 구독자에게 같이 전달
+    - 큐가 가득 찬 느린 구독자는 끊음 → 브라우저가 재연결하며 변경분 재조회
+    """
+    POLL_SEC = 0.5
+    HEARTBEAT_SEC = 15
+    QUEUE_MAX = 256
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.thread = None
+
+    def subscribe(self):
+        q = queue.Queue(self.QUEUE_MAX)
+        with self.lock:
+            self.subscribers.add(q)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True, name="event-hub")
+                self.thread.start()
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            self.subscribers.discard(q)
+
+    def is_subscribed(self, q):
+        with self.lock:
+            return q in self.subscribers
+
+    def broadcast(self, kind, data):
+        message = f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        with self.lock:
+            targets = list(self.subscribers)
+        for q in targets:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                self.unsubscribe(q)
+
+    def run(self):
+        conn = None
+        last_id = last_rev = None
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    self.thread = None  # 구독자 없음 → 종료 (다음 구독 시 현재 위치부터 다시 시작)
+                    break
+            try:
+                if conn is None:
+                    conn = read_pool.open()
+                    conn.row_factory = sqlite3.Row
+                    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+                    last_rev = self.clients_rev(conn)
+                last_id, last_rev = self.poll(conn, last_id, last_rev)
+            except sqlite3.Error as e:
+                print(f"⚠️ 이벤트 조회 실패: {e}", flush=True)
+                if conn is not None:
+                    conn.close()
+                conn = None
+                time.sleep(5)
+            time.sleep(self.POLL_SEC)
+        if conn is not None:
+            conn.close()
+
+    @staticmethod
+    def clients_rev(conn):
+        row = conn.execute("SELECT rev FROM data_version WHERE name = 'clients'").fetchone()
+        return row[0] if row else 0
+
+    def poll(self, conn, last_id, last_rev):
         rows = conn.execute(
-            "SELECT * FROM clients ORDER BY last_report DESC"
+            "SELECT id, kind, data FROM events WHERE id > ? ORDER BY id LIMIT 1000", (last_id,)
         ).fetchall()
-    return jsonify([dict(r) for r in rows])
+
+        clients_changed = False
+        for row in rows:
+            last_id = row['id']
+            if row['kind'] == 'clients':
+                clients_changed = True  # 여러 배치를 한 번의 조회로 묶음
+            else:
+                self.broadcast(row['kind'], json.loads(row['data'] or '{}'))
+
+        if clients_changed:
+            rev = self.clients_rev(conn)
+            changed = conn.execute(
+                "SELECT * FROM clients WHERE rev > ? ORDER BY last_report DESC", (last_rev,)
+            ).fetchall()
+            self.broadcast('clients', {'rev': rev, 'clients': [dict(r) for r in changed]})
+            last_rev = rev
+        return last_id, last_rev
+
+
+event_hub = EventHub()
+
+
+@app.route('/api/stream')
+def api_stream():
+    """
+    📣 실시간 상태 스트림 (text/event-stream)
+    - event: clients → {"rev": 버전, "clients": [바뀐 클라이언트...]}
+    - event: stale / alive → {"name": ..., "last": 마지막 보고 epoch}
+    - event: ini → {"filename", "status", "result", "client_ip", "client_name"}
+    - event: server_status → /api/server-status 와 같은 내용 (메인/웹 서버 상태가 바뀔 때)
+    """
+    q = event_hub.subscribe()
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            while event_hub.is_subscribed(q):
+                try:
+                    yield q.get(timeout=EventHub.HEARTBEAT_SEC)
+                except queue.Empty:
+                    yield ": ping\n\n"  # 연결 유지 (프록시/브라우저 타임아웃 방지)
+        finally:
+            event_hub.unsubscribe(q)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 
 # ───────────────────────────────────────────────────────
@@ -145,6 +542,31 @@ def dia_history_page():
     return render_template('dia-history.html')
 
 
+# 일별 히스토리 조회 (daily_dia.diff 는 server.py 가 기록 시 계산)
+DIA_HISTORY_SQL = """
+SELECT substr(date,1,10) AS day, name, game, server, dia, diff
+FROM daily_dia
+WHERE date >= ? AND date < ?
+ORDER BY date ASC, name ASC
+"""
+
+# 집계 테이블이 없는 DB 용: 각 행마다 하루 전(N-1일 포함) 행을 (date, name) 으로 조인해 계산
+DIA_HISTORY_FALLBACK_SQL = """
+SELECT
+  substr(d.date,1,10) AS day,
+  d.name,
+  d.game,
+  d.server,
+  d.dia,
+  d.dia - COALESCE(p.dia, 0) AS diff
+FROM daily_dia d
+LEFT JOIN daily_dia p
+  ON p.date = date(d.date, '-1 day') AND p.name = d.name
+WHERE d.date >= ? AND d.date < ?
+ORDER BY d.date ASC, d.name ASC
+"""
+
+
 @app.route('/api/dia-history')
 def api_dia_history():
     """
@@ -155,10 +577,16 @@ def api_dia_history():
 
     처리 로직:
     1. 오늘부터 과거 N일간의 날짜 리스트 생성
-    2. daily_dia 테이블에서 해당 기간 데이터 조회
-    3. 날짜별/클라이언트별로 데이터 집계
-    4. 전일 대비 증감(diff) 계산
+    2. daily_dia 테이블에서 해당 기간을 날짜 범위 조건으로 조회
+    3. 전일 대비 증감(diff) / 일별 TOTAL 은 서버가 유지하는 집계(diff 컬럼, daily_totals) 사용
+       (집계 테이블이 없으면 하루 전 행과 조인해 직접 계산)
+    4. 날짜별/클라이언트별로 데이터 정리
     """
+    # 📈 resolution 지정 시 시계열(샘플/요약) 응답
+    resolution = request.args.get('resolution')
+    if resolution:
+        return dia_series_response(resolution)
+
     # 📅 조회 기간 설정 (기본 7일)
     days = int(request.args.get('days', 7))
     today = datetime.date.today()
@@ -169,50 +597,424 @@ def api_dia_history():
         for i in range(days)
     ]
 
-    # 🔍 SQL 쿼리: IN 절을 이용해 특정 날짜들만 조회
-    placeholders = ','.join('?' * len(wanted))
+    # 🔍 날짜 범위 조건 (date 로 시작하는 인덱스를 그대로 사용)
+    #   - date 에 시각이 붙은 행도 있으므로 상한은 "다음날 미만"
+    #   - 전일 대비 증감(diff)과 일별 합계는 server.py 배치 writer 가 미리 계산해 둔 값 사용
+    first_day = today - datetime.timedelta(days=days - 1)
+    end_day   = today + datetime.timedelta(days=1)
+    date_range = (first_day.isoformat(), end_day.isoformat())
+
+    with read_pool.connection() as conn:
+        try:
+            rows = conn.execute(DIA_HISTORY_SQL, date_range).fetchall()
+            totals = dict(conn.execute(
+                "SELECT date, total_dia FROM daily_totals WHERE date >= ? AND date < ?", date_range
+            ).fetchall())
+        except sqlite3.OperationalError:
+            # 집계 테이블이 아직 없는 DB (서버 업그레이드 전) → 조회 시 직접 계산
+            rows = conn.execute(DIA_HISTORY_FALLBACK_SQL, date_range).fetchall()
+            totals = None
+
+    # 📊 데이터 가공: 날짜별 TOTAL 및 구조 정리
+    stats = {d: {'TOTAL': 0} for d in wanted}
+    for day, name, game, server, dia, diff in rows:
+        day_stats = stats[day]
+        day_stats[name] = {
+            'today': dia,
+            'diff': dia if diff is None else diff,  # 어제 데이터가 없으면 현재값 그대로
+            'game': game,
+            'server': server
+        }
+        if totals is None:
+            day_stats['TOTAL'] += dia  # 일별 총합 계산
+    if totals is not None:
+        for day, total in totals.items():
+            if day in stats:
+                stats[day]['TOTAL'] = total
+
+    return jsonify(stats)
+
+# ───────────────────────────────────────────────────────
+# 3) 📉 추세 차트용 집계 API (daily_dia → SQLite GROUP BY)
+#    → 클라이언트별 전체 맵 대신 날짜 x 그룹 합계만 열 단위 배열로 반환
+# ───────────────────────────────────────────────────────
+
+# 그룹 키 → SQL 식
+AGG_GROUP_KEYS = {
+    'server': "server",
+    'game':   "game",
+    # 이름 접두어 ("NC-테오필-01" → "NC") - 서버별 추세 차트가 쓰는 묶음
+    'prefix': "CASE WHEN instr(name, '-') > 0 THEN substr(name, 1, instr(name, '-') - 1) ELSE name END",
+}
+
+
+def agg_date_range(days):
+    """오늘 포함 최근 days일 → (시작일, 다음날) ISO 문자열"""
+    today = datetime.date.today()
+    first_day = today - datetime.timedelta(days=days - 1)
+    end_day = today + datetime.timedelta(days=1)
+    return first_day.isoformat(), end_day.isoformat()
+
+
+@app.route('/api/dia-agg/total')
+def api_dia_agg_total():
+    """
+    📈 날짜별 전체 다이아 합계 - renderTotalTrendChart() 에서 호출
+
+    반환: {"dates": ["2025-01-01", ...], "total": [...], "clients": [...]}
+    (데이터가 있는 날짜만 포함)
+    """
+    days = int(request.args.get('days', 7))
+    sql = """
+    SELECT date, total_dia, client_count
+    FROM daily_totals
+    WHERE date >= ? AND date < ?
+    ORDER BY date
+    """
+    fallback_sql = """
+    SELECT substr(date,1,10) AS day, SUM(dia), COUNT(*)
+    FROM daily_dia
+    WHERE date >= ? AND date < ?
+    GROUP BY day
+    ORDER BY day
+    """
+    with read_pool.connection() as conn:
+        try:
+            rows = conn.execute(sql, agg_date_range(days)).fetchall()
+        except sqlite3.OperationalError:
+            rows = conn.execute(fallback_sql, agg_date_range(days)).fetchall()
+
+    return jsonify({
+        'dates':   [r[0] for r in rows],
+        'total':   [r[1] for r in rows],
+        'clients': [r[2] for r in rows]
+    })
+
+
+@app.route('/api/dia-agg/<group>')
+def api_dia_agg_group(group):
+    """
+    📊 날짜 x 그룹별 다이아 합계 - group: server | game | prefix
+    renderServerTrendChart() 는 prefix (이름 접두어) 사용
+
+    반환: {"dates": [...], "keys": ["NC", ...], "values": [[키1 날짜별 합계...], ...]}
+    """
+    key_expr = AGG_GROUP_KEYS.get(group)
+    if key_expr is None:
+        return jsonify({'error': f'지원하지 않는 그룹: {group}'}), 400
+
+    days = int(request.args.get('days', 7))
     sql = f"""
-    SELECT
-      substr(date,1,10) AS day,
-      name,
-      game,
-      server,
-      dia
+    SELECT substr(date,1,10) AS day, {key_expr} AS k, SUM(dia)
     FROM daily_dia
-    WHERE substr(date,1,10) IN ({placeholders})
-    ORDER BY day ASC, name ASC
+    WHERE date >= ? AND date < ?
+    GROUP BY day, k
+    ORDER BY day, k
     """
+    with read_pool.connection() as conn:
+        rows = None
+        if group == 'server':
+            # 서버별 합계는 server.py 가 daily_server_totals 에 미리 집계
+            try:
+                rows = conn.execute(
+                    "SELECT date, server, total_dia FROM daily_server_totals "
+                    "WHERE date >= ? AND date < ? AND client_count > 0 ORDER BY date, server",
+                    agg_date_range(days)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = None
+        if rows is None:
+            rows = conn.execute(sql, agg_date_range(days)).fetchall()
 
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(sql, wanted).fetchall()
+    dates = sorted({r[0] for r in rows})
+    keys = sorted({r[1] or '?' for r in rows})
+    date_idx = {d: i for i, d in enumerate(dates)}
+    key_idx = {k: i for i, k in enumerate(keys)}
+    values = [[0] * len(dates) for _ in keys]
+    for day, k, total in rows:
+        values[key_idx[k or '?']][date_idx[day]] += total
 
-    # 📊 데이터 가공: 날짜별 TOTAL 합산 및 구조 정리
-    stats = {d: {'TOTAL': 0} for d in wanted}
-    for r in rows:
-        d = r['day']
-        stats[d][r['name']] = {
-            'today': r['dia'],
-            'diff': 0,  # 전일 대비 증감 (아래에서 계산)
-            'game': r['game'],
-            'server': r['server']
-        }
-        stats[d]['TOTAL'] += r['dia']  # 일별 총합 계산
+    return jsonify({'dates': dates, 'keys': keys, 'values': values})
 
-    # diff 계산: 전일 대비 today 차이
-    for d in wanted:
-        prev = (datetime.date.fromisoformat(d) - datetime.timedelta(days=1)).isoformat()
-        for name, info in stats[d].items():
-            if name == 'TOTAL':
-                continue
-            prev_info = stats.get(prev, {}).get(name)
-            info['diff'] = info['today'] - (prev_info['today'] if prev_info else 0) # 어제 데이터가 있으면 차이 계산, 없으면 현재값 그대로
 
-    return jsonify(stats)
+@app.route('/api/dia-agg/movers')
+def api_dia_agg_movers():
+    """
+    🚀 기간 내 다이아 증감 상위/하위 N - /api/dia-agg/movers?days=7&limit=10
+
+    오늘 값 - (기간 시작 전날 값, 없으면 0)
+    반환: {"start": "...", "end": "...",
+           "gainers": {"name": [...], "delta": [...], "dia": [...]},
+           "losers":  {"name": [...], "delta": [...], "dia": [...]}}
+    """
+    days = int(request.args.get('days', 7))
+    limit = int(request.args.get('limit', 10))
+    today = datetime.date.today()
+    base_day = (today - datetime.timedelta(days=days)).isoformat()
+    end_day = today.isoformat()
+
+    sql = """
+    SELECT e.name, e.dia - COALESCE(b.dia, 0) AS delta, e.dia
+    FROM daily_dia e
+    LEFT JOIN daily_dia b ON b.date = ? AND b.name = e.name
+    WHERE e.date = ?
+    ORDER BY delta {order}
+    LIMIT ?
+    """
+
+    def columns(rows):
+        return {'name': [r[0] for r in rows], 'delta': [r[1] for r in rows], 'dia': [r[2] for r in rows]}
+
+    with read_pool.connection() as conn:
+        gainers = conn.execute(sql.format(order='DESC'), (base_day, end_day, limit)).fetchall()
+        losers = conn.execute(sql.format(order='ASC'), (base_day, end_day, limit)).fetchall()
+
+    return jsonify({'start': base_day, 'end': end_day, 'gainers': columns(gainers), 'losers': columns(losers)})
+
+
+# 📈 시계열 해상도 (server.py 의 dia_samples / dia_rollup 테이블)
+SERIES_RESOLUTIONS = {'raw': None, 'hour': 3600, 'day': 86400}
+
+
+def dia_series_response(resolution):
+    """
+    하루 중 다이아 변화 시계열 - /api/dia-history?resolution=raw|hour|day
+
+    파라미터:
+    - days: 조회 기간 (기본: raw/hour 1일, day 30일)
+    - name: 특정 클라이언트만 (선택)
+
+    반환 (값이 바뀔 때만 기록되므로 빈 구간은 직전 값 유지로 해석):
+    {
+      "resolution": "hour", "since": 1700000000,
+      "series": {"클라이언트명": {"t": [epoch...], "dia": [...], "min": [...], "max": [...]}}
+    }
+    raw 는 t/dia 만 포함
+    """
+    if resolution not in SERIES_RESOLUTIONS:
+        return jsonify({'error': f'지원하지 않는 resolution: {resolution}'}), 400
+
+    res = SERIES_RESOLUTIONS[resolution]
+    days = float(request.args.get('days', 30 if res == 86400 else 1))
+    name = request.args.get('name')
+    since = int(datetime.datetime.now().timestamp() - days * 86400)
+
+    name_filter = "WHERE c.name = ?" if name else ""
+    if res is None:
+        sql = f"""
+        SELECT c.name, s.ts AS t, s.dia
+        FROM client_ids c
+        JOIN dia_samples s ON s.client_id = c.id AND s.ts >= ?
+        {name_filter}
+        ORDER BY c.name, s.ts
+        """
+        params = [since]
+    else:
+        sql = f"""
+        SELECT c.name, r.bucket AS t, r.last_dia AS dia, r.min_dia, r.max_dia
+        FROM client_ids c
+        JOIN dia_rollup r ON r.res = ? AND r.client_id = c.id AND r.bucket >= ?
+        {name_filter}
+        ORDER BY c.name, r.bucket
+        """
+        params = [res, since]
+    if name:
+        params.append(name)
+
+    series = {}
+    try:
+        with read_pool.connection() as conn:
+            for row in conn.execute(sql, params):
+                s = series.get(row[0])
+                if s is None:
+                    s = series[row[0]] = {'t': [], 'dia': []} if res is None else \
+                        {'t': [], 'dia': [], 'min': [], 'max': []}
+                s['t'].append(row[1])
+                s['dia'].append(row[2])
+                if res is not None:
+                    s['min'].append(row[3])
+                    s['max'].append(row[4])
+    except sqlite3.OperationalError:
+        pass  # 시계열 테이블이 아직 없는 DB (구버전 server.py)
+
+    return jsonify({'resolution': resolution, 'since': since, 'series': series})
+
+# ───────────────────────────────────────────────────────
+# 📨 INI 명령 전송 작업 큐 (ini_commands 테이블 기반)
+#    → 요청은 행만 기록하고 job_id 를 바로 반환, 전송/재시도는 백그라운드
+#      진행 상황은 /api/send-ini/<job_id> 조회 또는 /api/stream 의 ini 이벤트
+# ───────────────────────────────────────────────────────
+SEND_INI_CONCURRENCY = 32     # 동시에 전송하는 대상 수 (전체 작업 공용)
+SEND_INI_DEADLINE_SEC = 5.0   # 대상 1개당 연결~응답 제한 시간
+INI_MAX_ATTEMPTS = 4          # 최대 전송 시도 횟수 (모두 실패하면 FAILED 확정)
+INI_RETRY_BASE_SEC = 5        # 재시도 대기: 5 → 10 → 20초 ... (지수 증가)
+INI_RETRY_MAX_SEC = 300       # 재시도 대기 상한
+INI_RESULT_LINGER_SEC = 0.05  # 전송 중인 대상이 있으면 결과를 잠깐 모아서 한 번에 기록
+
+
+class IniDeliveryQueue:
+    """
+    INI 전송 작업 큐
+    - 상태: PENDING → SENDING → SUCCESS / FAILED
+      (실패 시 시도 횟수가 남았으면 다시 PENDING + next_retry_at = 지수 백오프)
+    - 같은 클라이언트(IP)의 명령은 등록 순서대로 하나씩 (앞 명령이 끝나야 다음 명령)
+    - dispatcher 스레드 1개가 보낼 행을 SENDING 으로 선점 → 스레드 풀에서 전송
+    - 전송 결과는 dispatcher 가 모아서 한 트랜잭션으로 기록 (행 id 기준 UPDATE)
+    - 웹 서버가 재시작되면 SENDING 으로 남은 행은 PENDING 으로 되돌려 다시 보냄
+    """
+
+    # 클라이언트별 가장 오래된 미완료 명령 중 재시도 시각이 된 것만
+    CLAIM_SQL = """
+    SELECT id, client_ip, client_name, filename, command_content, attempts
+    FROM ini_commands c
+    WHERE execution_status = 'PENDING'
+      AND COALESCE(next_retry_at, 0) <= ?
+      AND id = (SELECT MIN(id) FROM ini_commands o
+                WHERE o.client_ip = c.client_ip AND o.execution_status IN ('PENDING', 'SENDING'))
+    ORDER BY id
+    LIMIT ?
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='ini-send')
+        self.wakeup = threading.Event()
+        self.results = queue.Queue()   # 전송 스레드 → dispatcher (기록 대기 결과)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.thread = None
+
+    def ensure_started(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True, name='ini-dispatcher')
+                self.thread.start()
+
+    def notify(self):
+        self.wakeup.set()
+
+    def run(self):
+        conn = None
+        recovered = False
+        while True:
+            try:
+                if conn is None:
+                    conn = sqlite3.connect(DB_PATH, timeout=10)
+                if not recovered:
+                    # 이전 실행에서 전송 중이던 행만 (재연결 때는 지금 전송 중인 행이므로 그대로)
+                    conn.execute("UPDATE ini_commands SET execution_status='PENDING' WHERE execution_status='SENDING'")
+                    conn.commit()
+                    recovered = True
+                wait = self.dispatch(conn)
+            except sqlite3.Error as e:
+                print(f"⚠️ INI 전송 큐 오류: {e}", flush=True)
+                if conn is not None:
+                    conn.close()
+                conn = None
+                wait = 5.0
+            self.wakeup.wait(wait)
+            self.wakeup.clear()
+            if self.in_flight and not self.results.empty():
+                time.sleep(INI_RESULT_LINGER_SEC)  # 동시에 끝나는 결과를 한 커밋으로
+
+    def flush(self, conn):
+        """쌓인 전송 결과를 한 트랜잭션으로 기록 → 기록한 건수"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            return record_ini_results(conn, batch)
+        except sqlite3.Error:
+            conn.rollback()
+            for result in batch:
+                self.results.put(result)  # 연결을 다시 열고 재시도
+            raise
+
+    def dispatch(self, conn):
+        """결과 기록 후 보낼 수 있는 만큼 선점해서 전송 시작 → 다음 확인까지 대기할 초"""
+        self.flush(conn)  # 결과가 기록돼야 같은 클라이언트의 다음 명령이 선점 대상이 됨
+        with self.lock:
+            free = self.concurrency - self.in_flight
+        if free <= 0:
+            return 1.0  # 전송이 끝나면 notify 로 깨어남
+
+        now_ts = time.time()
+        claimed = []
+        for row in conn.execute(self.CLAIM_SQL, (now_ts, free)).fetchall():
+            cur = conn.execute(
+                "UPDATE ini_commands SET execution_status='SENDING', attempts = attempts + 1 "
+                "WHERE id=? AND execution_status='PENDING'", (row[0],)
+            )
+            if cur.rowcount == 1:
+                claimed.append(row)
+        conn.commit()
+
+        with self.lock:
+            self.in_flight += len(claimed)
+        for row in claimed:
+            self.executor.submit(self.deliver, row)
+
+        next_due = conn.execute(
+            "SELECT MIN(next_retry_at) FROM ini_commands WHERE execution_status='PENDING' AND next_retry_at > ?",
+            (now_ts,)
+        ).fetchone()[0]
+        if next_due is None:
+            return 5.0  # 새 명령은 notify 로 바로 깨어남 (다른 프로세스가 넣은 명령 대비 주기 확인)
+        return max(0.05, min(5.0, next_due - now_ts))
+
+    def deliver(self, row):
+        """스레드 풀에서 1건 전송 → 결과/재시도 일정은 dispatcher 가 기록"""
+        row_id, ip, name, filename, content, attempts = row
+        attempts += 1
+        retry_at = None
+        try:
+            try:
+                ok, response, latency_ms = deliver_ini(ip, filename, content, SEND_INI_DEADLINE_SEC)
+            except Exception as e:
+                # 예상 못 한 오류도 전송 실패로 처리 → SENDING 에 남아 같은 IP 의 다음 명령까지 막히지 않도록
+                print(f"⚠️ INI 전송 실패: {filename} | {e}", flush=True)
+                ok, response, latency_ms = False, f'전송 오류: {e}', None
+            if ok:
+                status, result = 'SUCCESS', 'INI 파일 생성 완료'
+            elif attempts < INI_MAX_ATTEMPTS:
+                status, result = 'PENDING', response
+                retry_at = time.time() + min(INI_RETRY_MAX_SEC, INI_RETRY_BASE_SEC * 2 ** (attempts - 1))
+            else:
+                status, result = 'FAILED', response
+            if latency_ms is not None:
+                INI_SEND_SECONDS.observe(latency_ms / 1000, {'SUCCESS': 'success', 'PENDING': 'retry'}.get(status, 'failed'))
+
+            self.results.put({
+                'id': row_id, 'filename': filename, 'status': status, 'result': result,
+                'latency_ms': latency_ms, 'client_ip': ip, 'client_name': name,
+                'attempts': attempts, 'retry_at': retry_at
+            })
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+            self.wakeup.set()
+
+
+ini_queue = IniDeliveryQueue(SEND_INI_CONCURRENCY)
+
+
+@app.before_request
+def start_background_workers():
+    """첫 요청 때 INI 전송 큐 / 서버 상태 확인 시작 (debug 리로더의 감시 프로세스에서는 시작하지 않음)"""
+    ini_queue.ensure_started()
+    health_prober.ensure_started()
+
 
 @app.route('/api/send-ini', methods=['POST'])
 def send_ini_command():
-    """선택된 클라이언트들에게 INI 명령 전송"""
+    """
+    선택된 클라이언트들에게 INI 명령 전송 (비동기)
+    - ini_commands 에 PENDING 행을 한 트랜잭션으로 기록 → 전송 큐가 백그라운드로 전송/재시도
+    - 반환: {"success": true, "job_id": "...", "total": N, "message": "..."}
+    """
     try:
         data = request.get_json()
         selected_clients = data.get('clients', [])
@@ -223,111 +1025,278 @@ def send_ini_command():
 
         # 타임스탬프 생성
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
+        sent_at = datetime.datetime.now()
+        job_id = uuid.uuid4().hex[:12]
 
-        success_count = 0
-        success_clients = []  # 성공 목록 추가
-        error_messages = []
-
-        for client in selected_clients:
-            try:
-                # 파일명 생성
-                filename = f"{client['ip']}_{timestamp}.ini"
-
-                # DB에 전송 기록 저장
-                with sqlite3.connect(DB_PATH) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        INSERT INTO ini_commands 
-                        (client_ip, client_name, filename, command_content, sent_timestamp, execution_status)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (client['ip'], client['name'], filename, ini_content,
-                          datetime.datetime.now(), 'PENDING'))
-                    conn.commit()
-
-                # server_send.py로 실제 전송
-                from server_send import send_ini_command as send_ini
-                result = send_ini(client['ip'], filename, ini_content)
-
-                if 'SUCCESS' in result:
-                    success_count += 1
-                    success_clients.append(f"{client['name']} ({client['ip']})")  # 성공 목록에 추가
-                else:
-                    error_messages.append(f"{client['name']}: {result}")
-
-            except Exception as e:
-                error_messages.append(f"{client['name']}: {str(e)}")
+        # DB에 전송 기록 저장 (전체 대상 1회 커밋)
+        with sqlite3.connect(DB_PATH) as conn:
+            conn.executemany('''
+                INSERT INTO ini_commands
+                (client_ip, client_name, filename, command_content, sent_timestamp, execution_status, job_id)
+                VALUES (?, ?, ?, ?, ?, 'PENDING', ?)
+            ''', [(c['ip'], c['name'], f"{c['ip']}_{timestamp}.ini", ini_content, sent_at, job_id)
+                  for c in selected_clients])
+            conn.commit()
+        ini_queue.notify()
 
         return jsonify({
             'success': True,
-            'message': f'{success_count}개 클라이언트에 명령 전송 완료',
-            'success_clients': success_clients,  # 성공 목록 추가
-            'errors': error_messages
+            'job_id': job_id,
+            'total': len(selected_clients),
+            'message': f'{len(selected_clients)}개 클라이언트에 명령 전송 시작'
         })
 
     except Exception as e:
         return jsonify({'success': False, 'message': f'전송 실패: {str(e)}'})
 
+
+@app.route('/api/send-ini/<job_id>')
+def send_ini_progress(job_id):
+    """
+    INI 전송 작업 진행 상황
+    반환: {"job_id", "total", "success", "failed", "retrying", "in_progress",
+           "settled": 첫 시도가 끝난 대상 수, "finished": 모두 SUCCESS/FAILED 확정,
+           "targets": [{"name", "ip", "filename", "status", "result", "latency_ms", "attempts", "next_retry_at"}, ...]}
+    """
+    with read_pool.connection() as conn:
+        rows = conn.execute('''
+            SELECT client_name, client_ip, filename, execution_status, execution_result,
+                   latency_ms, attempts, next_retry_at
+            FROM ini_commands WHERE job_id=? ORDER BY id
+        ''', (job_id,)).fetchall()
+    if not rows:
+        return jsonify({'success': False, 'message': '알 수 없는 작업'}), 404
+
+    targets = [{'name': r[0], 'ip': r[1], 'filename': r[2], 'status': r[3], 'result': r[4],
+                'latency_ms': r[5], 'attempts': r[6], 'next_retry_at': r[7]} for r in rows]
+    count = lambda cond: sum(1 for t in targets if cond(t))
+    body = {
+        'job_id': job_id,
+        'total': len(targets),
+        'success': count(lambda t: t['status'] == 'SUCCESS'),
+        'failed': count(lambda t: t['status'] == 'FAILED'),
+        'retrying': count(lambda t: t['status'] == 'PENDING' and t['attempts'] > 0),
+        'in_progress': count(lambda t: t['status'] == 'SENDING' or (t['status'] == 'PENDING' and t['attempts'] == 0)),
+        'targets': targets
+    }
+    body['settled'] = body['total'] - body['in_progress']
+    body['finished'] = body['success'] + body['failed'] == body['total']
+    return jsonify(body)
+
+
+INI_HISTORY_MAX_LIMIT = 500
+
+
+@app.route('/api/ini-history')
+def api_ini_history():
+    """
+    📜 INI 명령 이력 - /api/ini-history?client_ip=...&status=FAILED&limit=50&before=<id>
+
+    파라미터 (모두 선택):
+    - client_ip / status / job_id : 조건 필터
+    - since / until : 전송 시각 범위 ('2024-01-31' 또는 '2024-01-31 12:00:00')
+    - limit  : 페이지 크기 (기본 50, 최대 500)
+    - before : 이전 응답의 next_before (이 id 보다 오래된 것부터 → 이력이 쌓여도 OFFSET 없이 일정한 속도)
+
+    반환: {"items": [{"id", "client_ip", "client_name", "filename", "sent_timestamp", "status",
+                      "execution_timestamp", "result", "latency_ms", "attempts", "job_id"}, ...],
+           "next_before": 다음 페이지 커서 (마지막 페이지면 null)}
+    """
+    limit = max(1, min(INI_HISTORY_MAX_LIMIT, int(request.args.get('limit', 50))))
+    before = request.args.get('before', type=int)
+
+    conditions, params = [], []
+    for arg, column in (('client_ip', 'client_ip'), ('status', 'execution_status'), ('job_id', 'job_id')):
+        value = request.args.get(arg)
+        if value:
+            conditions.append(f"{column} = ?")
+            params.append(value.upper() if arg == 'status' else value)
+    since = request.args.get('since')
+    if since:
+        conditions.append("sent_timestamp >= ?")
+        params.append(since.replace('T', ' '))
+    until = request.args.get('until')
+    if until:
+        # 날짜만 주면 그날 끝까지 포함
+        conditions.append("sent_timestamp < ?" if len(until) > 10 else "sent_timestamp < date(?, '+1 day')")
+        params.append(until.replace('T', ' '))
+    if before:
+        conditions.append("id < ?")
+        params.append(before)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
+    SELECT id, client_ip, client_name, filename, sent_timestamp, execution_status,
+           execution_timestamp, execution_result, latency_ms, attempts, job_id
+    FROM ini_commands
+    {where}
+    ORDER BY id DESC
+    LIMIT ?
+    """
+    with read_pool.connection() as conn:
+        rows = conn.execute(sql, params + [limit + 1]).fetchall()
+
+    keys = ('id', 'client_ip', 'client_name', 'filename', 'sent_timestamp', 'status',
+            'execution_timestamp', 'result', 'latency_ms', 'attempts', 'job_id')
+    items = [dict(zip(keys, r)) for r in rows[:limit]]
+    return jsonify({
+        'items': items,
+        'next_before': items[-1]['id'] if len(rows) > limit else None
+    })
+
 # ───────────────────────────────────────────────────────
-# 서버 상태 확인 API
+# 🩺 서버 상태 확인 API
+#    → 백그라운드 스레드가 주기적으로 확인해 둔 결과를 바로 반환
+#      (탭이 몇 개든 포트 접속 / 프로세스 조회는 주기당 1번)
 # ───────────────────────────────────────────────────────
-@app.route('/api/server-status')
-def get_server_status():
-    """메인 서버와 웹 서버 상태 확인"""
-    import socket
-    import psutil
-    import os
+SERVER_DIR = os.path.join(BASE_DIR, '..', 'server')
+HEALTH_PATH = os.path.join(SERVER_DIR, 'server_health.json')  # server.py 가 health_interval_sec 마다 기록
+HEALTH_PROBE_SEC = 5        # 상태 확인 주기
+HEALTH_MAX_AGE_SEC = 20     # 상태 파일이 이보다 오래되면 포트 접속으로 확인 (server.py 중지 / 구버전)
+PROCESS_SCAN_SEC = 30       # 프로세스 목록 확인 주기 (전체 프로세스를 훑으므로 드물게)
+WEB_SERVER_PORT = 8000
 
-    status = {
-        'main_server': False,
-        'web_server': True,  # 이 API가 응답하면 웹서버는 실행중
-        'main_server_port': 5050,
-        'web_server_port': 8000,
-        'processes': []
-    }
 
+def load_probe_targets():
+    """server/settings.json → (메인 서버 포트, 접속 확인할 호스트 목록)"""
     try:
-        # 메인 서버 포트 5050 확인 (여러 IP 시도)
-        ips_to_check = ['127.0.0.1', '172.30.101.232', 'localhost']
-        status['main_server'] = False
+        with open(os.path.join(SERVER_DIR, 'settings.json'), encoding='utf-8') as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        settings = {}
+    port = settings.get('server_port', 5050)
+    hosts = settings.get('health_probe_hosts') or ['127.0.0.1', settings.get('server_ip', '127.0.0.1')]
+    return port, [h for h in dict.fromkeys(hosts) if h and h != '0.0.0.0']
 
-        for ip in ips_to_check:
+
+def probe_port(host, port, timeout=1.0):
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def scan_processes():
+    """실행 중인 server.py / app.py 프로세스"""
+    try:
+        import psutil
+    except ImportError:
+        return []
+
+    found = []
+    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        try:
+            if proc.info['name'] in ('python.exe', 'python'):
+                cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
+                if 'server.py' in cmdline:
+                    found.append({'name': '메인 서버', 'pid': proc.info['pid'], 'file': 'server.py'})
+                elif 'app.py' in cmdline:
+                    found.append({'name': '웹 서버', 'pid': proc.info['pid'], 'file': 'app.py'})
+        except Exception:
+            continue
+    return found
+
+
+class HealthProber:
+    """
+    서버 상태 확인 스레드 (첫 요청 때 시작)
+    - 메인 서버: server_health.json 이 최근 것이면 그 내용으로 판단 (큐 적체, 마지막 커밋, 연결 수)
+                 없거나 오래됐으면 settings.json 의 health_probe_hosts 로 포트 접속 확인
+    - 상태가 바뀌면 /api/stream 구독자에게 server_status 이벤트로 알림
+    """
+
+    def __init__(self, health_path):
+        self.health_path = health_path
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.thread = None
+        self.status = None
+        self.processes = []
+        self.next_process_scan = 0.0
+
+    def ensure_started(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True, name='health-prober')
+                self.thread.start()
+
+    def get(self, wait=3.0):
+        """최근 확인 결과 (시작 직후에는 첫 확인이 끝날 때까지 최대 wait 초 대기)"""
+        self.ensure_started()
+        self.ready.wait(wait)
+        return self.status
+
+    def run(self):
+        while True:
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                result = sock.connect_ex((ip, 5050))
-                sock.close()
-                if result == 0:
+                status = self.check()
+            except Exception as e:
+                print(f"⚠️ 서버 상태 확인 실패: {e}", flush=True)
+            else:
+                previous, self.status = self.status, status
+                self.ready.set()
+                if previous is not None and self.summary(previous) != self.summary(status):
+                    event_hub.broadcast('server_status', status)
+            time.sleep(HEALTH_PROBE_SEC)
+
+    @staticmethod
+    def summary(status):
+        return status['main_server'], status['web_server'], [p['pid'] for p in status['processes']]
+
+    def read_health(self):
+        try:
+            with open(self.health_path, encoding='utf-8') as f:
+                health = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - health.get('written_at', 0) > HEALTH_MAX_AGE_SEC:
+            return None
+        return health
+
+    def check(self):
+        port, hosts = load_probe_targets()
+        status = {
+            'main_server': False,
+            'web_server': True,  # 이 API가 응답하면 웹서버는 실행중
+            'main_server_port': port,
+            'web_server_port': WEB_SERVER_PORT,
+            'health': self.read_health(),
+            'checked_at': time.time()
+        }
+        if status['health'] is not None:
+            status['main_server'] = True
+        else:
+            for ip in hosts:
+                if probe_port(ip, port):
                     status['main_server'] = True
                     status['main_server_ip'] = ip
                     break
-            except:
-                continue
-    except:
-        status['main_server'] = False
 
-    try:
-        # 실행중인 Python 프로세스 확인
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if proc.info['name'] == 'python.exe' or proc.info['name'] == 'python':
-                    cmdline = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                    if 'server.py' in cmdline:
-                        status['processes'].append({
-                            'name': '메인 서버',
-                            'pid': proc.info['pid'],
-                            'file': 'server.py'
-                        })
-                    elif 'app.py' in cmdline:
-                        status['processes'].append({
-                            'name': '웹 서버',
-                            'pid': proc.info['pid'],
-                            'file': 'app.py'
-                        })
-            except:
-                continue
-    except:
-        pass
+        # 메인 서버 상태가 바뀌었으면 프로세스 목록도 바로 다시 확인
+        changed = self.status is None or self.status['main_server'] != status['main_server']
+        if changed or time.time() >= self.next_process_scan:
+            self.processes = scan_processes()
+            self.next_process_scan = time.time() + PROCESS_SCAN_SEC
+        status['processes'] = self.processes
+        return status
 
+
+health_prober = HealthProber(HEALTH_PATH)
+
+
+@app.route('/api/server-status')
+def get_server_status():
+    """
+    메인 서버와 웹 서버 상태 (HealthProber 가 확인해 둔 결과 - 요청 때 확인하지 않음)
+    반환: {"main_server", "web_server", "main_server_port", "web_server_port", "processes",
+           "health": server.py 상태 파일 내용 또는 null, "checked_at"}
+    """
+    status = health_prober.get()
+    if status is None:
+        port, _ = load_probe_targets()
+        status = {'main_server': False, 'web_server': True, 'main_server_port': port,
+                  'web_server_port': WEB_SERVER_PORT, 'health': None, 'processes': [], 'checked_at': None}
     return jsonify(status)
 
 @app.route('/api/start-server', methods=['POST'])
@@ -3,18 +3,32 @@ import json
 import sqlite3
 import datetime
 import os
+import time
 
 # DB 경로 설정 (app.py와 동일한 경로)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, '..', 'server', 'client_status.db')
 
 
-def send_ini_command(client_ip, filename, content):
+def deliver_ini(client_ip, filename, content, timeout=5.0):
+    """
+    INI 명령 1건 전송 (네트워크만, DB 기록 없음) → (성공 여부, 응답/오류 메시지, 소요 ms)
+    timeout: 연결~응답까지 전체 제한 시간 (초) - 대상별 마감 시각
+    """
+    started = time.perf_counter()
+    deadline = started + timeout
+
+    def remaining():
+        return max(0.1, deadline - time.perf_counter())
+
+    def elapsed_ms():
+        return round((time.perf_counter() - started) * 1000, 1)
+
     try:
         print(f"INI 전송 시작: {client_ip} -> {filename}")
 
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(5.0)
+        sock.settimeout(remaining())
         sock.connect((client_ip, 5050))
 
         # INI 파일 정보 포함한 메시지
@@ -28,39 +42,97 @@ def send_ini_command(client_ip, filename, content):
 
         http_request = f"POST / HTTP/1.1\r\nContent-Length: {len(message)}\r\n\r\n{message}"
 
+        sock.settimeout(remaining())
         sock.send(http_request.encode())
         print("메시지 전송 완료, 응답 대기 중...")
 
+        sock.settimeout(remaining())
         response = sock.recv(1024).decode()
         sock.close()
 
         print(f"클라이언트 응답: {response}")
-
-        # DB 상태 업데이트
-        if "OK" in response:
-            update_ini_command_status(filename, "SUCCESS", "INI 파일 생성 완료")
-            return f"SUCCESS: {response}"
-        else:
-            update_ini_command_status(filename, "FAILED", response)
-            return f"ERROR: {response}"
+        return "OK" in response, response, elapsed_ms()
 
     except Exception as e:
         print(f"INI 전송 오류: {e}")
-        update_ini_command_status(filename, "FAILED", str(e))
-        return f"ERROR: {str(e)}"
+        return False, str(e), elapsed_ms()
+
+
+def send_ini_command(command_id, client_ip, filename, content, timeout=5.0):
+    """
+    INI 명령 1건 전송 + 상태 기록 → "SUCCESS: ..." / "ERROR: ..." (즉시 전송용)
+    command_id: ini_commands 에 기록할 때 받은 행 id (lastrowid)
+    """
+    ok, response, latency_ms = deliver_ini(client_ip, filename, content, timeout)
+
+    # DB 상태 업데이트
+    if ok:
+        update_ini_command_status(command_id, "SUCCESS", "INI 파일 생성 완료", latency_ms)
+        return f"SUCCESS: {response}"
+    else:
+        update_ini_command_status(command_id, "FAILED", response, latency_ms)
+        return f"ERROR: {response}"
+
+
+def publish_ini_events(cursor, events):
+    """📣 대시보드 실시간 스트림으로 INI 결과 알림 (커밋은 호출한 쪽에서)"""
+    try:
+        now_ts = time.time()
+        cursor.executemany(
+            "INSERT INTO events (ts, kind, data) VALUES (?, 'ini', ?)",
+            [(now_ts, json.dumps(event, ensure_ascii=False)) for event in events]
+        )
+    except sqlite3.OperationalError:
+        pass  # events 테이블이 없는 DB (서버 업그레이드 전)
+
+
+# 행 id(PRIMARY KEY) 기준 → 이력이 쌓여도 테이블 전체를 훑지 않음
+INI_STATUS_UPDATE_SQL = """
+UPDATE ini_commands
+SET execution_status=?, execution_timestamp=?, execution_result=?, latency_ms=?, next_retry_at=?
+WHERE id=?
+"""
+
+
+def record_ini_results(conn, results):
+    """
+    INI 전송 결과 여러 건을 한 트랜잭션으로 기록 (상태 UPDATE + ini 이벤트, 1회 커밋)
+    results: [{"id", "status", "result", "latency_ms", "retry_at",
+               "filename", "client_ip", "client_name", "attempts"}, ...]
+    """
+    if not results:
+        return 0
+    now = datetime.datetime.now()
+    cursor = conn.cursor()
+    cursor.executemany(INI_STATUS_UPDATE_SQL, [
+        (r["status"], now, r["result"], r.get("latency_ms"), r.get("retry_at"), r["id"])
+        for r in results
+    ])
+    publish_ini_events(cursor, [{k: v for k, v in r.items() if k != "id"} for r in results])
+    conn.commit()
+    return len(results)
 
 
-def update_ini_command_status(filename, status, result):
-    """DB에서 INI 명령 상태 업데이트"""
+def update_ini_command_status(command_id, status, result, latency_ms=None):
+    """DB에서 INI 명령 1건 상태 업데이트 (command_id: 행 id, latency_ms: 전송~응답 소요 시간)"""
     try:
         with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE ini_commands 
-                SET execution_status=?, execution_timestamp=?, execution_result=?
-                WHERE filename=?
-            ''', (status, datetime.datetime.now(), result, filename))
-            conn.commit()
-            print(f"DB 상태 업데이트 완료: {filename} -> {status}")
+            row = conn.execute(
+                "SELECT filename, client_ip, client_name, attempts FROM ini_commands WHERE id=?", (command_id,)
+            ).fetchone()
+            if row is None:
+                print(f"DB 업데이트 대상 없음: id={command_id}")
+                return
+            record_ini_results(conn, [{
+                "id": command_id,
+                "filename": row[0],
+                "status": status,
+                "result": result,
+                "latency_ms": latency_ms,
+                "client_ip": row[1],
+                "client_name": row[2],
+                "attempts": row[3]
+            }])
+            print(f"DB 상태 업데이트 완료: {row[0]} -> {status}")
     except Exception as e:
-        print(f"DB 업데이트 오류: {e}")
\ No newline at end of file
+        print(f"DB 업데이트 오류: {e}")
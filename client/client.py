@@ -8,9 +8,11 @@ import http.server, urllib.parse, json, ctypes
 import configparser
 import psutil
 import json
-import shutil  # 🔧 필요 시 import 확인
 import time
+import queue
+import signal
 from datetime import datetime
+import log_writer
 
 # 🔰 버전 정보
 VERSION = "v2.3.6-stealth"
@@ -38,39 +40,6 @@ def trim_message_cache(path, max_lines):
 	except Exception as e:
 		log(f"❌ 메시지 캐시 정리 실패: {e}")
 
-def manage_debug_log(config):
-    try:
-        log_path = config["client"]["log_file"]
-        max_size = config["client"].get("log_max_size_mb", 5) * 1024 * 1024
-        max_days = config["client"].get("log_max_age_days", 7)
-
-        if not os.path.exists(log_path):
-            return
-
-        # ✅ 크기 체크
-        if os.path.getsize(log_path) > max_size:
-            rotate_log(log_path)
-
-        # ✅ 날짜 체크
-        age_days = (time.time() - os.path.getmtime(log_path)) / (60 * 60 * 24)
-        if age_days > max_days:
-            os.remove(log_path)
-            log(f"🧹 오래된 로그 삭제됨 → {log_path}")
-
-    except Exception as e:
-        log(f"❌ 로그 정리 오류: {e}")
-
-def rotate_log(path):
-    try:
-        if os.path.exists(path + ".2"):
-            os.remove(path + ".2")
-        if os.path.exists(path + ".1"):
-            shutil.move(path + ".1", path + ".2")
-        shutil.move(path, path + ".1")
-        log(f"🔁 로그 회전 완료 → {path}.1")
-    except Exception as e:
-        log(f"❌ 로그 회전 실패: {e}")
-
 # 📦 설정 파일 로딩
 def load_config():
     path = os.path.join(BASE_DIR, "config.json")
@@ -89,17 +58,68 @@ CMD_RECV_PORT = config["server"]["recv_port"]
 LOCAL_HTTP_PORT = config["server"]["http_port"]
 
 LOG_FILE = config["client"]["log_file"]
+# 📝 로그 기록기 (파일 열어둔 채 백그라운드 기록, 크기/기간 회전)
+client_log = log_writer.get(
+    LOG_FILE,
+    level=config["client"].get("log_level", "DEBUG"),
+    rate_limits=config["client"].get("log_rate_limits", {"DEBUG": 20}),
+    max_bytes=int(config["client"].get("log_max_size_mb", 5) * 1024 * 1024),
+    max_age_days=config["client"].get("log_max_age_days", 7),
+    backups=config["client"].get("log_backups", 2),
+    fallback_path=os.path.join(BASE_DIR, "log_fail.txt")  # ✨ 백업 로그
+)
 MSG_FILE = config["client"]["msg_file"]
 INI_FILE = config["client"]["ini_file"]
 
 SENSITIVE_COMMANDS = config["sensitive_commands"]
 
+# 🔍 대상 프로세스 감시
+#   - process_iter 전체 스캔 1회 결과를 TTL 동안 재사용
+#   - 명령 1건 처리 중 여러 번 묻더라도 스캔은 한 번만 발생
+class ProcessWatcher:
+    def __init__(self, targets, aliases, ttl_sec=5):
+        self.targets = list(targets)
+        self.aliases = dict(aliases)
+        self.watch_names = set(self.targets) | set(self.aliases)
+        self.ttl_sec = ttl_sec
+        self.running = frozenset()
+        self.scanned_at = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        found = set()
+        for proc in psutil.process_iter(['name']):
+            name = proc.info['name']
+            if name in self.watch_names:
+                found.add(name)
+        self.running = frozenset(found)
+        self.scanned_at = time.monotonic()
+
+    def snapshot(self):
+        with self.lock:
+            if self.scanned_at is None or time.monotonic() - self.scanned_at >= self.ttl_sec:
+                self.refresh()
+            return self.running
+
+    def is_target_running(self):
+        running = self.snapshot()
+        return any(name in running for name in self.targets)
+
+    def running_target(self):
+        running = self.snapshot()
+        for name, alias in self.aliases.items():
+            if name in running:
+                return alias
+        return "NONE"
+
+process_watcher = ProcessWatcher(
+    config["targets"],
+    config["target_alias"],
+    ttl_sec=config["client"].get("process_scan_ttl_sec", 5)
+)
+
 def is_target_running():
-    targets = config["targets"]
-    for proc in psutil.process_iter(['name']):
-        if proc.info['name'] in targets:
-            return True
-    return False
+    return process_watcher.is_target_running()
 
 def save_version_file():
     try:
@@ -121,29 +141,15 @@ if ctypes.windll.kernel32.GetLastError() == 183:
 
 # 🎯 현재 실행 중인 대상 이름 반환
 def get_running_target():
-        aliases = config["target_alias"]
-        for proc in psutil.process_iter(['name']):
-            if proc.info['name'] in aliases:
-                return aliases[proc.info['name']]
-        return "NONE"
+        return process_watcher.running_target()
 
 # 🕒 현재 시각 포맷팅
 def now():
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-# 📝 로그 함수
-def log(msg):
-    text = f"[{now()}] {msg}"
-    print(text)  # 🔍 콘솔 출력도 유지해둘 수 있어
-
-    try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(text + "\n")
-    except Exception as e:
-        # ✨ 백업 로그에 남기기
-        backup_log = os.path.join(BASE_DIR, "log_fail.txt")
-        with open(backup_log, "a", encoding="utf-8") as f:
-            f.write(f"[⚠️ 로그 저장 실패] {e}\n{text}\n")
+# 📝 로그 함수 (큐에 넣고 바로 반환 → 콘솔/파일 기록은 client_log 스레드)
+def log(msg, level="INFO"):
+    client_log.write(msg, level)
 
 # 🧾 명령 INI 저장 함수
 def save_command_to_ini(command_msg):
@@ -181,7 +187,321 @@ def clear_ini_after_sensitive(msg):
 		except Exception as e:
 			log(f"❌ INI 클리어 실패: {e}")
 
-# 📤 서버 전송 함수
+# 📡 서버 지속 연결 (NDJSON 프레이밍)
+#   - 첫 연결 시 "DIA/1 NDJSON" 인사 → "OK NDJSON" 이면 연결을 유지하며 보고를 한 줄씩 전송
+#   - 구버전 서버(인사 응답 없음)면 기존 1회성 전송으로 폴백, 일정 시간 후 재협상
+FRAMED_HELLO = b"DIA/1 NDJSON\n"
+FRAMED_OK    = b"OK NDJSON"
+LEGACY_RETRY_SEC = 600
+
+class ServerLink:
+    def __init__(self, host, port, timeout=3, framing="auto"):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.framing = framing        # "auto" | "ndjson" | "legacy"
+        self.sock = None
+        self.reader = None
+        self.legacy_until = 0         # 이 시각까지는 1회성 전송 사용
+        self.lock = threading.Lock()
+
+    def close(self):
+        for obj in (self.reader, self.sock):
+            try:
+                if obj:
+                    obj.close()
+            except Exception:
+                pass
+        self.sock = None
+        self.reader = None
+
+    def _use_legacy(self):
+        if self.framing == "legacy":
+            return True
+        return self.framing == "auto" and time.time() < self.legacy_until
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        reader = sock.makefile("rb")
+        try:
+            sock.sendall(FRAMED_HELLO)
+            reply = reader.readline(64)
+        except Exception:
+            reader.close()
+            sock.close()
+            raise
+        if reply.strip() != FRAMED_OK:
+            reader.close()
+            sock.close()
+            if self.framing == "ndjson":
+                raise ConnectionError("서버가 NDJSON 프레이밍을 지원하지 않음")
+            self.legacy_until = time.time() + LEGACY_RETRY_SEC
+            log("ℹ️ 구버전 서버 감지 → 1회성 전송 모드로 전환")
+            return False
+        self.sock = sock
+        self.reader = reader
+        return True
+
+    def _send_legacy(self, payload):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.settimeout(self.timeout)
+        try:
+            s.connect((self.host, self.port))
+            s.sendall(json.dumps(payload).encode("utf-8"))
+        finally:
+            s.close()
+        return True
+
+    def send_many(self, payloads):
+        """보고 여러 건을 한 번에 흘려보내고(파이프라이닝) 건별 ACK 여부 리스트 반환
+        연결 오류 시 1회 재연결 후 예외"""
+        with self.lock:
+            for attempt in range(2):
+                if self._use_legacy():
+                    return [self._send_legacy(p) for p in payloads]
+                try:
+                    if self.sock is None and not self._connect():
+                        continue  # 구버전 서버 → 레거시로 재시도
+                    self.sock.sendall(b"".join(
+                        json.dumps(p).encode("utf-8") + b"\n" for p in payloads
+                    ))
+                    acks = []
+                    for _ in payloads:
+                        ack = self.reader.readline(64)
+                        if not ack:
+                            raise ConnectionError("서버가 연결을 종료함")
+                        acks.append(ack.startswith(b"ACK"))
+                    return acks
+                except OSError:
+                    self.close()
+                    if attempt == 1:
+                        raise
+            return [False] * len(payloads)
+
+    def send(self, payload):
+        """보고 1건 전송 → 서버 ACK 여부 반환"""
+        return self.send_many([payload])[0]
+
+server_link = ServerLink(SERVER_IP, SEND_PORT, framing=config["server"].get("framing", "auto"))
+
+# 💾 미전송 보고 스풀 (서버 장애 대비)
+#   - 한 줄에 JSON 1건씩 덧붙이기만 하는 파일 (전송 스레드만 접근)
+#   - 크기/보관 기간 초과분은 오래된 것부터 버림
+class ReportSpool:
+    def __init__(self, path, max_bytes, max_age_sec):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+
+    def has_data(self):
+        try:
+            return os.path.getsize(self.path) > 0
+        except OSError:
+            return False
+
+    def load(self):
+        """보관 기간이 지나지 않은 보고만 읽어서 반환"""
+        cutoff = time.time() - self.max_age_sec
+        entries = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        payload = json.loads(line)
+                    except ValueError:
+                        continue  # 쓰다 끊긴 줄
+                    if payload.get("ts", 0) >= cutoff:
+                        entries.append(payload)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def rewrite(self, entries):
+        """남은 보고로 파일을 다시 씀 (크기 제한 적용, 빈 목록이면 비움)"""
+        lines = [json.dumps(p, ensure_ascii=False) + "\n" for p in entries]
+        total = sum(len(l.encode("utf-8")) for l in lines)
+        while lines and total > self.max_bytes:
+            total -= len(lines.pop(0).encode("utf-8"))
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp, self.path)
+
+    def append(self, payloads):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for p in payloads:
+                    f.write(json.dumps(p, ensure_ascii=False) + "\n")
+            if os.path.getsize(self.path) > self.max_bytes:
+                self.rewrite(self.load())
+        except Exception as e:
+            log(f"❌ 스풀 저장 실패: {e}")
+
+# 📮 백그라운드 전송
+#   - HTTP 핸들러는 큐에 넣기만 하고 즉시 응답
+#   - 큐가 가득 차면 가장 오래된 보고를 버림 (최신 다이아 값 우선)
+#   - 서버 장애 시 보고를 스풀 파일에 쌓아두고, 연결이 돌아오면 묶음으로 재전송
+#   - 큐/통계는 이 객체에 있고 전송 루프는 new_thread() 로 만든 스레드에서 실행
+#     → 스레드가 죽어도 Supervisor 가 새 스레드로 재시작 (쌓인 보고 유지)
+#   - 종료 시 큐에 남은 보고는 스풀로 옮김 (다음 실행 때 재전송)
+class ReportSender:
+    def __init__(self, link, spool, max_queue=1000, batch_max=50, replay_batch=200):
+        self.link = link
+        self.spool = spool
+        self.batch_max = batch_max
+        self.replay_batch = replay_batch
+        self.outbox = queue.Queue(maxsize=max_queue)
+        self.stats = {"queued": 0, "sent": 0, "rejected": 0, "dropped": 0, "failures": 0,
+                      "spooled": 0, "replayed": 0}
+        self.stats_lock = threading.Lock()
+        self.thread = None
+
+    def new_thread(self):
+        """Supervisor 용 - 전송 루프를 실행하는 새 스레드"""
+        self.thread = ReportSenderThread(self)
+        return self.thread
+
+    def count(self, key, n=1):
+        with self.stats_lock:
+            self.stats[key] += n
+
+    def snapshot(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats["backlog"] = self.outbox.qsize()
+        return stats
+
+    def enqueue(self, payload):
+        while True:
+            try:
+                self.outbox.put_nowait(payload)
+                self.count("queued")
+                return
+            except queue.Full:
+                try:
+                    self.outbox.get_nowait()
+                    self.count("dropped")
+                except queue.Empty:
+                    pass
+
+    def _drain(self, limit=None):
+        items = []
+        while limit is None or len(items) < limit:
+            try:
+                items.append(self.outbox.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _spool_offline(self, batch):
+        """전송 실패분 + 큐에 남은 보고를 모두 스풀로 이동"""
+        pending = batch + self._drain()
+        self.spool.append(pending)
+        self.count("spooled", len(pending))
+
+    def _replay_spool(self):
+        """스풀된 보고를 오래된 순으로 묶음 재전송 (실패 시 남은 것만 다시 저장 후 예외)"""
+        entries = self.spool.load()
+        sent = 0
+        try:
+            while sent < len(entries):
+                chunk = entries[sent:sent + self.replay_batch]
+                self.link.send_many(chunk)  # ERR 응답분은 재시도해도 같은 결과라 버림
+                sent += len(chunk)
+                self.count("replayed", len(chunk))
+        finally:
+            self.spool.rewrite(entries[sent:])
+        if sent:
+            log(f"📼 스풀 재전송 완료 → {sent}건")
+
+    def _report_acks(self, batch, acks):
+        for payload, ok in zip(batch, acks):
+            if ok:
+                self.count("sent")
+                msg = payload.get("msg", "")
+                msg_display = msg if len(msg) < 40 else msg[:37] + "..."
+                log(f"✅ 서버 전송 완료 → {self.link.host}:{self.link.port} | 이름: {payload['name']} | 게임: {payload['game']} | 서버: {payload['game_server']} | 다이아: {payload['dia']} | 메시지: {msg_display}")
+            else:
+                self.count("rejected")
+                log(f"⚠️ 서버가 보고를 거부함 (ERR) → 이름: {payload.get('name')}")
+
+    def run(self):
+        """전송 루프 (종료 신호가 오면 보내던 묶음까지 처리하고 반환)"""
+        backoff = 1
+        while not shutdown_event.is_set():
+            try:
+                if self.spool.has_data():
+                    self._replay_spool()
+            except Exception as e:
+                self.count("failures")
+                log(f"❌ 스풀 재전송 실패: {e} → {backoff}초 후 재시도")
+                self._spool_offline([])
+                shutdown_event.wait(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            try:
+                first = self.outbox.get(timeout=1.0)
+            except queue.Empty:
+                continue  # 종료 신호 확인
+            batch = [first] + self._drain(self.batch_max - 1)
+            try:
+                acks = self.link.send_many(batch)
+            except Exception as e:
+                self.count("failures")
+                log(f"❌ 서버 전송 실패: {e} → 스풀 저장 후 {backoff}초 후 재시도")
+                self._spool_offline(batch)
+                shutdown_event.wait(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+
+            backoff = 1
+            self._report_acks(batch, acks)
+
+    def flush_to_spool(self, timeout=5.0):
+        """종료 시 호출 - 전송 스레드가 끝나길 기다린 뒤 큐에 남은 보고를 스풀에 저장"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        pending = self._drain()
+        if pending:
+            self.spool.append(pending)
+            self.count("spooled", len(pending))
+            log(f"💾 미전송 보고 {len(pending)}건 → 스풀 저장 (다음 실행 시 재전송)")
+
+class ReportSenderThread(threading.Thread):
+    def __init__(self, sender):
+        super().__init__(daemon=True, name="ReportSender")
+        self.sender = sender
+
+    def stop(self):
+        pass  # 전송 루프가 shutdown_event 를 보고 스스로 종료
+
+    def run(self):
+        self.sender.run()
+
+report_sender = ReportSender(
+    server_link,
+    ReportSpool(
+        os.path.join(BASE_DIR, config["client"].get("spool_file", "report_spool.ndjson")),
+        max_bytes=config["client"].get("spool_max_mb", 5) * 1024 * 1024,
+        max_age_sec=config["client"].get("spool_max_age_hours", 72) * 3600
+    ),
+    max_queue=config["client"].get("send_queue_max", 1000),
+    batch_max=config["client"].get("send_batch_max", 50),
+    replay_batch=config["client"].get("spool_replay_batch", 200)
+)
+
+# 🕒 보고 시각 (같은 클라이언트 안에서 항상 증가 → 서버 중복 제거 키로 사용)
+_last_report_ts = 0.0
+_report_ts_lock = threading.Lock()
+
+def next_report_ts():
+    global _last_report_ts
+    with _report_ts_lock:
+        _last_report_ts = max(round(time.time(), 3), round(_last_report_ts + 0.001, 3))
+        return _last_report_ts
+
+# 📤 서버 전송 함수 (큐에 넣고 즉시 반환)
 def send_to_server(server_ip, report_ip, name, diamond, mode="send", game="unknown", msg="", game_server=""):
     payload = {
         "name": name,
@@ -190,25 +510,29 @@ def send_to_server(server_ip, report_ip, name, diamond, mode="send", game="unkno
         "mode": mode,
         "game": game,
         "msg": msg,
-        "game_server": game_server  # 서버가 이 필드로 받는다면 정확하게 맞춰야 해
+        "game_server": game_server,  # 서버가 이 필드로 받는다면 정확하게 맞춰야 해
+        "ts": next_report_ts()  # 보고 시각 (서버 중복 제거 키: name + ts)
     }
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(3)
-        s.connect((server_ip, SEND_PORT))
-        s.sendall(json.dumps(payload).encode("utf-8"))
-        s.close()
-        msg_display = msg if len(msg) < 40 else msg[:37] + "..."
-        log(f"✅ 서버 전송 완료 → {server_ip}:{SEND_PORT} | 이름: {name} | 게임: {game} | 서버: {game_server} | 다이아: {diamond} | 메시지: {msg_display}")
-    except Exception as e:
-        log(f"❌ 서버 전송 실패: {e}")
+    report_sender.enqueue(payload)
 
 # 🛰️ 명령 수신 스레드
 class CommandReceiver(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True, name="CommandReceiver")
+        self.sock = None
+
+    def stop(self):
+        try:
+            if self.sock:
+                self.sock.close()
+        except Exception:
+            pass
+
     def run(self):
         try:
             log(f"[RECV] 서버 명령 대기 중... (port {CMD_RECV_PORT})")
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock = s
             s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             s.bind(('0.0.0.0', CMD_RECV_PORT))
             s.listen(1)
@@ -237,7 +561,8 @@ class CommandReceiver(threading.Thread):
         except Exception as e:
             log(f"❌ CommandReceiver 예외: {e}")
             print(f"❌ CommandReceiver 예외: {e}")
-
+        finally:
+            self.stop()  # 재시작 시 포트를 다시 바인딩할 수 있도록 닫아둠
 
 def now():
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -255,6 +580,17 @@ def save_message_with_time(msg):
 class SendHttpHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
         parsed = urllib.parse.urlparse(self.path)
+        if parsed.path == "/stats":
+            # 📊 전송 큐 상태 (queued/sent/dropped 등) 확인용
+            body = json.dumps(report_sender.snapshot()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
         if parsed.path == "/send":
             params = urllib.parse.parse_qs(parsed.query)
 
@@ -268,8 +604,8 @@ class SendHttpHandler(http.server.BaseHTTPRequestHandler):
             msg         = params.get("msg",          [""])[0]
 
             # ✅ 바로 여기! 값 보정 전에 인코딩 확인 로그 삽입
-            log(f"[DEBUG] → game_server={game_server}")
-            log(f"[DEBUG] → bytes={game_server.encode('utf-8')}")
+            log(f"[DEBUG] → game_server={game_server}", "DEBUG")
+            log(f"[DEBUG] → bytes={game_server.encode('utf-8')}", "DEBUG")
 
             # 🔹 기본값 처리
             name        = name or "unknown"
@@ -280,7 +616,7 @@ class SendHttpHandler(http.server.BaseHTTPRequestHandler):
             # ✅ ip만 있으면 수신 처리
             if ip:
                 log(f"[HTTP] 전송 요청 수신: {dia}, {mode}, {name}, {ip}")
-                log(f"[DEBUG] → game={game} | server={game_server} | msg={msg}")
+                log(f"[DEBUG] → game={game} | server={game_server} | msg={msg}", "DEBUG")
 
                 try:
                     send_to_server(
@@ -319,36 +655,111 @@ class SendHttpHandler(http.server.BaseHTTPRequestHandler):
 
 # 🌐 HTTP 수신 스레드
 class HttpReceiver(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True, name="HttpReceiver")
+        self.server = None
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+
     def run(self):
         try:
             log(f"[HTTP] AHK 전송 요청 대기 중... (port {LOCAL_HTTP_PORT})")
-            server = http.server.HTTPServer(("localhost", LOCAL_HTTP_PORT), SendHttpHandler)
-            server.serve_forever()
+            self.server = http.server.HTTPServer(("localhost", LOCAL_HTTP_PORT), SendHttpHandler)
+            self.server.serve_forever()
         except Exception as e:
             log(f"❌ HttpReceiver 예외: {e}")
             print(f"❌ HttpReceiver 예외: {e}")
+        finally:
+            if self.server:
+                self.server.server_close()
+
+# 🛑 종료 신호 (SIGINT / SIGTERM / 콘솔 닫기 SIGBREAK)
+shutdown_event = threading.Event()
+
+def install_signal_handlers():
+    def _on_signal(signum, frame):
+        log(f"🔻 종료 신호 수신 ({signum})")
+        shutdown_event.set()
+
+    for sig_name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, sig_name):
+            try:
+                signal.signal(getattr(signal, sig_name), _on_signal)
+            except (ValueError, OSError):
+                pass  # 메인 스레드가 아니거나 지원하지 않는 신호
+
+# 🩺 전송 / 수신 스레드 감시자
+#   - 종료 신호가 올 때까지 블로킹 대기 (바쁜 대기 없음)
+#   - 죽은 스레드는 지수 백오프로 재시작
+#   - 디버그 로그 회전은 client_log 가 기록할 때 직접 처리
+class Supervisor:
+    def __init__(self, factories, tick_sec=5):
+        self.factories = factories      # {이름: 스레드를 만드는 클래스/함수}
+        self.tick_sec = tick_sec
+        self.threads = {}
+        self.restart_at = {}            # {이름: 다음 재시작 허용 시각}
+        self.restart_delay = {}         # {이름: 현재 백오프(초)}
+
+    def spawn(self, name):
+        t = self.factories[name]()
+        t.start()
+        self.threads[name] = t
+        self.restart_at[name] = 0
+
+    def check_threads(self):
+        now_ts = time.time()
+        for name, t in list(self.threads.items()):
+            if t.is_alive():
+                continue
+            if now_ts < self.restart_at[name]:
+                continue
+            delay = self.restart_delay.get(name, 1)
+            log(f"🩺 {name} 중단 감지 → 재시작")
+            self.spawn(name)
+            self.restart_at[name] = now_ts + delay
+            self.restart_delay[name] = min(delay * 2, 60)
+
+    def run(self):
+        for name in self.factories:
+            self.spawn(name)
+
+        while not shutdown_event.wait(self.tick_sec):
+            self.check_threads()
+
+            # 오래 살아있는 스레드는 백오프 초기화
+            for name, t in self.threads.items():
+                if t.is_alive() and time.time() > self.restart_at[name] + 60:
+                    self.restart_delay[name] = 1
+
+        for t in self.threads.values():
+            try:
+                t.stop()
+            except Exception as e:
+                log(f"❌ 스레드 정지 오류: {e}")
 
 # 🏁 메인 실행
 def main():
-    manage_debug_log(config)  # ✅ 로그 상태 체크 및 회전 처리
     save_version_file()  # 🧾 실행 시 버전 텍스트 저장
     log(f"🚀 client.exe 시작됨 ({VERSION})")
+    install_signal_handlers()
+
     try:
-        t1 = CommandReceiver()
-        t2 = HttpReceiver()
-        t1.daemon = True
-        t2.daemon = True
-        t1.start()
-        t2.start()
+        supervisor = Supervisor(
+            {"ReportSender": report_sender.new_thread,  # 📮 서버 전송 스레드 (죽으면 재시작)
+             "CommandReceiver": CommandReceiver, "HttpReceiver": HttpReceiver},
+            tick_sec=config["client"].get("supervisor_tick_sec", 5)
+        )
+        supervisor.run()
     except Exception as e:
         log(f"❌ 스레드 실행 오류: {e}")
         print(f"❌ 스레드 실행 오류: {e}")
 
-    try:
-        while True:
-            pass
-    except KeyboardInterrupt:
-        log("🔻 종료 요청 수신")
+    log("🔻 종료 요청 수신")
+    shutdown_event.set()  # 예외로 빠져나온 경우에도 전송 루프 종료
+    report_sender.flush_to_spool(timeout=server_link.timeout * 2 + 1)  # 큐에 남은 보고 → 스풀
+    client_log.close()  # 남은 로그 기록 후 종료
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
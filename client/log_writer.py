@@ -0,0 +1,227 @@
+# ========================================
+# 📝 비동기 로그 기록기
+# 📦 파일명: log_writer.py  (server/ 와 client/ 에 같은 파일)
+#   - write() 는 큐에 넣고 바로 반환 → 파일 쓰기/콘솔 출력은 백그라운드 스레드 1개
+#   - 파일은 열어둔 채로 모아서 기록 (줄마다 열고 닫지 않음)
+#   - 크기 / 기간 기준 회전 (로그 → 로그.1 → 로그.2 ...)
+#   - 레벨 필터 + 레벨별 초당 기록 상한 (넘친 줄은 건수만 요약해서 기록)
+# ========================================
+
+import os
+import sys
+import time
+import queue
+import atexit
+import datetime
+import threading
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40, "OFF": 100}
+
+
+class LogWriter:
+    """
+    파일 1개 전용 기록기
+    - level       : 이보다 낮은 레벨은 버림 ("OFF" = 모두 끔)
+    - rate_limits : {"DEBUG": 20} → DEBUG 는 초당 20줄까지만 기록
+    - max_bytes / max_age_days : 넘으면 회전 (0 = 사용 안 함), backups 개까지 보관
+    - fallback_path : 로그 파일에 못 쓸 때 대신 남길 파일
+    """
+
+    def __init__(self, path, level="DEBUG", rate_limits=None, max_bytes=5 * 1024 * 1024,
+                 max_age_days=7, backups=2, console=True, fallback_path=None,
+                 queue_max=10000, batch_max=1000):
+        self.path = path
+        self.queue = queue.Queue(maxsize=queue_max)
+        self.batch_max = batch_max
+        self.lock = threading.Lock()
+        self.thread = None
+        self.file = None
+        self.born = None         # 현재 파일 생성 시각 (기간 회전 기준)
+        self.window = {}         # {level: [초, 그 초에 받은 줄 수]}
+        self.dropped = {}        # {level 또는 "QUEUE": 버린 줄 수} → 다음 기록 때 요약
+        self.rate_limits = {}
+        self.fallback_path = None
+        self.stamp_cache = (None, "")   # (초, 시각 문자열) - 기록 스레드 전용
+        self.configure(level, rate_limits, max_bytes, max_age_days, backups, console, fallback_path)
+
+    def configure(self, level=None, rate_limits=None, max_bytes=None, max_age_days=None,
+                  backups=None, console=None, fallback_path=None):
+        """설정 변경 (None 인 항목은 그대로)"""
+        if level is not None:
+            self.min_level = LEVELS.get(str(level).upper(), LEVELS["DEBUG"])
+        if rate_limits is not None:
+            self.rate_limits = {k.upper(): v for k, v in rate_limits.items()}
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if max_age_days is not None:
+            self.max_age_sec = max_age_days * 86400
+        if backups is not None:
+            self.backups = max(1, backups)
+        if console is not None:
+            self.console = console
+        if fallback_path is not None:
+            self.fallback_path = fallback_path
+
+    def enabled(self, level):
+        return LEVELS.get(level, LEVELS["INFO"]) >= self.min_level
+
+    def write(self, msg, level="INFO"):
+        """로그 1줄 등록 → 기록 대상이면 True (호출한 스레드는 파일 I/O 를 기다리지 않음)"""
+        if not self.enabled(level):
+            return False
+
+        now_ts = time.time()
+        limit = self.rate_limits.get(level)
+        if limit is not None:
+            sec = int(now_ts)
+            with self.lock:
+                w = self.window.get(level)
+                if w is None or w[0] != sec:
+                    w = self.window[level] = [sec, 0]
+                w[1] += 1
+                if w[1] > limit:
+                    self.dropped[level] = self.dropped.get(level, 0) + 1
+                    return False
+
+        if self.thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait((now_ts, msg))
+        except queue.Full:
+            with self.lock:
+                self.dropped["QUEUE"] = self.dropped.get("QUEUE", 0) + 1  # 디스크가 못 따라감 → 수신 처리를 막지 않음
+            return False
+        return True
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True, name="log-writer")
+                self.thread.start()
+                atexit.register(self.close)
+
+    def close(self, timeout=2.0):
+        """남은 로그를 모두 기록하고 종료 (프로그램 종료 시 자동 호출)"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+    # ────────── 백그라운드 스레드 ──────────
+
+    def run(self):
+        stop = False
+        while not stop:
+            try:
+                items = [self.queue.get(timeout=1.0)]
+            except queue.Empty:
+                items = []
+            while len(items) < self.batch_max:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in items:
+                stop = True
+                items = [item for item in items if item is not None]
+
+            lines = [f"[{self.stamp(ts)}] {msg}" for ts, msg in items]  # 같은 초는 한 번만 포맷
+            summary = self.take_dropped()
+            if summary:
+                lines.append(f"[{self.stamp(time.time())}] ⏭️ 로그 생략 → {summary}")
+            if lines:
+                self.emit(lines)
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def stamp(self, ts):
+        sec = int(ts)
+        if self.stamp_cache[0] != sec:
+            self.stamp_cache = (sec, datetime.datetime.fromtimestamp(sec).strftime("%Y-%m-%d %H:%M:%S"))
+        return self.stamp_cache[1]
+
+    def take_dropped(self):
+        with self.lock:
+            if not self.dropped:
+                return None
+            dropped, self.dropped = self.dropped, {}
+        return ", ".join(f"{k} {n}줄" + (" (큐 가득 참)" if k == "QUEUE" else " (초당 상한)")
+                         for k, n in dropped.items())
+
+    def emit(self, lines):
+        text = "\n".join(lines) + "\n"
+        if self.console and sys.stdout is not None:  # 콘솔 없는 exe 는 stdout 이 None
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            except (OSError, ValueError, UnicodeError):
+                pass
+
+        try:
+            if self.file is None:
+                self.open()
+            self.file.write(text)
+            self.file.flush()
+            if self.should_rotate():
+                self.rotate()
+        except OSError as e:
+            self.close_file()
+            if self.fallback_path:
+                try:
+                    with open(self.fallback_path, "a", encoding="utf-8") as f:
+                        f.write(f"[⚠️ 로그 저장 실패] {e}\n{text}")
+                except OSError:
+                    pass  # 로그 파일 접근 문제 있을 시 무시
+
+    def open(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+        st = os.fstat(self.file.fileno())
+        if st.st_size == 0:
+            self.born = time.time()
+        else:
+            # 생성 시각을 알 수 없는 OS 는 마지막 수정 시각 기준
+            self.born = getattr(st, "st_birthtime", st.st_ctime if os.name == "nt" else st.st_mtime)
+
+    def close_file(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+
+    def should_rotate(self):
+        if self.max_bytes and self.file.tell() >= self.max_bytes:
+            return True
+        return bool(self.max_age_sec) and time.time() - self.born >= self.max_age_sec
+
+    def rotate(self):
+        """로그 → 로그.1, 로그.1 → 로그.2 ... (backups 개 초과분 삭제)"""
+        self.close_file()
+        for n in range(self.backups, 0, -1):
+            src = self.path if n == 1 else f"{self.path}.{n - 1}"
+            dst = f"{self.path}.{n}"
+            if os.path.exists(src):
+                os.replace(src, dst)
+        self.open()
+        self.file.write(f"[{self.stamp(time.time())}] 🔁 로그 회전 완료 → {self.path}.1\n")
+
+
+# 경로별 기록기 (같은 파일에 여러 기록기가 생기지 않도록)
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get(path, **options):
+    """path 의 기록기 반환 (처음이면 options 로 생성, 이후 설정 변경은 configure)"""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = LogWriter(path, **options)
+        return writer
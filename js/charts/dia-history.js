@@ -95,8 +95,8 @@ function renderTotalTrendChart(dayCount, win = window) {
 
     if (!win.chartStore) win.chartStore = {};
 
-    // fetch 직전에 URL 확인
-    const totalUrl = getApiUrl(`/api/dia-history?days=${dayCount}`);
+    // fetch 직전에 URL 확인 (서버에서 날짜별 합계만 집계해서 받음)
+    const totalUrl = getApiUrl(`/api/dia-agg/total?days=${dayCount}`);
     console.log("▶ [TOTAL] About to fetch URL:", totalUrl);
 
     fetch(totalUrl)
@@ -114,9 +114,9 @@ function renderTotalTrendChart(dayCount, win = window) {
                 win.chartStore.totalChart.destroy();
             }
 
-            // 날짜별 TOTAL 데이터 추출
-            const dates = Object.keys(data).sort();
-            const totals = dates.map(date => data[date]["TOTAL"] || 0);
+            // 날짜별 TOTAL 데이터 (열 단위 배열)
+            const dates = data.dates;
+            const totals = data.total;
 
             const ctx = canvas.getContext('2d');
             win.chartStore.totalChart = new Chart(ctx, {
@@ -166,8 +166,8 @@ function renderServerTrendChart(dayCount, win = window) {
 
     if (!win.chartStore) win.chartStore = {};
 
-    // fetch 직전에 URL 확인
-    const serverUrl = getApiUrl(`/api/dia-history?days=${dayCount}`);
+    // fetch 직전에 URL 확인 (이름 접두어별 합계를 서버에서 집계)
+    const serverUrl = getApiUrl(`/api/dia-agg/prefix?days=${dayCount}`);
     console.log("▶ [SERVER] About to fetch URL:", serverUrl);
 
     fetch(serverUrl)
@@ -185,31 +185,14 @@ function renderServerTrendChart(dayCount, win = window) {
                 win.chartStore.serverChart.destroy();
             }
 
-            // 서버별 데이터 집계
-            const dates = Object.keys(data).sort();
-            const serverTotals = {};
-
-            dates.forEach(date => {
-                const dayData = data[date];
-                Object.keys(dayData).forEach(clientName => {
-                    if (!["TOTAL", "SERVER_SUM", "COUNT_BY_SERVER"].includes(clientName)) {
-                        const server = clientName.split('-')[0];
-                        if (!serverTotals[server]) {
-                            serverTotals[server] = {};
-                        }
-                        if (!serverTotals[server][date]) {
-                            serverTotals[server][date] = 0;
-                        }
-                        serverTotals[server][date] += dayData[clientName].today || 0;
-                    }
-                });
-            });
+            // 서버별 합계 (keys[i] 의 날짜별 값 = values[i])
+            const dates = data.dates;
 
             // Chart.js 데이터셋 생성
             const colors = ['#ff6384', '#36a2eb', '#cc65fe', '#ffce56', '#4bc0c0'];
-            const datasets = Object.keys(serverTotals).map((server, index) => ({
+            const datasets = data.keys.map((server, index) => ({
                 label: server,
-                data: dates.map(date => serverTotals[server][date] || 0),
+                data: data.values[index],
                 borderColor: colors[index % colors.length],
                 backgroundColor: colors[index % colors.length] + '20',
                 borderWidth: 2,
@@ -12,16 +12,52 @@ function getApiUrl(endpoint) {
     return endpoint;
 }
 
+// 🔢 /api/clients 변경분 조회 상태 (데이터 버전 + 마지막으로 받은 전체 목록)
+let clientsRev = 0;
+let clientsCache = null;
+
+// 🔀 받은 클라이언트 행을 기존 목록에 병합 (full 이면 목록 교체)
+function mergeClients(rows, full, rev) {
+    const merged = new Map();
+    if (!full && clientsCache) {
+        clientsCache.forEach(c => merged.set(c.name, c));
+    }
+    rows.forEach(c => merged.set(c.name, c));
+
+    // 서버 전체 응답과 같은 순서 (최근 보고 순)
+    clientsCache = Array.from(merged.values())
+        .sort((a, b) => (b.last_report || '').localeCompare(a.last_report || ''));
+    clientsRev = Math.max(clientsRev, rev ?? 0);
+    return clientsCache;
+}
+
+// 📡 바뀐 클라이언트만 받아서 기존 목록에 병합 (변화 없으면 304 → 캐시 그대로)
+async function loadClientsData() {
+    const res = await fetch(getApiUrl(`/api/clients?since=${clientsRev}`));
+    if (res.status === 304 && clientsCache) {
+        return clientsCache;
+    }
+
+    const body = await res.json();
+    if (body.full) {
+        clientsRev = 0;  // DB 초기화 등으로 버전이 되돌아간 경우 포함
+    }
+    return mergeClients(body.clients, body.full, body.rev);
+}
+
 // 📡 클라이언트 데이터 가져오기
-async function fetchClients() {
+//    options.useCache: 스트림으로 이미 병합된 목록을 그대로 다시 그림 (요청 없음)
+async function fetchClients(options = {}) {
     const threshold = getThresholdMs();
     const now = Date.now();
+    // 💓 서버가 기록한 status(stale/alive) 우선, 마지막 보고가 오래됐으면 빨간색
+    const barColorOf = (c) =>
+        c.status === 'stale' || now - new Date(c.last_report).getTime() >= threshold ? "#dc3545" : "#28a745";
     const clientOrder = getClientOrder();
 
     try {
-        // 1) 데이터 가져오기
-        const res = await fetch(getApiUrl("/api/clients"));
-        const data = await res.json();
+        // 1) 데이터 가져오기 (변경분만)
+        const data = options.useCache && clientsCache ? clientsCache : await loadClientsData();
 
         updateServerSummary(data);
 
@@ -76,6 +112,7 @@ async function fetchClients() {
 
                     console.log('✅ 카드 HTML 업데이트:', c.name, cardHTML.includes('checkbox'));
                     existing.innerHTML = cardHTML;
+                    existing.style.borderLeftColor = barColorOf(c);
                 }
                 return;
             }
@@ -86,11 +123,9 @@ async function fetchClients() {
             card.dataset.name = name;
 
             if (c) {
-                const age = now - new Date(c.last_report).getTime();
-                const barColor = age < threshold ? "#28a745" : "#dc3545";
                 card.dataset.server = c.server;
                 card.dataset.dia = c.dia;
-                card.style.borderLeftColor = barColor;
+                card.style.borderLeftColor = barColorOf(c);
 
                 const newCardHTML = getCondensed()
                     ? `
@@ -282,6 +317,19 @@ async function fetchClients() {
     }
 }
 
+// 서버 상태 표시 (checkServerStatus 응답 / 스트림 server_status 이벤트 공용)
+function applyServerStatus(status) {
+    const mainServerDot = document.querySelector('#mainServerStatus span');
+    const webServerDot = document.querySelector('#webServerStatus span');
+
+    if (mainServerDot) {
+        mainServerDot.style.background = status.main_server ? '#28a745' : '#dc3545';
+    }
+    if (webServerDot) {
+        webServerDot.style.background = status.web_server ? '#28a745' : '#dc3545';
+    }
+}
+
 // 서버 상태 확인 함수
 async function checkServerStatus() {
     try {
@@ -289,15 +337,7 @@ async function checkServerStatus() {
         const status = await response.json();
 
         // 메인 서버 상태 업데이트
-        const mainServerDot = document.querySelector('#mainServerStatus span');
-        const webServerDot = document.querySelector('#webServerStatus span');
-
-        if (mainServerDot) {
-            mainServerDot.style.background = status.main_server ? '#28a745' : '#dc3545';
-        }
-        if (webServerDot) {
-            webServerDot.style.background = status.web_server ? '#28a745' : '#dc3545';
-        }
+        applyServerStatus(status);
 
         return status;
     } catch (error) {
@@ -394,15 +434,31 @@ async function sendIniCommand() {
         if (result.success) {
             addLog(`✅ ${result.message}`, 'success');
 
-            if (result.success_clients && result.success_clients.length > 0) {
-                addLog(`성공: ${result.success_clients.join(', ')}`, 'success');
-            }
+            // 📨 전송은 서버 작업 큐에서 진행 → 모든 대상의 첫 시도가 끝날 때까지 진행 상황 조회
+            window.iniJobInProgress = true;
+            const startedAt = Date.now();
+            const job = await waitIniJob(result.job_id, (p) => {
+                loadingMessage.textContent = `전송 중... ${p.settled}/${p.total}`;
+            });
+
+            const succeeded = job.targets.filter(t => t.status === 'SUCCESS');
+            const failed = job.targets.filter(t => t.status === 'FAILED');
+            const retrying = job.targets.filter(t => t.status === 'PENDING');
+            addLog(`✅ ${job.success}개 클라이언트에 명령 전송 완료 (${((Date.now() - startedAt) / 1000).toFixed(1)}초)`, 'success');
 
-            if (result.errors && result.errors.length > 0) {
-                result.errors.forEach(error => {
-                    addLog(`❌ ${error}`, 'error');
-                });
+            if (succeeded.length > 0) {
+                addLog(`성공: ${succeeded.map(t => `${t.name} (${t.ip}, ${t.latency_ms}ms)`).join(', ')}`, 'success');
             }
+
+            failed.forEach(t => {
+                addLog(`❌ ${t.name}: ${t.result} (${t.latency_ms}ms)`, 'error');
+            });
+
+            // 재시도 결과는 실시간 스트림(ini 이벤트)으로 이어서 표시
+            retrying.forEach(t => {
+                const at = new Date(t.next_retry_at * 1000).toLocaleTimeString();
+                addLog(`🔁 ${t.name}: ${t.result} → ${at} 재시도 (${t.attempts}회 실패)`, 'error');
+            });
         } else {
             addLog(`❌ ${result.message}`, 'error');
         }
@@ -411,6 +467,23 @@ async function sendIniCommand() {
         console.error('전송 실패:', error);
         addLog(`❌ 전송 실패: ${error.message}`, 'error');
     } finally {
+        window.iniJobInProgress = false;
         loadingOverlay.style.display = 'none';
     }
+}
+
+// 📨 INI 전송 작업의 첫 시도가 모두 끝날 때까지 진행 상황 조회 (재시도는 기다리지 않음)
+async function waitIniJob(jobId, onProgress) {
+    while (true) {
+        const res = await fetch(getApiUrl(`/api/send-ini/${jobId}`));
+        const progress = await res.json();
+        if (!res.ok) {
+            throw new Error(progress.message || `HTTP ${res.status}`);
+        }
+        onProgress?.(progress);
+        if (progress.settled === progress.total) {
+            return progress;
+        }
+        await new Promise(resolve => setTimeout(resolve, 500));
+    }
 }
\ No newline at end of file
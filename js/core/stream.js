@@ -0,0 +1,71 @@
+// ═══════════════════════════════════════════════════════════════════════════════════════════
+// 📣 Live Stream Module - /api/stream (Server-Sent Events) 실시간 상태 수신
+// ═══════════════════════════════════════════════════════════════════════════════════════════
+
+let liveStream = null;
+window.liveStreamConnected = false;
+
+// 🎨 카드 왼쪽 막대 색상 (수신 중 / 수신 중단)
+function setCardLiveness(name, alive) {
+    const card = document.querySelector(`.card[data-name="${name}"]`);
+    if (card && !card.classList.contains('empty')) {
+        card.style.borderLeftColor = alive ? '#28a745' : '#dc3545';
+    }
+}
+
+// 📣 스트림 연결 - 연결 중에는 주기 갱신(fetchClients 폴링)을 쉬고 푸시로만 갱신
+function startLiveStream() {
+    if (typeof EventSource === 'undefined' || liveStream) {
+        return;  // 미지원 브라우저 → 기존 주기 갱신 유지
+    }
+
+    liveStream = new EventSource(getApiUrl('/api/stream'));
+
+    liveStream.onopen = () => {
+        window.liveStreamConnected = true;
+        fetchClients();  // 끊겨 있던 동안의 변경분 보충
+        if (typeof checkServerStatus === 'function') checkServerStatus();
+    };
+
+    liveStream.onerror = () => {
+        // 브라우저가 자동 재연결, 그동안은 주기 갱신으로 동작
+        window.liveStreamConnected = false;
+    };
+
+    // 바뀐 클라이언트 행 → 목록 병합 후 다시 그리기
+    liveStream.addEventListener('clients', (e) => {
+        const body = JSON.parse(e.data);
+        mergeClients(body.clients, false, body.rev);
+        fetchClients({ useCache: true });
+    });
+
+    // 수신 중단 / 재개 전환
+    liveStream.addEventListener('stale', (e) => {
+        const body = JSON.parse(e.data);
+        setCardLiveness(body.name, false);
+        if (typeof addLog === 'function') addLog(`❗ 수신 중단: ${body.name}`, 'error');
+    });
+    liveStream.addEventListener('alive', (e) => {
+        setCardLiveness(JSON.parse(e.data).name, true);
+    });
+
+    // 메인/웹 서버 상태 변경
+    liveStream.addEventListener('server_status', (e) => {
+        if (typeof applyServerStatus === 'function') applyServerStatus(JSON.parse(e.data));
+    });
+
+    // INI 명령 실행 결과
+    liveStream.addEventListener('ini', (e) => {
+        const body = JSON.parse(e.data);
+        // 이 화면에서 보낸 작업은 sendIniCommand() 가 끝날 때 한 번에 기록
+        if (typeof addLog === 'function' && !window.iniJobInProgress) {
+            const who = `${body.client_name || body.client_ip || ''} ${body.filename}`;
+            if (body.status === 'PENDING') {
+                addLog(`🔁 ${who} → 재시도 예정 (${body.attempts}회 실패: ${body.result})`, 'error');
+            } else {
+                const ok = body.status === 'SUCCESS';
+                addLog(`${ok ? '✅' : '❌'} ${who} → ${body.status}`, ok ? 'success' : 'error');
+            }
+        }
+    });
+}
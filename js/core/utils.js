@@ -70,6 +70,8 @@ function setRefreshInterval(seconds) {
     // 새로운 갱신 시작
     if (seconds > 0) {
         window.refreshIntervalId = setInterval(() => {
+            // 실시간 스트림 연결 중에는 푸시로 갱신되므로 주기 요청 생략
+            if (window.liveStreamConnected) return;
             if (typeof fetchClients === 'function') {
                 fetchClients();
             }
@@ -117,9 +119,9 @@ function initializeRefreshInterval() {
     const savedInterval = getRefreshInterval();
     setRefreshInterval(savedInterval);
 
-    // 서버 상태 체크도 주기적으로 실행
+    // 서버 상태 체크도 주기적으로 실행 (스트림 연결 중에는 바뀔 때 푸시로 받음)
     setInterval(() => {
-        if (typeof checkServerStatus === 'function') {
+        if (typeof checkServerStatus === 'function' && !window.liveStreamConnected) {
             checkServerStatus();
         }
     }, 30000); // 30초마다
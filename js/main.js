@@ -46,6 +46,12 @@ function initializeApp() {
         loadInitialData();
         console.log('✅ 초기 데이터 로드 시작');
 
+        // 5-1) 실시간 상태 스트림 (미지원/끊김 시 주기 갱신으로 동작)
+        if (document.getElementById('dashboard') && typeof startLiveStream === 'function') {
+            startLiveStream();
+            console.log('✅ 실시간 스트림 연결 시작');
+        }
+
         // 6) 빈 카드 텍스트 복원
         restoreEmptyCardTexts();
         console.log('✅ 빈 카드 텍스트 복원 완료');
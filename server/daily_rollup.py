@@ -0,0 +1,167 @@
+# ========================================
+# 🧮 일별 집계 (히스토리 조회용 미리 계산된 값)
+# 📦 파일명: daily_rollup.py
+#   - daily_totals        : 날짜별 전체 다이아 합계 / 클라이언트 수
+#   - daily_server_totals : 날짜 x 서버별 합계 / 클라이언트 수
+#   - daily_dia.diff      : 클라이언트별 전일 대비 증감
+#   - 배치 writer 가 daily_dia 를 쓸 때 같은 트랜잭션에서 증분 갱신
+#   - rebuild() 로 daily_dia 전체에서 다시 계산 (백필용)
+# ========================================
+
+import datetime
+
+
+def init_schema(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_totals (
+        date TEXT PRIMARY KEY,
+        total_dia INTEGER NOT NULL DEFAULT 0,
+        client_count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_server_totals (
+        date TEXT NOT NULL,
+        server TEXT NOT NULL,
+        total_dia INTEGER NOT NULL DEFAULT 0,
+        client_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (date, server)
+    ) WITHOUT ROWID
+    """)
+
+    columns = [r[1] for r in cursor.execute("PRAGMA table_info(daily_dia)").fetchall()]
+    if "diff" not in columns:
+        cursor.execute("ALTER TABLE daily_dia ADD COLUMN diff INTEGER")
+
+    # 히스토리 조회용 커버링 인덱스 (날짜 범위 조회를 테이블 접근 없이 처리)
+    cursor.execute("DROP INDEX IF EXISTS idx_daily_dia_date_cover")
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_daily_dia_history
+    ON daily_dia (date, name, dia, game, server, diff)
+    """)
+
+
+def needs_rebuild(cursor):
+    """집계 테이블이 비어 있는데 daily_dia 에는 데이터가 있으면 True (업그레이드 직후)"""
+    has_totals = cursor.execute("SELECT 1 FROM daily_totals LIMIT 1").fetchone()
+    has_daily = cursor.execute("SELECT 1 FROM daily_dia LIMIT 1").fetchone()
+    return bool(has_daily) and not has_totals
+
+
+def shift_day(day, delta):
+    return (datetime.date.fromisoformat(day) + datetime.timedelta(days=delta)).isoformat()
+
+
+def server_key(server):
+    """daily_server_totals.server 값 (NOT NULL) - rebuild() 의 COALESCE(server, '?') 와 같은 규칙"""
+    return '?' if server is None else server
+
+
+def fetch_current(cursor, daily_rows):
+    """
+    UPSERT 전에 기존 값을 읽어둠
+    daily_rows: daily_dia 행 튜플 (date, name, ip, game, server, dia, status, message)
+    → {(date, name): (dia, server_key(server))}
+    """
+    before = {}
+    for row in daily_rows:
+        day, name = row[0], row[1]
+        found = cursor.execute(
+            "SELECT dia, server FROM daily_dia WHERE date=? AND name=?", (day, name)
+        ).fetchone()
+        if found:
+            before[(day, name)] = (found[0], server_key(found[1]))
+    return before
+
+
+TOTALS_ADD_SQL = """
+INSERT INTO daily_totals (date, total_dia, client_count) VALUES (?, ?, ?)
+ON CONFLICT(date) DO UPDATE SET
+    total_dia    = total_dia + excluded.total_dia,
+    client_count = client_count + excluded.client_count
+"""
+
+SERVER_TOTALS_ADD_SQL = """
+INSERT INTO daily_server_totals (date, server, total_dia, client_count) VALUES (?, ?, ?, ?)
+ON CONFLICT(date, server) DO UPDATE SET
+    total_dia    = total_dia + excluded.total_dia,
+    client_count = client_count + excluded.client_count
+"""
+
+
+def apply(cursor, daily_rows, before):
+    """
+    UPSERT 후 호출 - 바뀐 행만큼 합계/증감을 증분 반영
+    → 갱신된 (date, name) 수
+    """
+    totals = {}          # {date: [dia 변화량, 클라이언트 수 변화량]}
+    server_totals = {}   # {(date, server): [dia 변화량, 클라이언트 수 변화량]}
+    changed = []
+
+    def add(bucket, key, dia, count):
+        entry = bucket.setdefault(key, [0, 0])
+        entry[0] += dia
+        entry[1] += count
+
+    for row in daily_rows:
+        day, name, server, dia = row[0], row[1], server_key(row[4]), row[5]
+        old = before.get((day, name))
+        if old is not None and old[0] == dia and old[1] == server:
+            continue  # 값 변화 없음
+
+        if old is None:
+            add(totals, day, dia, 1)
+            add(server_totals, (day, server), dia, 1)
+        else:
+            add(totals, day, dia - (old[0] or 0), 0)
+            add(server_totals, (day, old[1]), -(old[0] or 0), -1)
+            add(server_totals, (day, server), dia, 1)
+        changed.append((day, name, dia))
+
+    if totals:
+        cursor.executemany(TOTALS_ADD_SQL, [(d, v[0], v[1]) for d, v in totals.items()])
+    if server_totals:
+        cursor.executemany(SERVER_TOTALS_ADD_SQL, [
+            (d, s, v[0], v[1]) for (d, s), v in server_totals.items() if v != [0, 0]
+        ])
+
+    # 전일 대비 증감: 자기 행 + 다음날 행(과거 날짜가 재전송으로 채워진 경우)
+    for day, name, dia in changed:
+        prev = cursor.execute(
+            "SELECT dia FROM daily_dia WHERE date=? AND name=?", (shift_day(day, -1), name)
+        ).fetchone()
+        cursor.execute(
+            "UPDATE daily_dia SET diff=? WHERE date=? AND name=?",
+            (dia - (prev[0] if prev else 0), day, name)
+        )
+        cursor.execute(
+            "UPDATE daily_dia SET diff = dia - ? WHERE date=? AND name=?",
+            (dia, shift_day(day, 1), name)
+        )
+
+    return len(changed)
+
+
+def rebuild(conn):
+    """daily_dia 전체에서 집계를 다시 계산 (백필 / 불일치 복구용)"""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM daily_totals")
+    cursor.execute("""
+    INSERT INTO daily_totals (date, total_dia, client_count)
+    SELECT substr(date,1,10), SUM(dia), COUNT(*) FROM daily_dia GROUP BY substr(date,1,10)
+    """)
+    cursor.execute("DELETE FROM daily_server_totals")
+    cursor.execute("""
+    INSERT INTO daily_server_totals (date, server, total_dia, client_count)
+    SELECT substr(date,1,10), COALESCE(server, '?'), SUM(dia), COUNT(*)
+    FROM daily_dia GROUP BY substr(date,1,10), COALESCE(server, '?')
+    """)
+    cursor.execute("""
+    UPDATE daily_dia SET diff = dia - COALESCE((
+        SELECT p.dia FROM daily_dia p
+        WHERE p.date = date(daily_dia.date, '-1 day') AND p.name = daily_dia.name
+    ), 0)
+    """)
+    conn.commit()
+    return cursor.execute("SELECT COUNT(*) FROM daily_totals").fetchone()[0]
@@ -0,0 +1,161 @@
+# ========================================
+# 📈 다이아 시계열 기록 (하루 중 변화 추적)
+# 📦 파일명: dia_samples.py
+#   - dia_samples : (클라이언트 id, epoch 초) → 다이아, 값이 바뀔 때만 기록
+#   - dia_rollup  : 시간/일 단위 요약 (처음/마지막/최소/최대/변화 횟수)
+#   - client_ids  : 클라이언트 이름 → 정수 id (샘플 행 크기 절약)
+#   - 보관 기간이 지난 샘플/요약은 주기적으로 정리
+# ========================================
+
+import time
+import datetime
+
+HOUR = 3600
+DAY = 86400
+ROLLUP_RESOLUTIONS = (HOUR, DAY)
+
+
+def init_schema(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS client_ids (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS dia_samples (
+        client_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        dia INTEGER NOT NULL,
+        PRIMARY KEY (client_id, ts)
+    ) WITHOUT ROWID
+    """)
+
+    # res: 3600(시간) / 86400(일), bucket: 구간 시작 epoch (일 단위는 로컬 자정)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS dia_rollup (
+        res INTEGER NOT NULL,
+        client_id INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        first_ts INTEGER NOT NULL,
+        first_dia INTEGER NOT NULL,
+        last_ts INTEGER NOT NULL,
+        last_dia INTEGER NOT NULL,
+        min_dia INTEGER NOT NULL,
+        max_dia INTEGER NOT NULL,
+        samples INTEGER NOT NULL,
+        PRIMARY KEY (res, client_id, bucket)
+    ) WITHOUT ROWID
+    """)
+
+
+def bucket_start(ts, res):
+    """ts 가 속한 구간의 시작 epoch (일 단위는 로컬 자정 기준 → daily_dia 날짜와 일치)"""
+    if res == DAY:
+        d = datetime.date.fromtimestamp(ts)
+        return int(time.mktime(d.timetuple()))
+    return ts - ts % res
+
+
+ROLLUP_UPSERT_SQL = """
+INSERT INTO dia_rollup
+(res, client_id, bucket, first_ts, first_dia, last_ts, last_dia, min_dia, max_dia, samples)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT(res, client_id, bucket) DO UPDATE SET
+    first_dia = CASE WHEN excluded.first_ts < dia_rollup.first_ts THEN excluded.first_dia ELSE dia_rollup.first_dia END,
+    first_ts  = min(dia_rollup.first_ts, excluded.first_ts),
+    last_dia  = CASE WHEN excluded.last_ts >= dia_rollup.last_ts THEN excluded.last_dia ELSE dia_rollup.last_dia END,
+    last_ts   = max(dia_rollup.last_ts, excluded.last_ts),
+    min_dia   = min(dia_rollup.min_dia, excluded.min_dia),
+    max_dia   = max(dia_rollup.max_dia, excluded.max_dia),
+    samples   = dia_rollup.samples + 1
+"""
+
+
+class SampleWriter:
+    """
+    배치 writer 전용 (단일 스레드에서만 호출)
+    - 이름 → id, 클라이언트별 마지막 샘플 (ts, dia) 을 메모리에 캐시
+    - 값이 그대로인 보고는 아무것도 쓰지 않음
+    """
+
+    def __init__(self):
+        self.ids = {}          # {name: client_id}
+        self.last = {}         # {client_id: (ts, dia)}
+
+    def reset(self):
+        """트랜잭션 롤백 후 호출 - 롤백된 id / 샘플이 캐시에 남지 않도록 비움 (다음 기록 때 DB 에서 다시 읽음)"""
+        self.ids.clear()
+        self.last.clear()
+
+    def client_id(self, cursor, name):
+        cid = self.ids.get(name)
+        if cid is None:
+            cursor.execute("INSERT OR IGNORE INTO client_ids (name) VALUES (?)", (name,))
+            cid = cursor.execute("SELECT id FROM client_ids WHERE name=?", (name,)).fetchone()[0]
+            self.ids[name] = cid
+        return cid
+
+    def last_sample(self, cursor, cid):
+        if cid not in self.last:
+            row = cursor.execute(
+                "SELECT ts, dia FROM dia_samples WHERE client_id=? ORDER BY ts DESC LIMIT 1", (cid,)
+            ).fetchone()
+            self.last[cid] = (row[0], row[1]) if row else None
+        return self.last[cid]
+
+    def record(self, cursor, reports):
+        """
+        reports: [(name, ts, dia), ...] 수신 순서
+        → 기록된 샘플 수 반환 (같은 트랜잭션 안에서 호출)
+        """
+        samples = []
+        for name, ts, dia in reports:
+            cid = self.client_id(cursor, name)
+            last = self.last_sample(cursor, cid)
+
+            if last is None or ts >= last[0]:
+                if last is not None and last[1] == dia:
+                    continue  # 변화 없음 → 기록 안 함
+                self.last[cid] = (ts, dia)
+            # ts 가 더 오래된 보고(스풀 재전송)는 그 시점 샘플로 끼워 넣음
+            samples.append((cid, ts, dia))
+
+        if not samples:
+            return 0
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO dia_samples (client_id, ts, dia) VALUES (?, ?, ?)", samples
+        )
+        cursor.executemany(ROLLUP_UPSERT_SQL, [
+            (res, cid, bucket_start(ts, res), ts, dia, ts, dia, dia, dia)
+            for cid, ts, dia in samples
+            for res in ROLLUP_RESOLUTIONS
+        ])
+        return len(samples)
+
+    def prune(self, conn, samples_days, hourly_days, daily_days):
+        """보관 기간이 지난 샘플/요약 삭제 → 삭제 행 수 (클라이언트별 PK 범위 삭제)"""
+        now_ts = int(time.time())
+        ids = [r[0] for r in conn.execute("SELECT id FROM client_ids").fetchall()]
+        deleted = 0
+
+        cur = conn.executemany(
+            "DELETE FROM dia_samples WHERE client_id=? AND ts < ?",
+            [(cid, now_ts - samples_days * DAY) for cid in ids]
+        )
+        deleted += cur.rowcount
+        for res, days in ((HOUR, hourly_days), (DAY, daily_days)):
+            if days <= 0:
+                continue  # 0 이하는 무기한 보관
+            cur = conn.executemany(
+                "DELETE FROM dia_rollup WHERE res=? AND client_id=? AND bucket < ?",
+                [(res, cid, now_ts - days * DAY) for cid in ids]
+            )
+            deleted += cur.rowcount
+        conn.commit()
+
+        # 정리된 샘플의 캐시는 다시 읽도록 비움
+        self.last.clear()
+        return deleted
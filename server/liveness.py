@@ -0,0 +1,91 @@
+# ========================================
+# 💓 클라이언트 생존 추적 (마감 시각 기반)
+# 📦 파일명: liveness.py
+#   - 보고가 오면 마감 시각 = 지금 + timeout 을 힙에 넣기만 함 (O(log n))
+#   - expire() 는 마감이 지난 항목만 꺼냄 → 전체 클라이언트를 훑지 않음
+#   - alive → stale, stale → alive 전환은 각각 한 번만 발생
+#   - 전환 목록은 배치 writer 가 가져가서 clients.status 에 한 번에 기록
+# ========================================
+
+import time
+import heapq
+import threading
+
+
+class LivenessTracker:
+
+    def __init__(self, timeout_sec):
+        self.timeout = timeout_sec
+        self.lock = threading.Lock()
+        self.deadlines = {}     # {name: 현재 마감 시각} - stale 인 클라이언트는 없음
+        self.heap = []          # [(마감 시각, name)] - 예전 마감(다시 보고해서 밀린 것)은 꺼낼 때 버림
+        self.stale = set()
+        self.transitions = []   # [(kind, name, 마지막 보고 epoch)] kind: "stale" / "alive"
+
+    def touch(self, name, now_ts=None):
+        """보고 수신 - 마감 시각 갱신 (stale 이었으면 alive 전환 기록)"""
+        now_ts = time.time() if now_ts is None else now_ts
+        deadline = now_ts + self.timeout
+        with self.lock:
+            self.deadlines[name] = deadline
+            heapq.heappush(self.heap, (deadline, name))
+            if name in self.stale:
+                self.stale.discard(name)
+                self.transitions.append(("alive", name, now_ts))
+            if len(self.heap) > 4 * len(self.deadlines) + 1024:
+                self.compact()
+
+    def seed(self, rows, now_ts=None):
+        """
+        서버 시작 시 DB 의 clients 로 초기화 (이미 보고가 온 클라이언트는 유지)
+        rows: [(name, 마지막 보고 epoch 또는 None, status)]
+        - stale 로 저장된 클라이언트는 그대로 stale (전환 없음)
+        - alive 인데 마감이 이미 지났으면 다음 expire() 에서 stale 전환
+        """
+        now_ts = time.time() if now_ts is None else now_ts
+        with self.lock:
+            for name, last, status in rows:
+                if name in self.deadlines or name in self.stale:
+                    continue
+                if status == "stale":
+                    self.stale.add(name)
+                    continue
+                deadline = (last if last is not None else now_ts) + self.timeout
+                self.deadlines[name] = deadline
+                self.heap.append((deadline, name))
+            heapq.heapify(self.heap)
+
+    def expire(self, now_ts=None):
+        """마감이 지난 클라이언트를 stale 로 전환 → 새로 stale 이 된 수"""
+        now_ts = time.time() if now_ts is None else now_ts
+        count = 0
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now_ts:
+                deadline, name = heapq.heappop(self.heap)
+                if self.deadlines.get(name) != deadline:
+                    continue  # 그 뒤에 다시 보고함 → 지난 마감
+                del self.deadlines[name]
+                self.stale.add(name)
+                self.transitions.append(("stale", name, deadline - self.timeout))
+                count += 1
+        return count
+
+    def take(self):
+        """쌓인 전환 목록을 꺼냄 (발생 순서)"""
+        with self.lock:
+            transitions, self.transitions = self.transitions, []
+        return transitions
+
+    def restore(self, transitions):
+        """기록 실패한 전환을 다음 기록 때 다시 시도하도록 앞에 되돌림"""
+        with self.lock:
+            self.transitions[:0] = transitions
+
+    def compact(self):
+        """지난 마감 항목 정리 (lock 안에서 호출)"""
+        self.heap = [(d, n) for n, d in self.deadlines.items()]
+        heapq.heapify(self.heap)
+
+    def counts(self):
+        with self.lock:
+            return {"alive": len(self.deadlines), "stale": len(self.stale), "heap": len(self.heap)}
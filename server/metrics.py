@@ -0,0 +1,181 @@
+# ========================================
+# 📊 처리량 / 지연 지표 (Prometheus 텍스트 형식)
+# 📦 파일명: metrics.py  (server/ 와 board/ 에 같은 파일)
+#   - Counter   : 누적 횟수 (보고 수신, 파싱 실패 ...)
+#   - Histogram : 구간별 분포 (배치 크기, 커밋 지연, 응답 시간 ...)
+#   - Gauge     : 수집 시점에 함수로 읽는 현재 값 (큐 깊이, 연결 수 ...)
+#   - 기록은 스레드별 칸에만 더함 → 수신 경로에서 잠금 없음 (처음 보는 스레드/라벨일 때만 잠금)
+#   - 수집(render)할 때 모든 스레드 칸을 합산
+# ========================================
+
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry = []
+_lock = threading.Lock()
+
+
+class _Sharded:
+    """스레드별 {라벨 값 튜플: [값...]} 칸 - 자기 칸은 자기 스레드만 씀"""
+
+    def __init__(self, name, help_text, label_names, width):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.width = width
+        self.shards = {}   # {thread ident: {labels: [값...]}}
+        with _lock:
+            _registry.append(self)
+
+    def cell(self, labels):
+        ident = threading.get_ident()
+        shard = self.shards.get(ident)
+        if shard is None:
+            with _lock:
+                shard = self.shards.setdefault(ident, {})
+        values = shard.get(labels)
+        if values is None:
+            values = [0] * self.width
+            with _lock:
+                shard = dict(shard)   # 읽는 쪽이 순회 중일 수 있으므로 새 dict 로 교체
+                shard[labels] = values
+                self.shards[ident] = shard
+        return values
+
+    def totals(self):
+        """{labels: 합산 [값...]} (스레드가 끝나도 같은 ident 의 다음 스레드가 이어서 더하므로 값은 유지)"""
+        merged = {}
+        for shard in list(self.shards.values()):
+            for labels, values in list(shard.items()):
+                acc = merged.get(labels)
+                if acc is None:
+                    merged[labels] = list(values)
+                else:
+                    for i, v in enumerate(values):
+                        acc[i] += v
+        return merged
+
+    def label_text(self, labels, extra=None):
+        pairs = list(zip(self.label_names, labels))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def __init__(self, name, help_text, label_names=()):
+        super().__init__(name, help_text, label_names, 1)
+
+    def inc(self, amount=1, *labels):
+        self.cell(labels)[0] += amount
+
+    def render(self):
+        for labels, values in sorted(self.totals().items()):
+            yield f"{self.name}{self.label_text(labels)} {format_value(values[0])}"
+
+
+class Histogram(_Sharded):
+    """칸 구성: [구간별 개수..., +Inf 개수, 합계]"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.buckets = sorted(buckets)
+        super().__init__(name, help_text, label_names, len(self.buckets) + 2)
+
+    def observe(self, value, *labels):
+        values = self.cell(labels)
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def render(self):
+        for labels, values in sorted(self.totals().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                yield f"{self.name}_bucket{self.label_text(labels, ('le', format_value(bound)))} {cumulative}"
+            cumulative += values[len(self.buckets)]
+            yield f"{self.name}_bucket{self.label_text(labels, ('le', '+Inf'))} {cumulative}"
+            yield f"{self.name}_sum{self.label_text(labels)} {format_value(values[-1])}"
+            yield f"{self.name}_count{self.label_text(labels)} {cumulative}"
+
+
+class Gauge:
+    """
+    수집 시점에 fn() 으로 값을 읽음
+    fn 이 dict 를 돌려주면 {라벨 값 튜플: 값} (label_names 필요)
+    kind="counter" 로 다른 곳에서 세는 누적 값도 노출 가능
+    """
+
+    def __init__(self, name, help_text, fn, label_names=(), kind="gauge"):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.label_names = tuple(label_names)
+        self.kind = kind
+        with _lock:
+            _registry.append(self)
+
+    def render(self):
+        value = self.fn()
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        for labels, v in sorted(items):
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{k}="{escape(x)}"' for k, x in zip(self.label_names, labels)) + "}"
+            yield f"{self.name}{label_text} {format_value(v)}"
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(v):
+    if isinstance(v, float) and v.is_integer() and abs(v) < 1e15:
+        return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+def render():
+    """등록된 모든 지표 → Prometheus 텍스트"""
+    lines = []
+    with _lock:
+        metrics = list(_registry)
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        try:
+            lines.extend(metric.render())
+        except Exception as e:
+            lines.append(f"# {metric.name} 수집 실패: {e}")
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 수집 요청마다 콘솔 출력하지 않음
+
+
+def serve(host, port):
+    """별도 스레드에서 /metrics HTTP 서버 실행 → 서버 객체 (포트 사용 중이면 OSError)"""
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True, name="metrics-http").start()
+    return httpd
@@ -7,47 +7,105 @@
 #   - 수신/송신 로그 정제 및 오류 로깅 강화
 # ========================================
 
-import sys, socket, threading, json, datetime, time
+import sys, socket, threading, json, datetime, time, math
 import os, traceback
 import sqlite3
 import queue
+import asyncio
+from collections import OrderedDict, deque
 from threading import local
 
+import dia_samples
+import daily_rollup
+import log_writer
+import liveness
+import metrics
+
 # 실행 위치 기준 디렉터리 (EXE 대응 포함)
 BASE_DIR = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__))
 data_queue = queue.Queue() # 배치 처리용 큐
 DB_PATH = os.path.join(BASE_DIR, "client_status.db")
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS clients (
-    name TEXT PRIMARY KEY,
-    ip TEXT,
-    game TEXT,
-    server TEXT,
-    dia INTEGER,
-    last_report TEXT,
-    status TEXT,
-    message TEXT
-)
-""")
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS daily_dia (
-    date TEXT NOT NULL,
-    name TEXT NOT NULL,
-    ip TEXT,
-    game TEXT,
-    server TEXT,
-    dia INTEGER,
-    status TEXT,
-    message TEXT,
-    PRIMARY KEY (date, name)
-)
-""")
-
-conn.commit()
+SNAPSHOT_PATH = os.path.join(BASE_DIR, "client_snapshot.json")  # 🔥 웹 대시보드용 최신 상태 스냅샷
+HEALTH_PATH = os.path.join(BASE_DIR, "server_health.json")      # 🩺 웹 서버 상태 표시용 (큐/커밋/연결 수)
+STARTED_AT = time.time()
+
+def init_db():
+    """테이블 생성 (서버 시작 시 1회)"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS clients (
+        name TEXT PRIMARY KEY,
+        ip TEXT,
+        game TEXT,
+        server TEXT,
+        dia INTEGER,
+        last_report TEXT,
+        status TEXT,
+        message TEXT,
+        rev INTEGER
+    )
+    """)
+
+    # 🔢 데이터 버전 (대시보드 조건부 요청 / 변경분 조회용)
+    #   - clients 행이 바뀐 배치마다 1 증가, 바뀐 행의 rev 컬럼에 그 값을 기록
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS data_version (
+        name TEXT PRIMARY KEY,
+        rev INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO data_version (name, rev) VALUES ('clients', 0)")
+
+    columns = [r[1] for r in cursor.execute("PRAGMA table_info(clients)").fetchall()]
+    if "rev" not in columns:
+        cursor.execute("ALTER TABLE clients ADD COLUMN rev INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_rev ON clients (rev)")
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_dia (
+        date TEXT NOT NULL,
+        name TEXT NOT NULL,
+        ip TEXT,
+        game TEXT,
+        server TEXT,
+        dia INTEGER,
+        status TEXT,
+        message TEXT,
+        PRIMARY KEY (date, name)
+    )
+    """)
+
+    # 📣 변경 이벤트 (웹 대시보드 실시간 푸시용 - board/app.py 가 id 순으로 읽어 브라우저에 전달)
+    #   kind: clients(데이터 버전 증가) / stale / alive / ini
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts REAL NOT NULL,
+        kind TEXT NOT NULL,
+        data TEXT
+    )
+    """)
+
+    dia_samples.init_schema(cursor)   # 📈 하루 중 다이아 변화 기록용
+    daily_rollup.init_schema(cursor)  # 🧮 일별 합계 / 전일 대비 증감 (히스토리 조회용)
+    conn.commit()
+
+    # 업그레이드 직후 집계가 비어 있으면 기존 daily_dia 에서 채움
+    if daily_rollup.needs_rebuild(cursor):
+        daily_rollup.rebuild(conn)
+
+    conn.close()
+
+def rebuild_rollups():
+    """python server.py --rebuild-rollups : daily_dia 전체에서 일별 집계 재생성"""
+    init_db()
+    conn = sqlite3.connect(DB_PATH)
+    started = time.perf_counter()
+    days = daily_rollup.rebuild(conn)
+    conn.close()
+    print(f"🧮 일별 집계 재생성 완료: {days}일 ({time.perf_counter() - started:.1f}초)")
 
 # 기본 설정값
 DEFAULT_CONFIG = {
@@ -55,7 +113,36 @@ DEFAULT_CONFIG = {
     "server_port": 5050,
     "log_path": os.path.join(BASE_DIR, "server_log.txt"),
     "debug_log_path": os.path.join(BASE_DIR, "client_debug.log"),
-    "report_interval_sec": 58
+    "report_interval_sec": 58,
+    "ingest_mode": "thread",          # "thread" | "asyncio"
+    "listen_backlog": 128,            # listen() 대기열 크기
+    "max_connections": 512,           # asyncio 모드 동시 처리 연결 수 상한 (1회성 전송 / NDJSON 연결 수립 중)
+    "max_framed_links": 2048,         # NDJSON 지속 연결 수 상한 (넘으면 BUSY → 클라이언트는 1회성 전송으로 전환)
+    "client_read_timeout_sec": 10,    # 연결당 수신 대기 시간
+    "framed_idle_timeout_sec": 300,   # NDJSON 지속 연결 유휴 허용 시간
+    "max_frame_bytes": 1048576,       # 보고 1건 최대 크기
+    "batch_max_rows": 1000,           # 배치 1회 최대 행 수
+    "batch_min_rows": 50,             # 적응형 모드 최소 목표 행 수
+    "batch_max_bytes": 4194304,       # 배치 1회 최대 수신 바이트
+    "batch_max_delay_sec": 2.0,       # 첫 보고 수신 후 flush 까지 최대 대기
+    "batch_adaptive": True,           # 부하에 따라 목표 행 수 자동 조절
+    "batch_stats_log_sec": 60,        # 배치 통계 로그 주기
+    "samples_retention_days": 14,     # 다이아 변화 원본 샘플 보관 기간
+    "hourly_retention_days": 180,     # 시간 단위 요약 보관 기간
+    "daily_retention_days": 1825,     # 일 단위 요약 보관 기간 (0 이하 = 무기한)
+    "samples_prune_interval_sec": 3600,
+    "events_retention_sec": 3600,     # 대시보드 푸시 이벤트 보관 기간
+    "snapshot_interval_sec": 1.0,     # 상태 스냅샷 파일 최소 갱신 간격 (변경 있을 때)
+    "snapshot_refresh_sec": 30,       # 변경 없어도 다시 쓰는 주기 (웹 서버가 살아있음 판단)
+    "health_interval_sec": 5,         # server_health.json 갱신 주기
+    "metrics_host": "127.0.0.1",      # Prometheus 지표 HTTP (/metrics) - 로컬에서만 접근
+    "metrics_port": 9105,             # 0 = 사용 안 함
+    "log_level": "DEBUG",             # DEBUG(보고마다 수신 로그) / INFO / WARN / ERROR / OFF
+    "log_rate_limits": {"DEBUG": 20}, # 레벨별 초당 최대 기록 줄 수 (넘친 줄은 건수만 요약)
+    "log_max_size_mb": 10,            # 로그 파일 회전 크기
+    "log_max_age_days": 7,            # 로그 파일 회전 기간
+    "log_backups": 3,                 # 회전된 로그 보관 개수 (server_log.txt.1 ...)
+    "log_console": True               # 콘솔 출력 여부
 }
 
 # 현재 시각 문자열 반환
@@ -84,30 +171,76 @@ def load_config():
     except:
         return DEFAULT_CONFIG
 
-# 로그 출력 함수
-def log(msg, file):
-    text = f"[{now()}] {msg}"
-    print(text)
+# 로그 출력 함수 (큐에 넣고 바로 반환 → 기록은 log_writer 백그라운드 스레드)
+def log(msg, file, level="INFO"):
+    log_writer.get(file).write(msg, level)
+
+def setup_log(config):
+    """settings.json 의 로그 설정 적용"""
+    log_writer.get(config["log_path"]).configure(
+        level=config["log_level"],
+        rate_limits=config["log_rate_limits"],
+        max_bytes=int(config["log_max_size_mb"] * 1024 * 1024),
+        max_age_days=config["log_max_age_days"],
+        backups=config["log_backups"],
+        console=config["log_console"]
+    )
+
+# 💓 AHK 생존 추적 (보고 수신 시 마감 갱신 → 배치 writer 가 전환만 DB 에 기록)
+client_liveness = liveness.LivenessTracker(DEFAULT_CONFIG["report_interval_sec"] * 2)
+LIVENESS_LOG_MAX = 20  # 한 번에 전환이 많을 때 (서버 재시작 직후 등) 개별 로그 줄 수 상한
+
+def parse_report_time(text):
+    """clients.last_report (now() 형식) → epoch (알 수 없으면 None)"""
     try:
-        with open(file, "a", encoding="utf-8") as f:
-            f.write(text + "\n")
-    except:
-        pass  # 로그 파일 접근 문제 있을 시 무시
+        return time.mktime(time.strptime(text, "%Y-%m-%d %H:%M:%S"))
+    except (TypeError, ValueError):
+        return None
 
-# AHK 생존 기록 저장소
-ahk_map = {}  # {name: last_report_time}
-ahk_lock = threading.Lock()
+def seed_liveness(conn):
+    """서버 시작 시 clients 테이블의 마지막 보고 시각/상태로 생존 추적 초기화"""
+    rows = conn.execute("SELECT name, last_report, status FROM clients").fetchall()
+    client_liveness.seed([(name, parse_report_time(last), status) for name, last, status in rows])
 
-# 감시 루프: 일정 시간 이상 수신 없으면 경고 출력
-def watch_ahk(alert_sec, log_path):
-    while True:
-        now_ts = time.time()
-        with ahk_lock:
-            for name, last in list(ahk_map.items()):
-                if now_ts - last > alert_sec:
-                    mins = int((now_ts - last) // 60)
-                    log(f"❗AHK 수신 중단 → {name} ({mins}분 이상)", log_path)
-        time.sleep(60)
+def persist_liveness(transitions, log_path):
+    """
+    생존 전환을 한 트랜잭션으로 기록 (배치 writer 스레드에서 호출)
+    - clients.status 갱신 + 데이터 버전 증가 (대시보드 변경분 조회에 포함)
+    - stale / alive 이벤트 발행, 전환 1건당 로그 1줄
+    """
+    final = {}
+    for kind, name, last in transitions:
+        final[name] = kind  # 같은 배치에서 stale → alive 가 모두 있으면 마지막 상태로
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(BUMP_CLIENTS_REV_SQL, (1,))
+    rev = cursor.execute("SELECT rev FROM data_version WHERE name = 'clients'").fetchone()[0]
+    cursor.executemany(
+        "UPDATE clients SET status = ?, rev = ? WHERE name = ? AND status IS NOT ?",
+        [(status, rev, name, status) for name, status in final.items()]
+    )
+    events = [(kind, {"name": name, "last": last}) for kind, name, last in transitions]
+    if cursor.rowcount == 0:
+        cursor.execute(BUMP_CLIENTS_REV_SQL, (-1,))
+        rev = None
+    else:
+        events.append(("clients", {"rev": rev}))
+    publish_events(cursor, events)
+    conn.commit()
+    if rev is not None:
+        hot_snapshot.set_status(final, rev)
+
+    now_ts = time.time()
+    for kind, name, last in transitions[:LIVENESS_LOG_MAX]:
+        if kind == "stale":
+            log(f"❗AHK 수신 중단 → {name} ({int((now_ts - last) // 60)}분 이상)", log_path, "WARN")
+        else:
+            log(f"✅ AHK 수신 재개 → {name}", log_path)
+    if len(transitions) > LIVENESS_LOG_MAX:
+        stale = sum(1 for kind, _, _ in transitions if kind == "stale")
+        log(f"💓 생존 상태 전환 외 {len(transitions) - LIVENESS_LOG_MAX}건 "
+            f"(이번 전체: 중단 {stale} / 재개 {len(transitions) - stale})", log_path)
 
 # 클라이언트에 TCP로 메시지 전송 (→ 클라가 AHK 실행)
 def send_to_client(client_ip, message, log_path):
@@ -120,136 +253,789 @@ def send_to_client(client_ip, message, log_path):
         log(f"⚠️ 클라 전송 실패 → {client_ip} | 오류: {e}", log_path)
 
 
-def store_client_batch(payload):
-    """클라이언트 데이터를 큐에 추가 (빠른 처리)"""
-    data_queue.put(payload)
+# 🔁 중복 보고 제거 (클라이언트 스풀 재전송 대비) - 키: name + ts(클라이언트 보고 시각)
+recent_reports = OrderedDict()   # {(name, ts): None} 최근 키 캐시
+latest_report_ts = {}            # {name: 가장 최근 보고 ts}
+dedup_lock = threading.Lock()
+DEDUP_CACHE_SIZE = 100000
+
+TS_MIN = 946684800        # 2000-01-01 - 이보다 이른 ts 는 잘못된 값
+TS_MAX_AHEAD_SEC = 86400  # 서버 시계보다 하루 넘게 앞선 ts 도 잘못된 값 (이후 보고가 모두 중복 처리되는 것 방지)
+
+def normalize_report_ts(value):
+    """보고 ts → float epoch, 없거나 잘못된 값(null/문자열/범위 밖)이면 None"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(ts) or ts < TS_MIN or ts > time.time() + TS_MAX_AHEAD_SEC:
+        return None
+    return ts
+
+REPORT_TEXT_FIELDS = ("name", "ip", "game", "game_server", "msg")
+
+def normalize_report_dia(value):
+    """보고 dia → int (필드가 없으면 0), 숫자로 볼 수 없는 값("1,234", null, 목록 ...)이면 None"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+def invalid_report_reason(payload):
+    """배치 저장에서 실패할 보고인지 미리 검사 → 사유 문자열 (정상이면 None)"""
+    if not isinstance(payload, dict):
+        return f"JSON 객체가 아님 ({type(payload).__name__})"
+    if not isinstance(payload.get("name", "unknown"), str):
+        return f"name={payload.get('name')!r}"
+    for field in REPORT_TEXT_FIELDS:
+        if isinstance(payload.get(field), (list, dict)):
+            return f"{field} 형식 오류"
+    if "dia" in payload and normalize_report_dia(payload["dia"]) is None:
+        return f"dia={payload['dia']!r}"
+    return None
+
+def classify_report(name, ts):
+    """
+    보고 종류 판별
+    - "live"   : 이 클라이언트의 가장 최신 보고 → clients + daily_dia(ts 날짜) 저장
+    - "history": 지난 날짜의 재전송 보고 → daily_dia(해당 날짜)만 저장
+    - "dup"    : 이미 받은 보고 또는 같은 날 더 최신 값이 이미 있음 → 무시
+    ts 가 없는 구버전 클라이언트 보고는 항상 "live" (날짜는 서버 기준)
+    ts 는 normalize_report_ts() 를 거친 값 (float 또는 None)
+    → (종류, 이 보고 전의 latest_report_ts) - 배치 저장 실패 시 forget_reports() 로 되돌리는 데 사용
+    """
+    if ts is None:
+        return "live", None
+
+    with dedup_lock:
+        key = (name, ts)
+        if key in recent_reports:
+            return "dup", None
+        recent_reports[key] = None
+        if len(recent_reports) > DEDUP_CACHE_SIZE:
+            recent_reports.popitem(last=False)
+
+        latest = latest_report_ts.get(name)
+        if latest is None or ts >= latest:
+            latest_report_ts[name] = ts
+            return "live", latest
+
+    report_day = datetime.date.fromtimestamp(ts)
+    if report_day < datetime.date.fromtimestamp(latest):
+        return "history", latest
+    return "dup", None
+
+def forget_reports(batch_data):
+    """
+    저장에 실패한(롤백된) 보고의 중복 판별 기록을 되돌림
+    → 클라이언트가 같은 보고를 재전송하면 중복으로 버리지 않고 다시 저장
+    (뒤에 받은 보고부터 되돌려야 latest_report_ts 가 원래 값으로 돌아감)
+    """
+    with dedup_lock:
+        for payload in reversed(batch_data):
+            ts = payload.get("ts")
+            if ts is None:
+                continue
+            name = payload.get("name", "unknown")
+            recent_reports.pop((name, ts), None)
+            if latest_report_ts.get(name) == ts:
+                prev = payload.get("_prev_latest")
+                if prev is None:
+                    latest_report_ts.pop(name, None)
+                else:
+                    latest_report_ts[name] = prev
+
+def store_client_batch(payload, nbytes=0):
+    """클라이언트 데이터를 큐에 추가 (빠른 처리) - nbytes: 수신 원문 크기 (배치 크기 제한용)"""
+    data_queue.put((payload, nbytes))
+
+# 💾 UPSERT 쿼리
+#   - INSERT OR REPLACE 는 매번 행을 지우고 다시 넣어서 PK b-tree 와 WAL 을 계속 흔듦
+#   - ON CONFLICT DO UPDATE ... WHERE 로 실제로 바뀐 행만 제자리 갱신
+CLIENTS_UPSERT_SQL = """
+INSERT INTO clients
+(name, ip, game, server, dia, last_report, status, message, rev)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, (SELECT rev FROM data_version WHERE name = 'clients'))
+ON CONFLICT(name) DO UPDATE SET
+    rev         = excluded.rev,
+    ip          = excluded.ip,
+    game        = excluded.game,
+    server      = excluded.server,
+    dia         = excluded.dia,
+    last_report = excluded.last_report,
+    status      = excluded.status,
+    message     = excluded.message
+WHERE clients.last_report IS NOT excluded.last_report
+   OR clients.dia         IS NOT excluded.dia
+   OR clients.status      IS NOT excluded.status
+   OR clients.message     IS NOT excluded.message
+   OR clients.ip          IS NOT excluded.ip
+   OR clients.game        IS NOT excluded.game
+   OR clients.server      IS NOT excluded.server
+"""
+
+DAILY_DIA_UPSERT_SQL = """
+INSERT INTO daily_dia
+(date, name, ip, game, server, dia, status, message)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(date, name) DO UPDATE SET
+    ip      = excluded.ip,
+    game    = excluded.game,
+    server  = excluded.server,
+    dia     = excluded.dia,
+    status  = excluded.status,
+    message = excluded.message
+WHERE daily_dia.dia     IS NOT excluded.dia
+   OR daily_dia.status  IS NOT excluded.status
+   OR daily_dia.message IS NOT excluded.message
+   OR daily_dia.ip      IS NOT excluded.ip
+   OR daily_dia.game    IS NOT excluded.game
+   OR daily_dia.server  IS NOT excluded.server
+"""
+
+BUMP_CLIENTS_REV_SQL = "UPDATE data_version SET rev = rev + ? WHERE name = 'clients'"
+
+def publish_events(cursor, events):
+    """events: [(kind, dict), ...] → events 테이블에 기록 (커밋은 호출한 쪽에서)"""
+    now_ts = time.time()
+    cursor.executemany(
+        "INSERT INTO events (ts, kind, data) VALUES (?, ?, ?)",
+        [(now_ts, kind, json.dumps(data, ensure_ascii=False)) for kind, data in events]
+    )
 
-def batch_insert_to_db(batch_data):
-    """배치 데이터를 DB에 한번에 저장"""
+sample_writer = dia_samples.SampleWriter()  # 배치 writer 스레드 전용
+
+def coalesce_batch(batch_data, today):
+    """
+    배치 안의 중복 보고 병합 → (clients 행 리스트, daily_dia 행 리스트, 병합된 보고 수)
+    - clients  : 이름별 마지막 보고만
+    - daily_dia: (날짜, 이름)별 마지막 보고만
+    큐 순서 = 수신 순서이므로 뒤에 온 보고가 앞의 것을 덮어씀
+    """
+    clients_rows = {}
+    daily_rows = {}
+
+    for payload in batch_data:
+        name = payload.get("name", "unknown")
+        # 📅 클라이언트 보고 시각(ts)이 있으면 그 날짜로 기록 (스풀 재전송 대비)
+        ts = payload.get("ts")  # process_report 에서 검증된 float (없으면 서버 날짜)
+        day = datetime.date.fromtimestamp(ts).isoformat() if ts is not None else today
+
+        daily_rows[(day, name)] = (
+            day,
+            name,
+            payload.get("ip", "?"),
+            payload.get("game", "?"),
+            payload.get("game_server", "?"),
+            int(payload.get("dia", 0)),
+            "alive",
+            payload.get("msg", "?")
+        )
+
+        if payload.get("_history_only"):
+            continue  # 📼 지난 날짜 재전송 보고 → daily_dia 만 채움
+
+        clients_rows[name] = (
+            name,
+            payload.get("ip", "?"),
+            payload.get("game", "?"),
+            payload.get("game_server", "?"),
+            int(payload.get("dia", 0)),
+            now(),
+            "alive",
+            payload.get("msg", "?")
+        )
+
+    coalesced = len(batch_data) - len(daily_rows)
+    return list(clients_rows.values()), list(daily_rows.values()), coalesced
+
+def batch_insert_to_db(batch_data, log_path=DEFAULT_CONFIG["log_path"]):
+    """배치 데이터를 DB에 한번에 저장 (실패는 log_path 에 ERROR 로 기록)"""
     try:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # 배치로 clients 테이블 저장
-        clients_data = []
-        daily_data = []
-
-        for payload in batch_data:
-            clients_data.append((
-                payload.get("name", "unknown"),
-                payload.get("ip", "?"),
-                payload.get("game", "?"),
-                payload.get("game_server", "?"),
-                int(payload.get("dia", 0)),
-                now(),
-                "alive",
-                payload.get("msg", "?")
-            ))
-
-            daily_data.append((
-                today,
-                payload.get("name", "unknown"),
-                payload.get("ip", "?"),
-                payload.get("game", "?"),
-                payload.get("game_server", "?"),
-                int(payload.get("dia", 0)),
-                "alive",
-                payload.get("msg", "?")
-            ))
-
-        # 배치 INSERT
-        cursor.executemany("""
-        INSERT OR REPLACE INTO clients
-        (name, ip, game, server, dia, last_report, status, message)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, clients_data)
-
-        cursor.executemany("""
-        INSERT OR REPLACE INTO daily_dia
-        (date, name, ip, game, server, dia, status, message)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, daily_data)
+        # 🔸 같은 배치 안의 중복 보고 병합 (쓰기 증폭 감소)
+        clients_data, daily_data, coalesced = coalesce_batch(batch_data, today)
+
+        # 배치 UPSERT (값이 같으면 페이지를 건드리지 않음)
+        before = daily_rollup.fetch_current(cursor, daily_data)
+        clients_rev = None
+        if clients_data:
+            # 🔢 이번 배치의 데이터 버전 → 실제로 바뀐 clients 행에만 기록 (바뀐 행이 없으면 되돌림)
+            cursor.execute(BUMP_CLIENTS_REV_SQL, (1,))
+            cursor.executemany(CLIENTS_UPSERT_SQL, clients_data)
+            if cursor.rowcount == 0:
+                cursor.execute(BUMP_CLIENTS_REV_SQL, (-1,))
+            else:
+                clients_rev = cursor.execute("SELECT rev FROM data_version WHERE name = 'clients'").fetchone()[0]
+                publish_events(cursor, [("clients", {"rev": clients_rev})])  # 📣 대시보드에 변경 알림
+        cursor.executemany(DAILY_DIA_UPSERT_SQL, daily_data)
+
+        # 🧮 일별 합계 / 전일 대비 증감을 같은 트랜잭션에서 증분 갱신
+        daily_rollup.apply(cursor, daily_data, before)
+
+        # 📈 다이아 변화 샘플 (값이 바뀐 보고만, 시간/일 요약 동시 갱신)
+        now_ts = int(time.time())
+        sample_writer.record(cursor, [
+            (p.get("name", "unknown"), int(p["ts"]) if p.get("ts") is not None else now_ts, int(p.get("dia", 0)))
+            for p in batch_data
+        ])
 
         conn.commit()
-        print(f"배치 DB 저장 성공: {len(batch_data)}개 항목")
+        if clients_rev is not None:
+            hot_snapshot.apply(clients_data, clients_rev)  # 🔥 커밋된 내용만 스냅샷에 반영
+        batch_metrics.add_coalesced(coalesced)
+        print(f"배치 DB 저장 성공: {len(batch_data)}개 항목 (중복 병합 {coalesced}건)")
+        return True
     except Exception as e:
-        print(f"배치 DB 저장 실패: {e}")
+        log(f"❌ 배치 DB 저장 실패 ({len(batch_data)}건 롤백): {e}", log_path, "ERROR")
+        try:
+            get_db_connection().rollback()  # 집계만 반영되는 일이 없도록 배치 전체 취소
+        except sqlite3.Error:
+            pass
+        sample_writer.reset()  # 롤백된 client_ids / 샘플을 가리키는 캐시 제거
+        forget_reports(batch_data)  # ACK 한 보고가 재전송 시 중복으로 버려지지 않도록
+        return False
+
+# 📊 배치 저장 통계 (배치 크기, 큐 적체, 커밋 지연)
+class BatchMetrics:
+    def __init__(self, history=200):
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.bytes = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.flush_reasons = {"rows": 0, "bytes": 0, "delay": 0}
+        self.recent_sizes = deque(maxlen=history)
+        self.recent_commit_ms = deque(maxlen=history)
+        self.max_commit_ms = 0.0
+        self.last_queue_depth = 0
+        self.last_commit_at = None
+        self.target_rows = 0
+
+    def record(self, rows, nbytes, commit_ms, reason, ok, queue_depth, target_rows):
+        with self.lock:
+            self.batches += 1
+            self.rows += rows
+            self.bytes += nbytes
+            if not ok:
+                self.failures += 1
+            self.flush_reasons[reason] += 1
+            self.recent_sizes.append(rows)
+            self.recent_commit_ms.append(commit_ms)
+            self.max_commit_ms = max(self.max_commit_ms, commit_ms)
+            self.last_queue_depth = queue_depth
+            self.last_commit_at = now()
+            self.target_rows = target_rows
+
+    def add_coalesced(self, n):
+        with self.lock:
+            self.coalesced += n
+
+    def snapshot(self):
+        with self.lock:
+            sizes = list(self.recent_sizes)
+            commits = sorted(self.recent_commit_ms)
+            return {
+                "batches": self.batches,
+                "rows": self.rows,
+                "bytes": self.bytes,
+                "failures": self.failures,
+                "coalesced": self.coalesced,
+                "flush_reasons": dict(self.flush_reasons),
+                "avg_batch_rows": round(sum(sizes) / len(sizes), 1) if sizes else 0,
+                "max_batch_rows": max(sizes) if sizes else 0,
+                "avg_commit_ms": round(sum(commits) / len(commits), 2) if commits else 0,
+                "p95_commit_ms": round(commits[int(len(commits) * 0.95) - 1], 2) if commits else 0,
+                "max_commit_ms": round(self.max_commit_ms, 2),
+                "target_rows": self.target_rows,
+                "queue_depth": data_queue.qsize(),
+                "queue_depth_at_last_flush": self.last_queue_depth,
+                "last_commit_at": self.last_commit_at
+            }
+
+batch_metrics = BatchMetrics()
+
+# 🔌 수신 연결 수 (스레드/asyncio 공통)
+class ConnectionStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.accepted = 0
+        self.framed = 0          # 유지 중인 NDJSON 연결 수
+        self.framed_refused = 0
+
+    def opened(self):
+        with self.lock:
+            self.active += 1
+            self.accepted += 1
+            self.peak = max(self.peak, self.active)
+
+    def closed(self):
+        with self.lock:
+            self.active -= 1
+
+    def link_opened(self, limit):
+        """NDJSON 지속 연결 자리 확보 → 상한을 넘으면 False"""
+        with self.lock:
+            if self.framed >= limit:
+                self.framed_refused += 1
+                return False
+            self.framed += 1
+            return True
+
+    def link_closed(self):
+        with self.lock:
+            self.framed -= 1
+
+    def snapshot(self):
+        with self.lock:
+            return {"active": self.active, "peak": self.peak, "accepted": self.accepted,
+                    "framed": self.framed, "framed_refused": self.framed_refused}
+
+connection_stats = ConnectionStats()
+
+# 📊 Prometheus 지표 (metrics_port 의 /metrics) - 보고 수신 경로의 기록은 잠금 없음
+REPORTS_RECEIVED = metrics.Counter(
+    "dia_reports_received_total", "수신한 보고 수 (kind: live/history/dup)", ("kind",))
+REPORT_FAILURES = metrics.Counter(
+    "dia_report_failures_total", "처리하지 못한 보고 수 (reason: empty/json/invalid)", ("reason",))
+BATCH_ROWS = metrics.Histogram(
+    "dia_batch_rows", "배치 1회 보고 수", (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500))
+COMMIT_SECONDS = metrics.Histogram(
+    "dia_db_commit_seconds", "배치 DB 저장 소요 시간 (초)",
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+BATCH_FAILURES = metrics.Counter("dia_batch_failures_total", "실패한 배치 저장 수")
+metrics.Gauge("dia_queue_depth", "배치 저장 대기 중인 보고 수 (data_queue)", data_queue.qsize)
+metrics.Gauge("dia_connections_active", "처리 중인 수신 연결 수", lambda: connection_stats.active)
+metrics.Gauge("dia_connections_accepted_total", "수락한 수신 연결 수",
+              lambda: connection_stats.accepted, kind="counter")
+metrics.Gauge("dia_framed_links", "유지 중인 NDJSON 지속 연결 수", lambda: connection_stats.framed)
+metrics.Gauge("dia_framed_links_refused_total", "상한 초과로 거절한 NDJSON 연결 수",
+              lambda: connection_stats.framed_refused, kind="counter")
+metrics.Gauge("dia_clients", "생존 상태별 클라이언트 수",
+              lambda: {(k,): v for k, v in client_liveness.counts().items() if k != "heap"}, ("status",))
+
+def write_health(path, config):
+    """
+    🩺 서버 상태 파일 갱신 (board/app.py 가 포트 접속 확인 대신 읽음)
+    임시 파일 → os.replace (읽는 쪽은 완성된 파일만 봄)
+    """
+    m = batch_metrics.snapshot()
+    data = {
+        "pid": os.getpid(),
+        "started_at": STARTED_AT,
+        "written_at": time.time(),
+        "port": config["server_port"],
+        "ingest_mode": config["ingest_mode"],
+        "queue_depth": m["queue_depth"],
+        "last_commit_at": m["last_commit_at"],
+        "batches": m["batches"],
+        "rows": m["rows"],
+        "failures": m["failures"],
+        "avg_commit_ms": m["avg_commit_ms"],
+        "p95_commit_ms": m["p95_commit_ms"],
+        "connections": connection_stats.snapshot(),
+        "clients": client_liveness.counts()
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+# 🔥 전체 클라이언트 최신 상태 스냅샷 (board/app.py 가 DB 대신 읽음)
+CLIENT_COLUMNS = ("name", "ip", "game", "server", "dia", "last_report", "status", "message")
+
+class HotSnapshot:
+    """
+    배치 writer 전용 (단일 스레드에서만 호출)
+    - clients 테이블과 같은 내용을 메모리에 유지 (커밋 후 갱신, rev 도 DB 와 동일)
+    - client_snapshot.json 으로 내보냄: 임시 파일 → os.replace (읽는 쪽은 완성된 파일만 봄)
+    - 변경이 있으면 interval 초에 1번, 변경이 없어도 refresh 초마다 다시 씀
+    """
+
+    def __init__(self):
+        self.clients = {}   # {name: 행 dict (clients 컬럼 + rev)}
+        self.rev = 0
+        self.dirty = True
+        self.last_write = 0.0
+
+    def load(self, conn):
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("SELECT * FROM clients").fetchall()
+            self.rev = conn.execute("SELECT rev FROM data_version WHERE name = 'clients'").fetchone()[0]
+        finally:
+            conn.row_factory = None
+        self.clients = {r["name"]: {k: r[k] for k in CLIENT_COLUMNS + ("rev",)} for r in rows}
+        self.dirty = True
+
+    def apply(self, clients_rows, rev):
+        """clients_rows: CLIENTS_UPSERT_SQL 에 넣은 행 튜플 - DB UPSERT 와 같은 조건으로 rev 갱신"""
+        for row in clients_rows:
+            values = dict(zip(CLIENT_COLUMNS, row))
+            current = self.clients.get(values["name"])
+            if current is None or any(current[k] != values[k] for k in CLIENT_COLUMNS):
+                values["rev"] = rev
+                self.clients[values["name"]] = values
+        self.rev = rev
+        self.dirty = True
+
+    def set_status(self, statuses, rev):
+        """statuses: {name: "alive"/"stale"} - persist_liveness 의 UPDATE 와 같은 조건"""
+        for name, status in statuses.items():
+            current = self.clients.get(name)
+            if current is not None and current["status"] != status:
+                current["status"] = status
+                current["rev"] = rev
+        self.rev = rev
+        self.dirty = True
+
+    def maybe_write(self, path, interval, refresh):
+        now_ts = time.time()
+        elapsed = now_ts - self.last_write
+        if not (self.dirty and elapsed >= interval) and elapsed < refresh:
+            return False
+
+        ordered = sorted(self.clients.values(), key=lambda c: c["last_report"] or "", reverse=True)
+        data = json.dumps({"rev": self.rev, "written_at": now_ts, "clients": ordered}, ensure_ascii=False)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.dirty = False
+        self.last_write = now_ts
+        return True
+
+hot_snapshot = HotSnapshot()
+
+def collect_batch(target_rows, max_bytes, max_delay):
+    """
+    큐에서 한 배치 수집 → (batch, nbytes, flush 사유)
+    - 첫 항목이 들어온 시점부터 max_delay 초 안에서
+    - target_rows 행 또는 max_bytes 바이트가 차면 즉시 flush
+    - 큐가 잠깐 비어도 끊지 않고 마감 시각까지 기다림
+    """
+    try:
+        payload, nbytes = data_queue.get(timeout=1)
+    except queue.Empty:
+        return [], 0, None
+
+    batch = [payload]
+    deadline = time.monotonic() + max_delay
+    while len(batch) < target_rows and nbytes < max_bytes:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return batch, nbytes, "delay"
+        try:
+            payload, size = data_queue.get(timeout=remaining)
+        except queue.Empty:
+            return batch, nbytes, "delay"
+        batch.append(payload)
+        nbytes += size
+
+    return batch, nbytes, ("rows" if len(batch) >= target_rows else "bytes")
+
+def batch_processor(config, log_path):
+    """
+    백그라운드 단일 writer - 크기/바이트/지연 기준 flush
+    batch_adaptive 이면 부하에 따라 목표 행 수를 늘리고 줄임
+    """
+    max_rows  = config["batch_max_rows"]
+    min_rows  = min(config["batch_min_rows"], max_rows)
+    max_bytes = config["batch_max_bytes"]
+    max_delay = config["batch_max_delay_sec"]
+    adaptive  = config["batch_adaptive"]
+    stats_sec = config["batch_stats_log_sec"]
+
+    target_rows = min_rows if adaptive else max_rows
+    next_stats_log = time.time() + stats_sec
+    next_health = 0.0
+    next_prune = time.time() + 60
+
+    try:
+        hot_snapshot.load(get_db_connection())
+    except Exception as e:
+        log(f"⚠️ 상태 스냅샷 초기화 실패: {e}", log_path)
+    try:
+        seed_liveness(get_db_connection())
+    except Exception as e:
+        log(f"⚠️ 생존 추적 초기화 실패: {e}", log_path)
 
-def batch_processor():
-    """백그라운드에서 주기적으로 배치 저장"""
     while True:
-        batch_data = []
         try:
-            # 5초간 또는 100개까지 데이터 수집
-            end_time = time.time() + 5
-            while time.time() < end_time and len(batch_data) < 100:
-                try:
-                    data = data_queue.get(timeout=1)
-                    batch_data.append(data)
-                except queue.Empty:
-                    break
+            batch_data, nbytes, reason = collect_batch(target_rows, max_bytes, max_delay)
 
             if batch_data:
-                batch_insert_to_db(batch_data)
+                started = time.perf_counter()
+                ok = batch_insert_to_db(batch_data, log_path)
+                commit_ms = (time.perf_counter() - started) * 1000
+                depth = data_queue.qsize()
+                batch_metrics.record(len(batch_data), nbytes, commit_ms, reason, ok, depth, target_rows)
+                BATCH_ROWS.observe(len(batch_data))
+                COMMIT_SECONDS.observe(commit_ms / 1000)
+                if not ok:
+                    BATCH_FAILURES.inc()
+
+                if adaptive:
+                    if reason != "delay" or depth >= target_rows:
+                        target_rows = min(max_rows, target_rows * 2)   # 부하 증가 → 배치 키움
+                    elif len(batch_data) < target_rows // 4:
+                        target_rows = max(min_rows, target_rows // 2)  # 한산 → 배치 줄임
+
+            # 💓 마감이 지난 클라이언트 → stale, 쌓인 전환은 한 트랜잭션으로 기록 (최소 1초에 1번 확인)
+            client_liveness.expire()
+            transitions = client_liveness.take()
+            if transitions:
+                try:
+                    persist_liveness(transitions, log_path)
+                except Exception as e:
+                    client_liveness.restore(transitions)
+                    get_db_connection().rollback()
+                    log(f"⚠️ 상태 전환 기록 실패: {e}", log_path)
+
+            # 🔥 상태 스냅샷 파일 갱신 (변경 시 최대 초당 1회)
+            try:
+                hot_snapshot.maybe_write(SNAPSHOT_PATH, config["snapshot_interval_sec"], config["snapshot_refresh_sec"])
+            except OSError as e:
+                log(f"⚠️ 상태 스냅샷 저장 실패: {e}", log_path, "WARN")  # 읽는 쪽이 파일을 잡고 있는 경우 등 → 다음 주기에 재시도
+
+            if time.time() >= next_health:
+                next_health = time.time() + config["health_interval_sec"]
+                try:
+                    write_health(HEALTH_PATH, config)
+                except OSError as e:
+                    log(f"⚠️ 상태 파일 저장 실패: {e}", log_path, "WARN")
+
+            if time.time() >= next_prune:
+                next_prune = time.time() + config["samples_prune_interval_sec"]
+                try:
+                    deleted = sample_writer.prune(
+                        get_db_connection(),
+                        config["samples_retention_days"],
+                        config["hourly_retention_days"],
+                        config["daily_retention_days"]
+                    )
+                    if deleted:
+                        log(f"🧹 다이아 샘플 보관 기간 정리 → {deleted}행 삭제", log_path)
+                except Exception as e:
+                    log(f"⚠️ 다이아 샘플 정리 실패: {e}", log_path)
+                try:
+                    conn = get_db_connection()
+                    conn.execute("DELETE FROM events WHERE ts < ?", (time.time() - config["events_retention_sec"],))
+                    conn.commit()
+                except Exception as e:
+                    log(f"⚠️ 이벤트 정리 실패: {e}", log_path)
+
+            if time.time() >= next_stats_log:
+                next_stats_log = time.time() + stats_sec
+                m = batch_metrics.snapshot()
+                if m["batches"]:
+                    log(f"📊 배치 통계 → 배치 {m['batches']}회 | 평균 {m['avg_batch_rows']}행 | "
+                        f"목표 {m['target_rows']}행 | 큐 {m['queue_depth']} | "
+                        f"커밋 평균 {m['avg_commit_ms']}ms (p95 {m['p95_commit_ms']}ms) | 병합 {m['coalesced']} | 실패 {m['failures']}", log_path)
 
         except Exception as e:
-            print(f"배치 처리 오류: {e}")
+            log(f"❌ 배치 처리 오류: {e}\n{traceback.format_exc()}", log_path, "ERROR")
+
+# 수신 데이터 1건 처리 (스레드/asyncio 공통) → 정상 처리 여부 반환
+def process_report(raw, addr, log_path):
+    if not raw:
+        REPORT_FAILURES.inc(1, "empty")
+        log(f"⚠️ 수신 실패: 빈 데이터 (IP: {addr[0]})", log_path)
+        return False
 
-# 수신 처리 함수
-def handle_client(conn, addr, log_path):
     try:
-        raw = conn.recv(2048)
-        if not raw:
-            log(f"⚠️ 수신 실패: 빈 데이터 (IP: {addr[0]})", log_path)
-            return
+        payload = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        REPORT_FAILURES.inc(1, "json")
+        log(f"⚠️ JSON 파싱 실패: {e}", log_path)
+        return False
 
-        try:
-            payload = json.loads(raw.decode("utf-8"))
-        except Exception as e:
-            log(f"⚠️ JSON 파싱 실패: {e}", log_path)
-            return
+    # 🔹 형식 검증 (잘못된 보고 1건 때문에 배치 전체가 롤백되지 않도록 여기서 ERR)
+    reason = invalid_report_reason(payload)
+    if reason:
+        REPORT_FAILURES.inc(1, "invalid")
+        log(f"⚠️ 잘못된 보고 거부 → {reason} (IP: {addr[0]})", log_path, "WARN")
+        return False
+    if "dia" in payload:
+        payload["dia"] = normalize_report_dia(payload["dia"])
+
+    # 🔹 클라이언트에서 보내온 필드들 파싱
+    ip          = payload.get("ip", addr[0])
+    name        = payload.get("name", "unknown")
+    game        = payload.get("game", "?")
+    game_server = payload.get("game_server", "?")
+    dia         = payload.get("dia", "?")
+    msg         = payload.get("msg", "?")
+
+    # 🔹 생존 갱신 (마감 시각 힙에 넣기만 함)
+    client_liveness.touch(name)
+
+    # 🔹 ts 검증 (잘못된 값이면 버리고 서버 시각 기준 → 배치 전체가 실패하지 않도록)
+    ts = normalize_report_ts(payload.get("ts"))
+    if ts is None and payload.get("ts") is not None:
+        log(f"⚠️ 잘못된 ts 무시 → {name} (ts={payload.get('ts')!r})", log_path, "WARN")
+    payload.pop("ts", None)
+    if ts is not None:
+        payload["ts"] = ts
+
+    # 🔹 중복/재전송 판별
+    kind, prev_latest = classify_report(name, ts)
+    REPORTS_RECEIVED.inc(1, kind)
+    if kind == "dup":
+        log(f"🔁 중복 보고 무시 → {name} (ts={payload.get('ts')})", log_path, "DEBUG")
+        return True  # 이미 저장된 보고이므로 ACK
+    if kind == "history":
+        payload["_history_only"] = True
+    if prev_latest is not None:
+        payload["_prev_latest"] = prev_latest
 
-        # 🔹 클라이언트에서 보내온 필드들 파싱
-        ip          = payload.get("ip", addr[0])
-        name        = payload.get("name", "unknown")
-        game        = payload.get("game", "?")
-        game_server = payload.get("game_server", "?")
-        dia         = payload.get("dia", "?")
-        msg         = payload.get("msg", "?")
+    store_client_batch(payload, len(raw))  # 👈 이 한 줄로 DB에 기록됨!
 
-        # 🔹 생존 갱신
-        with ahk_lock:
-            ahk_map[name] = time.time()
+    # 🔸 예쁘게 출력
+    log_line = f"수신 → {ip} | {name} | {game_server} | 게임: {game} | 다이아: {dia} | 메시지: {msg}"
+    log(log_line, log_path, "DEBUG")  # 보고마다 1줄 → log_rate_limits 로 초당 상한
+    return True
 
-        store_client_batch(payload)  # 👈 이 한 줄로 DB에 기록됨!
+# ───────────────────────────────────────────────────────
+# 📨 수신 프레이밍
+#   - 레거시: JSON 1건 전송 후 연결 종료 (EOF 까지 읽음, 2048바이트 제한 없음)
+#   - NDJSON: 첫 줄 "DIA/1 NDJSON" → "OK NDJSON" 응답 후
+#             한 줄에 JSON 1건씩, 건마다 "ACK" / "ERR" 응답 (연결 유지)
+# ───────────────────────────────────────────────────────
+FRAMED_HELLO = b"DIA/1 NDJSON"
+FRAMED_OK    = b"OK NDJSON\n"
+FRAMED_BUSY  = b"BUSY\n"   # 지속 연결 상한 초과 - OK 가 아니면 클라이언트는 1회성 전송으로 전환
 
-        # 🔸 예쁘게 출력
-        log_line = f"수신 → {ip} | {name} | {game_server} | 게임: {game} | 다이아: {dia} | 메시지: {msg}"
-        log(log_line, log_path)
+def frame_ack(ok):
+    return b"ACK\n" if ok else b"ERR\n"
 
+# 수신 처리 함수 (스레드 모드)
+def handle_client(conn, addr, log_path, config):
+    max_frame = config["max_frame_bytes"]
+    connection_stats.opened()
+    try:
+        conn.settimeout(config["client_read_timeout_sec"])
+        stream = conn.makefile("rb")
+        first = stream.readline(max_frame + 1)
+
+        if first.rstrip(b"\r\n") == FRAMED_HELLO:
+            if not connection_stats.link_opened(config["max_framed_links"]):
+                log(f"⚠️ NDJSON 연결 상한 초과 → BUSY (IP: {addr[0]})", log_path, "WARN")
+                conn.sendall(FRAMED_BUSY)
+                return
+            try:
+                conn.sendall(FRAMED_OK)
+                conn.settimeout(config["framed_idle_timeout_sec"])
+                while True:
+                    line = stream.readline(max_frame + 1)
+                    if not line:
+                        break  # 클라이언트가 연결 종료
+                    if len(line) > max_frame:
+                        log(f"⚠️ 프레임 크기 초과 → 연결 종료 (IP: {addr[0]})", log_path)
+                        break
+                    if not line.strip():
+                        continue
+                    conn.sendall(frame_ack(process_report(line, addr, log_path)))
+            finally:
+                connection_stats.link_closed()
+            return
+
+        # 🔸 레거시 1회성 전송: 줄바꿈이 없으므로 첫 readline 이 EOF 까지 읽어옴
+        if len(first) > max_frame:
+            log(f"⚠️ 프레임 크기 초과 → 폐기 (IP: {addr[0]})", log_path)
+            return
+        process_report(first, addr, log_path)
+    except socket.timeout:
+        log(f"⚠️ 수신 시간 초과 (IP: {addr[0]})", log_path)
     except Exception as e:
         log(f"⚠️ 수신 처리 실패: {e}\n{traceback.format_exc()}", log_path)
     finally:
+        connection_stats.closed()
         conn.close()
 
-# 서버 메인 루프
-def start_server():
-    config = load_config()
-    host = config["server_ip"]
-    port = config["server_port"]
-    log_path = config["log_path"]
-    alert_sec = config.get("report_interval_sec", 58) * 2
+# 수신 처리 함수 (asyncio 모드) - 연결마다 스레드를 만들지 않음
+#   limiter 는 "처리 중인 보고" 수를 제한 (유휴 지속 연결은 자리를 차지하지 않음)
+async def handle_client_async(reader, writer, log_path, limiter, config):
+    """
+    - 1회성 전송: 연결 전체(수신 + 처리) 동안 limiter 자리 점유 → max_connections 초과분은 대기
+    - NDJSON: 첫 줄을 받을 때까지만 limiter 점유, 이후 유휴 대기가 긴 지속 연결은
+              max_framed_links 로 따로 제한 (넘으면 BUSY 응답 후 종료)
+    """
+    addr = writer.get_extra_info("peername") or ("?", 0)
+    connection_stats.opened()
+    try:
+        async with limiter:
+            first = await asyncio.wait_for(reader.readline(), timeout=config["client_read_timeout_sec"])
+            framed = first.rstrip(b"\r\n") == FRAMED_HELLO
+            if not framed:
+                # 🔸 레거시 1회성 전송: 첫 readline 이 EOF 까지 읽어옴
+                process_report(first, addr, log_path)
+                return
 
-    log(f"✅ 서버 포트 {port} 수신 대기 중...", log_path)
+        if not connection_stats.link_opened(config["max_framed_links"]):
+            log(f"⚠️ NDJSON 연결 상한 초과 → BUSY (IP: {addr[0]})", log_path, "WARN")
+            writer.write(FRAMED_BUSY)
+            await writer.drain()
+            return
+        try:
+            writer.write(FRAMED_OK)
+            await writer.drain()
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=config["framed_idle_timeout_sec"])
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(frame_ack(process_report(line, addr, log_path)))
+                await writer.drain()
+        finally:
+            connection_stats.link_closed()
+    except asyncio.TimeoutError:
+        log(f"⚠️ 수신 시간 초과 (IP: {addr[0]})", log_path)
+    except (ValueError, asyncio.LimitOverrunError):
+        log(f"⚠️ 프레임 크기 초과 → 연결 종료 (IP: {addr[0]})", log_path)
+    except Exception as e:
+        log(f"⚠️ 수신 처리 실패: {e}\n{traceback.format_exc()}", log_path)
+    finally:
+        connection_stats.closed()
+        writer.close()
+
+async def serve_async(host, port, config, log_path):
+    limiter = asyncio.Semaphore(config["max_connections"])
+
+    server = await asyncio.start_server(
+        lambda r, w: handle_client_async(r, w, log_path, limiter, config),
+        host, port,
+        backlog=config["listen_backlog"],
+        limit=config["max_frame_bytes"],
+        reuse_address=True
+    )
+    log(f"⚡ asyncio 수신 모드 (backlog={config['listen_backlog']}, 동시 처리 상한={config['max_connections']}, "
+        f"NDJSON 연결 상한={config['max_framed_links']})", log_path)
+    async with server:
+        await server.serve_forever()
 
-    threading.Thread(target=watch_ahk, args=(alert_sec, log_path), daemon=True).start()
-    threading.Thread(target=batch_processor, daemon=True).start()
+# 스레드 모드 accept 루프 (기존 방식)
+def serve_threaded(host, port, config, log_path):
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     try:
         s.bind((host, port)) #포크 커널에 점유 중복실행 방지
-        s.listen(5)
+        s.listen(config["listen_backlog"])
     except Exception as e:
         log(f"⚠️ 서버 바인딩 실패: {e}", log_path)
         return
@@ -257,10 +1043,42 @@ def start_server():
     while True:
         try:
             conn, addr = s.accept()
-            threading.Thread(target=handle_client, args=(conn, addr, log_path), daemon=True).start()
+            threading.Thread(target=handle_client, args=(conn, addr, log_path, config), daemon=True).start()
         except Exception as e:
             log(f"⚠️ 클라이언트 수신 오류: {e}", log_path)
 
+# 서버 메인 루프
+def start_server():
+    config = load_config()
+    host = config["server_ip"]
+    port = config["server_port"]
+    log_path = config["log_path"]
+    client_liveness.timeout = config.get("report_interval_sec", 58) * 2  # 2회 연속 보고 누락 → stale
+
+    setup_log(config)
+    init_db()
+    log(f"✅ 서버 포트 {port} 수신 대기 중...", log_path)
+
+    if config["metrics_port"]:
+        try:
+            metrics.serve(config["metrics_host"], config["metrics_port"])
+            log(f"📊 지표 수집 → http://{config['metrics_host']}:{config['metrics_port']}/metrics", log_path)
+        except OSError as e:
+            log(f"⚠️ 지표 포트 바인딩 실패: {e}", log_path)  # 수신은 계속
+
+    threading.Thread(target=batch_processor, args=(config, log_path), daemon=True).start()
+
+    if config["ingest_mode"] == "asyncio":
+        try:
+            asyncio.run(serve_async(host, port, config, log_path))
+        except OSError as e:
+            log(f"⚠️ 서버 바인딩 실패: {e}", log_path)
+    else:
+        serve_threaded(host, port, config, log_path)
+
 # 시작 포인트
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    if "--rebuild-rollups" in sys.argv:
+        rebuild_rollups()
+    else:
+        start_server()
\ No newline at end of file